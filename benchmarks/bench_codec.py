@@ -0,0 +1,136 @@
+"""Compare deserializing items with the codec compiled once per model against the previous algorithm, which
+resolved the base classes of the type hint of every attribute of every item, and serializing to wire format
+in a single pass against ``serialize()`` followed by ``TypeSerializer``.
+
+Run with ``python benchmarks/bench_codec.py [items]``.
+"""
+import sys
+import copy
+import time
+import datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Set
+
+from boto3.dynamodb.types import TypeSerializer
+
+from dynamantic import Dynamantic
+
+
+class Nested(Dynamantic):
+    name: str
+    values: List[bytes]
+
+
+class Wide(Dynamantic):
+    __table_name__ = "benchmark"
+    __hash_key__ = "item_id"
+
+    item_id: str
+    count: int
+    ratio: float
+    amount: Decimal
+    enabled: bool
+    created: datetime.datetime
+    day: datetime.date
+    tags: Set[str]
+    scores: List[int]
+    blob: bytes
+    attributes: dict
+    nested: Nested
+    nested_list: List[Nested]
+    optional_str: Optional[str] = None
+    optional_list: Optional[List[float]] = None
+    anything: Any = None
+
+
+RAW = {
+    "item_id": "item",
+    "count": Decimal(5),
+    "ratio": Decimal("2.5"),
+    "amount": Decimal("1.25"),
+    "enabled": True,
+    "created": "2024-01-01T12:00:00",
+    "day": "2024-01-01",
+    "tags": {"a", "b", "c"},
+    "scores": [Decimal(1), Decimal(2), Decimal(3)],
+    "blob": b"blob",
+    "attributes": {"a": Decimal(1)},
+    "nested": {"name": "nested", "values": [b"a", b"b"]},
+    "nested_list": [{"name": "nested", "values": [b"a"]} for _ in range(5)],
+    "optional_str": "str",
+    "optional_list": [Decimal("1.5")],
+    "anything": ["a", Decimal(1)],
+}
+
+
+def baseline_deserialize(model_cls: type, values: dict) -> Dict[str, Any]:
+    """The deserialization the codec replaced, kept as the reference.
+
+    The base classes of the type hint are resolved with ``_get_base_class`` for every attribute of every item.
+    """
+
+    def _create_instance(value, class_, collection_class=None):
+        if value is None:
+            return value
+
+        if class_ in (datetime.datetime, datetime.date, datetime.time):
+            return class_.fromisoformat(value)
+        if collection_class in (list, tuple, frozenset):
+            new_list = []
+            for val in value:
+                new_list.append(_create_instance(val, class_))
+            return collection_class(new_list)
+        if collection_class == set:
+            new_set = set()
+            for val in iter(value):
+                new_set.add(_create_instance(val, class_))
+            return new_set
+        if issubclass(class_, Dynamantic):
+            return class_(**baseline_deserialize(class_, value))
+        return class_(value)
+
+    def _deserialize_value(value, classes: list):
+        if len(classes) == 1:
+            return _create_instance(value, classes[0])
+        return _create_instance(value, classes[0], classes[1])
+
+    def _unique_classes_with_order(class_list):
+        seen = set()
+        return [cls for cls in class_list if cls not in seen and not seen.add(cls)]
+
+    for k, v in values.items():
+        type_hint = next(model_cls.model_fields.get(key_).annotation for key_ in model_cls.model_fields if key_ == k)
+        classes = model_cls._get_base_class(type_hint, v, [])
+        values[k] = _deserialize_value(v, _unique_classes_with_order(classes))
+    return values
+
+
+def bench(name: str, deserialize, count: int) -> float:
+    items = [copy.deepcopy(RAW) for _ in range(count)]
+    start = time.perf_counter()
+    for item in items:
+        Wide(**deserialize(item))
+    elapsed = time.perf_counter() - start
+    print(f"{name:<20} {elapsed / count * 1e6:8.1f} us/item")
+    return elapsed
+
+
+if __name__ == "__main__":
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    assert baseline_deserialize(Wide, copy.deepcopy(RAW)) == Wide.deserialize(copy.deepcopy(RAW))
+    baseline = bench("baseline", lambda item: baseline_deserialize(Wide, item), total)
+    compiled = bench("compiled per class", Wide.deserialize, total)
+    print(f"speedup: {baseline / compiled:.1f}x")
+
+    model = Wide(**Wide.deserialize(copy.deepcopy(RAW)))
+    start = time.perf_counter()
+    for _ in range(total):
+        {k: TypeSerializer().serialize(v) for k, v in model.serialize().items()}
+    two_pass = time.perf_counter() - start
+    print(f"{'serialize + types':<20} {two_pass / total * 1e6:8.1f} us/item")
+    start = time.perf_counter()
+    for _ in range(total):
+        model._serialize_wire()
+    single_pass = time.perf_counter() - start
+    print(f"{'serialize wire':<20} {single_pass / total * 1e6:8.1f} us/item")
+    print(f"speedup: {two_pass / single_pass:.1f}x")
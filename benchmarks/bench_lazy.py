@@ -0,0 +1,34 @@
+"""Compare building models from wire format items against a ``LazyItem`` view reading a few attributes.
+
+Run with ``python benchmarks/bench_lazy.py [items]``.
+"""
+import sys
+import time
+
+from boto3.dynamodb.types import TypeSerializer
+
+from bench_codec import RAW, Wide
+from dynamantic import LazyItem
+
+WIRE = {k: TypeSerializer().serialize(v) for k, v in RAW.items()}
+
+
+def bench(name: str, read, count: int) -> float:
+    start = time.perf_counter()
+    for _ in range(count):
+        read(WIRE)
+    elapsed = time.perf_counter() - start
+    print(f"{name:<20} {elapsed / count * 1e6:8.1f} us/item")
+    return elapsed
+
+
+def read_lazy(item):
+    lazy = LazyItem(Wide, item)
+    return lazy.item_id, lazy.count, lazy.nested
+
+
+if __name__ == "__main__":
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    full = bench("full model", lambda item: Wide.from_raw(item, wire=True), total)
+    lazy = bench("lazy, 3 fields", read_lazy, total)
+    print(f"speedup: {full / lazy:.1f}x")
@@ -0,0 +1,30 @@
+"""Compare building models from DynamoDB items with validation against the trusted ``model_construct`` path.
+
+Run with ``python benchmarks/bench_trusted.py [items]``.
+"""
+import sys
+import copy
+import time
+
+from bench_codec import RAW, Wide
+
+
+def bench(name: str, trusted: bool, count: int) -> float:
+    items = [copy.deepcopy(RAW) for _ in range(count)]
+    codec = Wide._codec()
+    start = time.perf_counter()
+    for item in items:
+        if trusted:
+            codec.construct(item)
+        else:
+            Wide(**codec.deserialize(item))
+    elapsed = time.perf_counter() - start
+    print(f"{name:<20} {elapsed / count * 1e6:8.1f} us/item")
+    return elapsed
+
+
+if __name__ == "__main__":
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    validated = bench("validated", False, total)
+    trusted = bench("trusted", True, total)
+    print(f"speedup: {validated / trusted:.1f}x")
@@ -1,5 +1,10 @@
-from .main import Dynamantic, Expr
+from .main import Dynamantic, Expr, PreparedUpdate
 from .attrs import A, K
 from .indexes import GlobalSecondaryIndex, LocalSecondaryIndex
 from .transactions import TransactGet, TransactWrite
 from .batch import BatchGet, BatchWrite
+from .loader import GetLoader
+from .session import Session
+from .buffer import WriteBuffer
+from .lazy import LazyItem
+from .export import Export
@@ -0,0 +1,118 @@
+# pylint: disable=W0212
+
+import asyncio
+import contextvars
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, Generic, List, TypeVar
+
+from dynamantic.pagination import R, ResultIterator
+
+V = TypeVar("V")
+
+DEFAULT_MAX_CONCURRENCY = 64
+
+_lock = threading.Lock()
+_executor: ThreadPoolExecutor | None = None
+_max_concurrency = DEFAULT_MAX_CONCURRENCY
+
+
+def set_max_concurrency(max_concurrency: int) -> None:
+    """Set the number of requests the async API can have in flight at once.
+
+    Requests are sent from a dedicated thread pool so the event loop never blocks on I/O, and the size
+    of that pool bounds the concurrency. Requests already in flight finish on the previous pool.
+    """
+    global _executor, _max_concurrency  # pylint: disable=global-statement
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1.")
+    with _lock:
+        previous, _executor = _executor, None
+        _max_concurrency = max_concurrency
+    if previous is not None:
+        previous.shutdown(wait=False)
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor  # pylint: disable=global-statement
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=_max_concurrency, thread_name_prefix="dynamantic")
+        return _executor
+
+
+async def run_sync(func: Callable[..., V], *args: Any, **kwargs: Any) -> V:
+    """Run a blocking call on the request thread pool and wait for it without blocking the loop."""
+    loop = asyncio.get_running_loop()
+    # scopes such as Session and GetLoader are context variables, and must be seen by the thread
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(_get_executor(), functools.partial(context.run, func, *args, **kwargs))
+
+
+class AsyncResultIterator(Generic[R]):
+    """Asynchronously iterate over the items of a query or scan, fetching one page at a time.
+
+    Each page is requested off the event loop. Paging, ``limit`` and the resume cursor behave exactly
+    as they do for the wrapped ``ResultIterator``.
+    """
+
+    def __init__(self, results: ResultIterator[R]) -> None:
+        self._results = results
+
+    def __aiter__(self) -> AsyncIterator[R]:
+        return self._items()
+
+    async def _items(self) -> AsyncIterator[R]:
+        results = self._results
+        results._start()
+        while (page := await run_sync(results._next_page)) is not None:
+            for item in results._page_items(page):
+                yield item
+            if results._remaining() == 0:
+                return
+        results._last_evaluated_key = None
+
+    async def pages(self) -> AsyncIterator[List[R]]:
+        """Yield each page of results as a list."""
+        results = self._results
+        results._start()
+        while (page := await run_sync(results._next_page)) is not None:
+            if len(page) > 0:
+                yield results._page_models(page)
+            if results._remaining() == 0:
+                return
+        results._last_evaluated_key = None
+
+    async def first(self) -> R | None:
+        """Return the first item, or None when there are no results."""
+        items = await self.take(1)
+        return items[0] if len(items) > 0 else None
+
+    async def take(self, n: int) -> List[R]:
+        """Return up to ``n`` items, only fetching as many pages as needed."""
+        items = []
+        if n <= 0:
+            return items
+        async for item in self:
+            items.append(item)
+            if len(items) >= n:
+                break
+        return items
+
+    @property
+    def last_evaluated_key(self) -> Dict[str, Any] | None:
+        """Cursor to resume after the last item yielded. None once every page has been read."""
+        return self._results.last_evaluated_key
+
+    @property
+    def count(self) -> int:
+        return self._results.count
+
+    @property
+    def scanned_count(self) -> int:
+        return self._results.scanned_count
+
+    @property
+    def page_count(self) -> int:
+        return self._results.page_count
@@ -1,12 +1,14 @@
 # pylint: disable=W0212
 
-from typing import List, Any, Type, Dict, Tuple
+from typing import List, Any, Literal, Type, Dict, Tuple
 
 from mypy_boto3_dynamodb.type_defs import BatchGetItemInputRequestTypeDef, BatchWriteItemInputRequestTypeDef
 
-from boto3.dynamodb.types import TypeSerializer, TypeDeserializer
+from boto3.dynamodb.types import TypeDeserializer
 
+from dynamantic.aio import run_sync
 from dynamantic.main import Dynamantic, T, _DynamanticFuture
+from dynamantic.executor import BatchExecutor, BatchStats, key_identity
 
 
 class BatchContext:
@@ -14,16 +16,37 @@ class BatchContext:
     _futures: List[Tuple[str, _DynamanticFuture]] = []
     _models: List[Tuple[str, T]] = {}
 
-    def __init__(self) -> None:
+    stats: BatchStats | None = None
+
+    def __init__(self, max_retries: int = 10, max_workers: int = 4) -> None:
         self._operations = []
         self._futures = []
         self._models = []
+        self._max_retries = max_retries
+        self._max_workers = max_workers
+        # the items written and the session method that tracks each one
+        self._written: List[Tuple[T, str]] = []
 
     def __enter__(self):
         return self
 
-    def _add_model(self, model: T) -> _DynamanticFuture[T]:
-        model_future = _DynamanticFuture(model_cls=model)
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        # the requests are sent off the event loop
+        await run_sync(self.__exit__, exc_type, exc_value, traceback)
+
+    def _executor(self) -> BatchExecutor:
+        model: Dynamantic = next(iter(self._models))[1]
+        executor = BatchExecutor(model._dynamodb(), max_retries=self._max_retries, max_workers=self._max_workers)
+        self.stats = executor.stats
+        return executor
+
+    def _add_model(
+        self, model: T, raw: bool | Literal["wire"] = False, trusted: bool | None = None
+    ) -> _DynamanticFuture[T]:
+        model_future = _DynamanticFuture(model_cls=model, raw=raw, trusted=trusted)
         tn = model.__table_name__
 
         self._futures.append((tn, model_future))
@@ -36,58 +59,57 @@ class BatchWrite(BatchContext):
     _operations: List[Tuple[str, BatchWriteItemInputRequestTypeDef]] = []
 
     def _primary_key(self, item: T) -> Dict[str, Dict]:
-        update_item = {k: TypeSerializer().serialize(v) for k, v in item.serialize().items()}
-        primary_key = {}
-        for k, v in update_item.items():
-            if k in (item.__hash_key__, item.__range_key__):
-                primary_key[k] = v
-        return primary_key
+        return item._primary_key()
 
     def save(self, item: T) -> None:
-        put_item = {k: TypeSerializer().serialize(v) for k, v in item.serialize().items()}
+        put_item = item._serialize_wire()
         self._operations.append((item.__table_name__, {"PutRequest": {"Item": put_item}}))
         self._add_model(item.__class__)
+        self._written.append((item, "add"))
 
     def delete(self, item: T) -> None:
         self._operations.append((item.__table_name__, {"DeleteRequest": {"Key": self._primary_key(item)}}))
         self._add_model(item.__class__)
+        self._written.append((item, "remove"))
 
     def __exit__(self, exc_type, exc_value, traceback):
-        # Requests are chunked into 25 at a time
-        model: Dynamantic = next(iter(self._models))[1]
-        chunked = [self._operations[i : i + 25] for i in range(0, len(self._operations), 25)]
-        for chunk in chunked:
-            request = {}
-            for op in chunk:
-                if op[0] not in request:
-                    request[op[0]] = []
-                request[op[0]].append(op[1])
-            model._dynamodb().batch_write_item(RequestItems=request)
+        if len(self._operations) > 0:
+            # unprocessed items are resubmitted until every write succeeds, in order for each key
+            keys = [self._primary_key(item) for item, _ in self._written]
+            self._executor().write(self._operations, keys)
+
+        for item, track in self._written:
+            item._track_write(track)
 
 
 class BatchGet(BatchContext):
     _operations: List[Tuple[str, BatchGetItemInputRequestTypeDef]] = []
 
-    def get(self, model: Type[T], hash_key: Any, range_key: Any = None) -> _DynamanticFuture[T]:
+    def get(
+        self,
+        model: Type[T],
+        hash_key: Any,
+        range_key: Any = None,
+        raw: bool | Literal["wire"] = False,
+        trusted: bool | None = None,
+    ) -> _DynamanticFuture[T]:
+        """Add a get of an item, the future resolves to the instance, or to the item itself when ``raw`` is set.
+
+        ``raw=True`` returns the item as a dict of python values and ``raw="wire"`` in DynamoDB wire format,
+        see ``Dynamantic.from_raw``. ``trusted`` builds the instance without validating the item, it defaults
+        to the model's ``__trusted_reads__``.
+        """
         key = model._key(hash_key, range_key)
         self._operations.append((model.__table_name__, key))
-        return self._add_model(model)
+        return self._add_model(model, raw, trusted)
 
     def __exit__(self, exc_type, exc_value, traceback):
-        # Requests are chunked into 25 at a time
-        model: Dynamantic = next(iter(self._models))[1]
-        chunked = [self._operations[i : i + 25] for i in range(0, len(self._operations), 25)]
-        for i, chunk in enumerate(chunked):
-            request = {}
-            for op in chunk:
-                if op[0] not in request:
-                    request[op[0]] = {"Keys": []}
-                request[op[0]]["Keys"].append(op[1])
-            results = model._dynamodb().batch_get_item(RequestItems=request)["Responses"]
-
-            counter = 0
-            for _, items in results.items():
-                for item in items:
-                    item = {k: TypeDeserializer().deserialize(v) for k, v in item.items()}
-                    self._futures[25 * i + counter][1].from_raw_data(item)
-                    counter = counter + 1
+        if len(self._operations) > 0:
+            # responses are matched to futures by key, retried keys come back in a later response
+            items = self._executor().get(self._operations)
+            for (table_name, key), (_, future) in zip(self._operations, self._futures):
+                item = items.get(key_identity(table_name, key))
+                if item is not None:
+                    if future._raw != "wire":
+                        item = {k: TypeDeserializer().deserialize(v) for k, v in item.items()}
+                    future.from_raw_data(item)
@@ -0,0 +1,317 @@
+# pylint: disable=W0212
+
+import atexit
+import threading
+import time
+from decimal import Decimal
+from typing import Any, Dict, Generic, List, Tuple, Type
+
+from dynamantic.batch import BatchWrite
+from dynamantic.exceptions import InvalidStateError, UpdateError
+from dynamantic.executor import BOTOCORE_EXCEPTIONS
+from dynamantic.expressions import UpdateExpressionBuilder
+from dynamantic.main import ConditionExpression, T
+
+# the update action and clause written for each kind of buffered action, see _action_kind
+_CLAUSES = {
+    "set": ("SET", "{path} = {value}"),
+    "increment": ("SET", "{path} = {path} + {value}"),
+    "append": ("SET", "{path} = list_append({path}, {value})"),
+    "add": ("ADD", "{path} {value}"),
+    "delete": ("DELETE", "{path} {value}"),
+    "remove": ("REMOVE", "{path}"),
+}
+
+
+def _action_kind(action: ConditionExpression) -> str:
+    expr = action._expr
+    if expr._action == "SET":
+        return {"{value}": "set", "{path} + {value}": "increment"}.get(expr._operand, "append")
+    return expr._action.lower()
+
+
+def _coalesce(before: Tuple[str, Any], after: Tuple[str, Any]) -> Tuple[str, Any] | None:
+    """The single action with the effect of two actions on a path, None when they can't be combined."""
+    (kind, value), (next_kind, next_value) = before, after
+    if next_kind in ("set", "remove"):
+        return after
+    if next_kind == "increment" and kind in ("set", "increment") and "N" in value:
+        return kind, {"N": str(Decimal(value["N"]) + Decimal(next_value["N"]))}
+    if next_kind == "append" and kind in ("set", "append") and "L" in value:
+        return kind, {"L": value["L"] + next_value["L"]}
+    if next_kind == kind and kind in ("add", "delete"):
+        ((set_type, values),) = value.items()
+        ((_, next_values),) = next_value.items()
+        return kind, {set_type: values + [val for val in next_values if val not in values]}
+    return None
+
+
+class _Pending:
+    """The writes buffered for a key: the last full item put, then the update actions by path."""
+
+    def __init__(self, item: Any) -> None:
+        self.item = item
+        self.put = False
+        self.actions: Dict[str, Tuple[str, Any]] = {}
+
+    def save(self, item: Any) -> bool:
+        # a put replaces every attribute, earlier updates are overwritten anyway
+        self.item = item
+        self.put = True
+        self.actions = {}
+        return True
+
+    def update(self, item: Any, actions: Dict[str, Tuple[str, Any]]) -> bool:
+        """Merge the actions, False when one of them can't be combined with a pending action."""
+        merged = dict(self.actions)
+        for path, action in actions.items():
+            merged[path] = action if path not in merged else _coalesce(merged[path], action)
+            if merged[path] is None:
+                return False
+        if not self.put:
+            # a pending put is sent as it was saved, the item only gives the key of the update
+            self.item = item
+        self.actions = merged
+        return True
+
+    def merge(self, newer: "_Pending") -> bool:
+        if newer.put:
+            self.save(newer.item)
+            self.actions = dict(newer.actions)
+            return True
+        return self.update(newer.item, newer.actions)
+
+
+class WriteBufferStats:
+    """Counters for a ``WriteBuffer``."""
+
+    def __init__(self) -> None:
+        self.writes = 0
+        self.coalesced = 0
+        self.flushes = 0
+        self.puts = 0
+        self.updates = 0
+        self.errors = 0
+        self.backpressure = 0
+        self.flush_seconds = 0.0
+
+
+class WriteBuffer(Generic[T]):
+    """A write-behind buffer for the items of a model, for keys written at a high rate.
+
+    ``save`` and ``update`` are buffered instead of being sent. Only the last item put for a key is
+    written, increments (``Field.set_add``) of the same attribute are summed, and the other actions on
+    an attribute are combined where possible, so many writes of a key become one request. Buffered puts
+    are sent through ``BatchWrite``, and the actions buffered for a key as a single ``UpdateItem``.
+
+    The buffer is flushed every ``flush_interval`` seconds by a background thread, when ``max_keys`` keys
+    are pending, and on ``close`` (at the end of a ``with`` block, or when the interpreter exits). A
+    writer that fills the buffer flushes it itself, waiting for a flush in progress first, so writers
+    are held back to the rate the table accepts. Errors of background flushes are kept in
+    ``last_error`` and the failed writes are put back in the buffer, under any newer writes of the key.
+
+    Args:
+        model (Type[Dynamantic]):
+                The model of the items written.
+
+        max_keys (int, optional):
+                Number of pending keys that triggers a flush in the writer. Defaults to 1000.
+
+        flush_interval (float, optional):
+                Seconds between background flushes, None to only flush on size and ``close``.
+                Defaults to 1.
+
+        max_retries (int, optional):
+                Number of times unprocessed puts are resubmitted. Defaults to 10.
+
+        max_workers (int, optional):
+                Number of batch requests sent concurrently. Defaults to 4.
+    """
+
+    def __init__(
+        self,
+        model: Type[T],
+        max_keys: int = 1000,
+        flush_interval: float | None = 1.0,
+        max_retries: int = 10,
+        max_workers: int = 4,
+    ) -> None:
+        if max_keys < 1:
+            raise ValueError("max_keys must be at least 1")
+        self._model = model
+        self._max_keys = max_keys
+        self._flush_interval = flush_interval
+        self._max_retries = max_retries
+        self._max_workers = max_workers
+
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending: Dict[Tuple, _Pending] = {}
+        self._closed = threading.Event()
+        self._thread: threading.Thread | None = None
+
+        self.stats = WriteBufferStats()
+        self.last_error: Exception | None = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def save(self, item: T) -> None:
+        """Buffer a put of the item, replacing every write of its key buffered before."""
+        self._write(item, lambda pending: pending.save(item))
+
+    def update(self, item: T, actions: List[ConditionExpression]) -> None:
+        """Buffer update actions of the item, combined with the actions buffered for its key."""
+        actions_by_path = {}
+        for action in actions:
+            path = action._expr._compile()
+            kind = _action_kind(action)
+            value = None if kind == "remove" else next(iter(action.expression_attribute_values.values()))
+            action = (kind, value)
+            if path in actions_by_path:
+                action = _coalesce(actions_by_path[path], action)
+                if action is None:
+                    raise UpdateError(f"Actions on {path} can't be combined in a single update.")
+            actions_by_path[path] = action
+
+        if not self._write(item, lambda pending: pending.update(item, actions_by_path)):
+            # the key is written first, so the actions are applied in order
+            self.flush()
+            self._write(item, lambda pending: pending.update(item, actions_by_path))
+
+    def flush(self) -> None:
+        """Send every buffered write, raising the first error after the failed writes are put back."""
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            if len(pending) == 0:
+                return
+
+            started = time.monotonic()
+            self._count(flushes=1)
+            failed: Dict[Tuple, _Pending] = {}
+            error: Exception | None = None
+
+            puts = {identity: entry for identity, entry in pending.items() if entry.put}
+            if len(puts) > 0:
+                try:
+                    with BatchWrite(max_retries=self._max_retries, max_workers=self._max_workers) as batch:
+                        for entry in puts.values():
+                            batch.save(entry.item)
+                    self._count(puts=len(puts))
+                except Exception as exc:  # pylint: disable=broad-exception-caught
+                    error = exc
+                    failed.update(puts)
+
+            for identity, entry in pending.items():
+                if len(entry.actions) == 0 or identity in failed:
+                    continue
+                try:
+                    self._send_update(entry)
+                    self._count(updates=1)
+                except UpdateError as exc:
+                    error = error or exc
+                    entry.put = False
+                    failed[identity] = entry
+
+            self._restore(failed)
+            self._count(flush_seconds=time.monotonic() - started)
+            if error is not None:
+                self._count(errors=1)
+                self.last_error = error
+                raise error
+
+    def close(self) -> None:
+        """Stop the background flushes and send every buffered write. Later writes raise."""
+        self._closed.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        atexit.unregister(self.close)
+        self.flush()
+
+    def _write(self, item: T, apply) -> bool:
+        if self._closed.is_set():
+            raise InvalidStateError("The write buffer is closed.")
+        if not isinstance(item, self._model):
+            raise ValueError(f"Expected an item of {self._model.__name__}, got {item.__class__.__name__}")
+        self._start()
+
+        identity = item._identity()
+        with self._lock:
+            pending = self._pending.get(identity)
+            if pending is None:
+                pending = self._pending[identity] = _Pending(item)
+                apply(pending)
+            elif apply(pending):
+                self.stats.coalesced += 1
+            else:
+                return False
+            self.stats.writes += 1
+            full = len(self._pending) >= self._max_keys
+
+        if full:
+            self._count(backpressure=1)
+            self.flush()
+        return True
+
+    def _count(self, **counts: float) -> None:
+        # writers and the background flush update the counters concurrently
+        with self._lock:
+            for name, value in counts.items():
+                setattr(self.stats, name, getattr(self.stats, name) + value)
+
+    def _send_update(self, entry: _Pending) -> None:
+        builder = UpdateExpressionBuilder()
+        for path, (kind, value) in entry.actions.items():
+            action, clause = _CLAUSES[kind]
+            value = None if value is None else builder.value(value)
+            builder.add_clause(action, clause.format(path=builder.name(path), value=value))
+        expression, names, values = builder.build()
+
+        payload = {
+            "TableName": self._model.__table_name__,
+            "Key": entry.item._primary_key(),
+            "UpdateExpression": expression,
+            "ExpressionAttributeNames": names,
+        }
+        if len(values) > 0:
+            payload["ExpressionAttributeValues"] = values
+
+        try:
+            self._model._dynamodb().update_item(**payload)
+        except BOTOCORE_EXCEPTIONS as exc:
+            raise UpdateError(f"Failed to update item: {exc}", exc) from exc
+        # the new values are not returned, so the item is read again the next time it is requested
+        entry.item._track_write("discard")
+
+    def _restore(self, failed: Dict[Tuple, _Pending]) -> None:
+        with self._lock:
+            for identity, entry in failed.items():
+                newer = self._pending.get(identity)
+                if newer is not None and not entry.merge(newer):
+                    # the newer actions can't follow the failed ones, the newer writes win
+                    continue
+                self._pending[identity] = entry
+
+    def _start(self) -> None:
+        if self._thread is not None or self._flush_interval is None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="dynamantic-write-buffer", daemon=True)
+                self._thread.start()
+                atexit.register(self.close)
+
+    def _run(self) -> None:
+        while not self._closed.wait(self._flush_interval):
+            try:
+                self.flush()
+            except Exception:  # pylint: disable=broad-exception-caught
+                # kept in last_error, the writes are retried on the next flush
+                pass
@@ -0,0 +1,319 @@
+import threading
+import time
+from collections import OrderedDict
+from decimal import Decimal
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Set, Tuple
+
+from boto3.dynamodb.conditions import AttributeBase, ConditionBase
+from boto3.dynamodb.types import Binary
+
+
+def item_size(value: Any) -> int:
+    """Approximate the size in bytes DynamoDB counts for an attribute value (or an item)."""
+    if value is None or isinstance(value, bool):
+        return 1
+    if isinstance(value, str):
+        return len(value.encode())
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, Binary):
+        return len(value.value)
+    if isinstance(value, (int, float, Decimal)):
+        return len(str(value))
+    if isinstance(value, dict):
+        return 3 + sum(item_size(k) + item_size(v) + 1 for k, v in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return 3 + sum(item_size(v) + 1 for v in value)
+    return len(str(value))
+
+
+class CacheStats:
+    """Counters for an ``ItemCache`` or a ``QueryCache``."""
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class _LRUCache:
+    """Thread safe LRU of values with an optional expiry, bounded in entries and approximate bytes."""
+
+    def __init__(self, max_entries: int | None, max_bytes: int | None, clock: Callable[[], float]) -> None:
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._clock = clock
+
+        self._lock = threading.RLock()
+        # key -> (value, expires at, size)
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float | None, int]]" = OrderedDict()
+        self._size = 0
+        self._generation = 0
+
+        self.stats = CacheStats()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size(self) -> int:
+        """Approximate size of the cached values in bytes."""
+        return self._size
+
+    @property
+    def generation(self) -> int:
+        """Changes on every invalidation. Pass the value read before a request to ``put``."""
+        return self._generation
+
+    def lookup(self, key: Hashable) -> Any | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats.misses += 1
+                return None
+
+            value, expires_at, _ = entry
+            if expires_at is not None and expires_at <= self._clock():
+                self._remove(key)
+                self.stats.expirations += 1
+                self.stats.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._record_hit(value)
+            return value
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._generation += 1
+            self.stats.invalidations += 1
+            if key in self._entries:
+                self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            for key in list(self._entries):
+                self._remove(key)
+
+    def _record_hit(self, _: Any) -> None:
+        self.stats.hits += 1
+
+    def _store(self, key: Hashable, value: Any, ttl: float | None, generation: int | None) -> bool:
+        # values read before a write was invalidated may be stale, so they are not cached when the
+        # generation read before the request has changed
+        size = item_size(value)
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return False
+            if self._max_bytes is not None and size > self._max_bytes:
+                return False
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, None if ttl is None else self._clock() + ttl, size)
+            self._size += size
+            self._evict()
+            return True
+
+    def _remove(self, key: Hashable) -> None:
+        self._size -= self._entries.pop(key)[2]
+
+    def _evict(self) -> None:
+        while (self._max_entries is not None and len(self._entries) > self._max_entries) or (
+            self._max_bytes is not None and self._size > self._max_bytes
+        ):
+            self._remove(next(iter(self._entries)))
+            self.stats.evictions += 1
+
+
+class ItemCache(_LRUCache):
+    """A read-through cache of items in front of ``get`` and ``batch_get``, with LRU and TTL eviction.
+
+    Set ``__item_cache__`` on a model to use it, one cache can be shared by many models. Items are kept
+    as returned by DynamoDB, so every read builds a fresh model instance. Keys that do not exist are
+    cached as ``{}``, so repeated misses do not reach DynamoDB either. Writes made through this library
+    (``save``, ``update``, ``delete``, ``BatchWrite`` and ``TransactWrite``) invalidate the key.
+
+    Any object with the ``lookup``, ``put``, ``invalidate`` and ``generation`` members of this class
+    can be used instead, e.g. to share items between processes.
+
+    Args:
+        max_items (int, optional):
+                Maximum number of keys cached. Defaults to 1024.
+
+        max_bytes (int, optional):
+                Maximum approximate size of the cached items in bytes. Defaults to None, no limit.
+
+        ttl (float, optional):
+                Seconds an item is served for after it was read. Defaults to None, until evicted.
+
+        negative_ttl (float, optional):
+                Seconds a missing key is served for. Defaults to ``ttl``.
+
+        cache_misses (bool, optional):
+                Cache keys that do not exist. Defaults to True.
+    """
+
+    def __init__(
+        self,
+        max_items: int | None = 1024,
+        max_bytes: int | None = None,
+        ttl: float | None = None,
+        negative_ttl: float | None = None,
+        cache_misses: bool = True,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        super().__init__(max_items, max_bytes, clock)
+        self._ttl = ttl
+        self._negative_ttl = ttl if negative_ttl is None else negative_ttl
+        self._cache_misses = cache_misses
+
+    def lookup(self, key: Hashable) -> Dict[str, Any] | None:
+        """The cached item, ``{}`` for a key known not to exist, or None when the key is not cached."""
+        return super().lookup(key)
+
+    def put(self, key: Hashable, item: Dict[str, Any], generation: int | None = None) -> None:
+        """Cache an item read from DynamoDB, ``{}`` when it does not exist.
+
+        Pass the ``generation`` read before the request, so the item is not cached when a write of
+        the key was invalidated while it was in flight.
+        """
+        if not item and not self._cache_misses:
+            return
+        self._store(key, item, self._ttl if item else self._negative_ttl, generation)
+
+    def _record_hit(self, item: Dict[str, Any]) -> None:
+        if item:
+            self.stats.hits += 1
+        else:
+            self.stats.negative_hits += 1
+
+
+class QueryCache(_LRUCache):
+    """A cache of ``query`` results keyed by the normalized query, with LRU and TTL eviction.
+
+    Set ``__query_cache__`` on a model to use it, and share the cache between models of the same table.
+    Every result is tagged with the partition it read. A write made through this library invalidates
+    every cached query of the item's partition, and, since the previous values of the index keys of an
+    item are not known, every cached query of a global secondary index of the table.
+
+    Args:
+        max_entries (int, optional):
+                Maximum number of query results cached. Defaults to 256.
+
+        max_bytes (int, optional):
+                Maximum approximate size of the cached results in bytes. Defaults to None, no limit.
+
+        ttl (float, optional):
+                Seconds a result is served for after the query ran. Defaults to None, until evicted.
+    """
+
+    def __init__(
+        self,
+        max_entries: int | None = 256,
+        max_bytes: int | None = None,
+        ttl: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        super().__init__(max_entries, max_bytes, clock)
+        self._ttl = ttl
+        self._tags: Dict[Hashable, Set[Hashable]] = {}
+        self._entry_tags: Dict[Hashable, Tuple[Hashable, ...]] = {}
+
+    def lookup(self, key: Hashable) -> List[Dict[str, Any]] | None:
+        """The cached items of a query, or None when the query is not cached."""
+        return super().lookup(key)
+
+    def put(
+        self,
+        key: Hashable,
+        items: List[Dict[str, Any]],
+        tags: Iterable[Hashable] = (),
+        generation: int | None = None,
+    ) -> None:
+        """Cache the items of a query, invalidated along with any of the ``tags``."""
+        with self._lock:
+            if self._store(key, items, self._ttl, generation):
+                self._entry_tags[key] = tuple(tags)
+                for tag in self._entry_tags[key]:
+                    self._tags.setdefault(tag, set()).add(key)
+
+    def invalidate_tags(self, tags: Iterable[Hashable]) -> None:
+        """Drop every cached query tagged with one of ``tags``."""
+        with self._lock:
+            self._generation += 1
+            self.stats.invalidations += 1
+            for tag in tags:
+                for key in list(self._tags.get(tag, ())):
+                    self._remove(key)
+
+    def _remove(self, key: Hashable) -> None:
+        super()._remove(key)
+        for tag in self._entry_tags.pop(key, ()):
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+def normalize(value: Any) -> Hashable:
+    """A canonical, hashable form of a condition tree or a value, used to key cached queries.
+
+    Numbers compare by value, ``AND``/``OR`` operands are flattened and ordered, and collections are
+    converted to tuples and frozensets. Booleans, numbers and collections are tagged with their type, as
+    DynamoDB tells them apart: ``True`` is not the number 1, and a list of pairs is not a map.
+    """
+    if isinstance(value, ConditionBase):
+        expression = value.get_expression()
+        operator = expression["operator"]
+        operands = []
+        for operand in expression["values"]:
+            operand = normalize(operand)
+            if operator in ("AND", "OR") and isinstance(operand, tuple) and operand[0] == operator:
+                operands.extend(operand[1])
+            else:
+                operands.append(operand)
+        if operator in ("AND", "OR"):
+            operands.sort(key=repr)
+        return (operator, tuple(operands))
+    if isinstance(value, AttributeBase):
+        return ("attribute", value.name)
+    if value is None:
+        return value
+    if isinstance(value, bool):
+        return ("bool", value)
+    if isinstance(value, (int, float, Decimal)):
+        return ("number", Decimal(str(value)))
+    if isinstance(value, (list, tuple)):
+        return ("list", tuple(normalize(val) for val in value))
+    if isinstance(value, (set, frozenset)):
+        return ("set", frozenset(normalize(val) for val in value))
+    if isinstance(value, dict):
+        return ("map", tuple(sorted((key, normalize(val)) for key, val in value.items())))
+    try:
+        hash(value)
+    except TypeError:
+        return ("repr", repr(value))
+    return value
+    if isinstance(value, (int, float, Decimal)):
+        return Decimal(str(value))
+    if isinstance(value, (list, tuple)):
+        return tuple(normalize(val) for val in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(normalize(val) for val in value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, normalize(val)) for key, val in value.items()))
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+    return value
@@ -0,0 +1,349 @@
+import typing
+import inspect
+import weakref
+from enum import Enum
+from decimal import Decimal
+from types import MappingProxyType, UnionType
+from datetime import datetime, time, date
+from typing import Any, Callable, Dict, FrozenSet, List, Mapping, Tuple
+
+from boto3.dynamodb.types import DYNAMODB_CONTEXT, Binary, TypeSerializer
+from pydantic import BaseModel
+
+from dynamantic.types import dynamodb_compatible_value, format_float
+
+_TYPE_SERIALIZER = TypeSerializer()
+
+_object_setattr = object.__setattr__
+
+# types boto3 deserializes attributes to as they are, only converted when the item is validated
+_TRUSTED_TYPES = (str, bool, dict, list)
+
+# the serialization plan of each model class and the core schema it was built from, see _serialization_plan
+_PLANS: "weakref.WeakKeyDictionary[type, Tuple[Any, Tuple[bool, FrozenSet[str]]]]" = weakref.WeakKeyDictionary()
+
+
+class _AnyValue:
+    """Stands in for the value when compiling, to detect fields typed as ``Any``."""
+
+
+def _scalar_converter(class_: type, trusted: bool = False) -> Callable[[Any], Any]:
+    if class_ in (datetime, date, time):
+        convert = class_.fromisoformat
+    elif inspect.isclass(class_) and issubclass(class_, BaseModel) and hasattr(class_, "_codec"):
+        # nested Dynamantic models use their own compiled codec
+        if trusted:
+            codec = None
+
+            def convert(value):
+                nonlocal codec
+                if codec is None:
+                    codec = class_._codec()
+                return codec.construct(value)
+
+        else:
+
+            def convert(value):
+                return class_(**class_._codec().deserialize(value))
+
+    else:
+        convert = class_
+
+    def converter(value):
+        if value is None:
+            return value
+        return convert(value)
+
+    return converter
+
+
+def _converter(classes: List[type], trusted: bool = False) -> Callable[[Any], Any] | None:
+    """Build the converter for a field from the base classes of its type hint, outermost collection last.
+
+    Trusted values that boto3 already returns as the type of the field need no converter, None is returned.
+    """
+    collection_class = classes[1] if len(classes) > 1 else None
+    if trusted and classes[0] in _TRUSTED_TYPES and collection_class in (None, list, set):
+        return None
+    scalar = _scalar_converter(classes[0], trusted)
+
+    if collection_class in (list, tuple, frozenset):
+
+        def converter(value):
+            if value is None:
+                return value
+            return collection_class([scalar(val) for val in value])
+
+    elif collection_class == set:
+
+        def converter(value):
+            if value is None:
+                return value
+            return {scalar(val) for val in value}
+
+    else:
+        converter = scalar
+
+    return converter
+
+
+def _number(value: int | Decimal) -> Dict[str, str]:
+    number = str(DYNAMODB_CONTEXT.create_decimal(value))
+    if number in ("Infinity", "NaN"):
+        raise TypeError("Infinity and NaN not supported")
+    return {"N": number}
+
+
+def _set(value: set | frozenset) -> Dict[str, Any]:
+    # binary sets are written as a list of binary values, see serialize_map
+    if all(isinstance(val, str) for val in value):
+        return {"SS": list(value)}
+    if all(isinstance(val, (int, float, Decimal)) and not isinstance(val, bool) for val in value):
+        return {"NS": [serialize_value(val)["N"] for val in value]}
+    if all(isinstance(val, (bytes, bytearray, Binary)) for val in value):
+        return {"L": [serialize_value(val) for val in value]}
+    return _TYPE_SERIALIZER.serialize(dynamodb_compatible_value(value))
+
+
+_WIRE_SERIALIZERS: Dict[type, Callable[[Any], Dict[str, Any]]] = {
+    type(None): lambda _: {"NULL": True},
+    bool: lambda value: {"BOOL": value},
+    str: lambda value: {"S": value},
+    int: _number,
+    Decimal: _number,
+    float: lambda value: _number(Decimal(format_float(value))),
+    bytes: lambda value: {"B": value},
+    bytearray: lambda value: {"B": bytes(value)},
+    Binary: lambda value: {"B": value.value},
+    datetime: lambda value: {"S": value.isoformat()},
+    date: lambda value: {"S": value.isoformat()},
+    time: lambda value: {"S": value.isoformat()},
+    dict: lambda value: {"M": {k: serialize_value(v) for k, v in value.items()}},
+    list: lambda value: {"L": [serialize_value(v) for v in value]},
+    tuple: lambda value: {"L": [serialize_value(v) for v in value]},
+    set: _set,
+    frozenset: _set,
+}
+
+
+def serialize_value(value: Any) -> Dict[str, Any]:
+    """Convert a python value straight to DynamoDB wire format (``{"S": ...}``, ``{"N": ...}``)."""
+    serializer = _WIRE_SERIALIZERS.get(value.__class__)
+    if serializer is not None:
+        return serializer(value)
+    if isinstance(value, Enum):
+        return serialize_value(value.value)
+    if isinstance(value, BaseModel):
+        whole, dumped = _serialization_plan(value.__class__)
+        if whole:
+            return {"M": {k: serialize_value(v) for k, v in value.model_dump().items()}}
+        dumps = value.model_dump(include=dumped) if dumped else {}
+        return {"M": {name: serialize_value(dumps.get(name, getattr(value, name))) for name in value.model_fields}}
+    for class_, serializer in _WIRE_SERIALIZERS.items():
+        if isinstance(value, class_):
+            return serializer(value)
+    return _TYPE_SERIALIZER.serialize(dynamodb_compatible_value(value))
+
+
+def wire_equal(a: Dict[str, Any] | None, b: Dict[str, Any] | None) -> bool:
+    """Compare two values in DynamoDB wire format, numbers by value and sets regardless of order."""
+    if a is None or b is None:
+        return a is b
+    (a_type, a_value), (b_type, b_value) = next(iter(a.items())), next(iter(b.items()))
+    if a_type != b_type:
+        return False
+    if a_type == "N":
+        return Decimal(a_value) == Decimal(b_value)
+    if a_type == "B":
+        return bytes(a_value) == bytes(b_value)
+    if a_type in ("SS", "NS", "BS"):
+        added, removed = set_delta(a_type, a_value, b_value)
+        return len(added) == 0 and len(removed) == 0
+    if a_type == "M":
+        return a_value.keys() == b_value.keys() and all(wire_equal(a_value[k], b_value[k]) for k in a_value)
+    if a_type == "L":
+        return len(a_value) == len(b_value) and all(wire_equal(x, y) for x, y in zip(a_value, b_value))
+    return a_value == b_value
+
+
+def set_delta(dynamodb_type: str, before: List[Any], after: List[Any]) -> Tuple[List[Any], List[Any]]:
+    """The elements added to and removed from a set in wire format (``SS``, ``NS`` or ``BS``)."""
+    normalize = {"NS": Decimal, "BS": bytes}.get(dynamodb_type, str)
+    before_values = {normalize(value): value for value in before}
+    after_values = {normalize(value): value for value in after}
+    added = [value for key, value in after_values.items() if key not in before_values]
+    removed = [value for key, value in before_values.items() if key not in after_values]
+    return added, removed
+
+
+def _customizes_serialization(schema: Any) -> bool:
+    """Whether a pydantic core schema holds a custom serializer, e.g. a ``field_serializer`` or ``PlainSerializer``."""
+    if isinstance(schema, dict):
+        return "serialization" in schema or any(_customizes_serialization(value) for value in schema.values())
+    if isinstance(schema, list):
+        return any(_customizes_serialization(value) for value in schema)
+    return False
+
+
+def _serialization_plan(model_cls: type) -> Tuple[bool, FrozenSet[str]]:
+    """Whether ``model_dump`` must serialize the whole model, and otherwise the fields it must serialize.
+
+    Models and fields with custom serializers are dumped by pydantic, the others are read as they are.
+    """
+    schema = model_cls.__pydantic_core_schema__
+    cached = _PLANS.get(model_cls)
+    if cached is None or cached[0] is not schema:
+        node = schema
+        # the model under its definitions and validators
+        while isinstance(node, dict) and node.get("type") != "model":
+            node = node.get("schema")
+        if node is None:
+            plan = (_customizes_serialization(schema), frozenset())
+        elif "serialization" in node:
+            plan = (True, frozenset())
+        else:
+            fields = node["schema"].get("fields", {})
+            plan = (False, frozenset(name for name, field in fields.items() if _customizes_serialization(field)))
+        cached = (schema, plan)
+        _PLANS[model_cls] = cached
+    return cached[1]
+
+
+def _field_serializer(annotation: Any) -> Callable[[Any], Dict[str, Any]]:
+    """Use the wire serializer of the annotation directly when it is a single known type."""
+    options = [arg for arg in typing.get_args(annotation) if arg is not type(None)]
+    if len(options) == 1 and typing.get_origin(annotation) in (typing.Union, UnionType):
+        annotation = options[0]
+    if inspect.isclass(annotation) and annotation in _WIRE_SERIALIZERS and annotation not in (dict, list, set):
+        return _WIRE_SERIALIZERS[annotation]
+    return serialize_value
+
+
+def _unique_classes_with_order(class_list: List[type]) -> List[type]:
+    seen = set()
+    return [class_ for class_ in class_list if class_ not in seen and not seen.add(class_)]
+
+
+class ModelCodec:
+    """Converters for every field of a model, compiled once from the type hints.
+
+    Resolving the base classes of a type hint is the expensive part of deserializing an attribute, so
+    it is done once per model class rather than for every attribute of every item. Fields typed as
+    ``Any`` depend on the value, and are resolved per value. Serializing goes from the model straight
+    to DynamoDB wire format in a single pass. Custom serializers, such as ``field_serializer``,
+    ``model_serializer`` or ``PlainSerializer``, are applied through ``model_dump`` for the fields, or
+    the models, that have them.
+
+    ``attribute_classes`` and ``attribute_types`` are read only tables of the python classes and the
+    DynamoDB type of every attribute, so building keys and table definitions is a dictionary lookup.
+
+    ``construct`` builds trusted items, already converted to the types of the model, without validating
+    them, nested models included.
+    """
+
+    attribute_classes: Mapping[str, FrozenSet[type]]
+    attribute_types: Mapping[str, str]
+
+    def __init__(self, model_cls: type) -> None:
+        self._model_cls = model_cls
+        self._deserializers: Dict[str, Callable[[Any], Any]] = {}
+        self._trusted_deserializers: Dict[str, Callable[[Any], Any]] = {}
+        self._field_names = tuple(model_cls.model_fields)
+        self._optional_fields = [
+            (name, field) for name, field in model_cls.model_fields.items() if not field.is_required()
+        ]
+        self._serializers: Dict[str, Callable[[Any], Dict[str, Any]]] = {}
+        self._dump_model, self._dumped_fields = _serialization_plan(model_cls)
+        self.attribute_classes = MappingProxyType(
+            {name: frozenset(model_cls._resolve_pydantic_types(name)) for name in model_cls.model_fields}
+        )
+        self.attribute_types = MappingProxyType(
+            {name: model_cls._resolve_dynamodb_type(name) for name in model_cls.model_fields}
+        )
+        for name, field in model_cls.model_fields.items():
+            if name in self._dumped_fields:
+                self._serializers[name] = serialize_value
+            else:
+                self._serializers[name] = _field_serializer(field.annotation)
+            classes = _unique_classes_with_order(model_cls._get_base_class(field.annotation, _AnyValue(), []))
+            if _AnyValue in classes or len(classes) == 0:
+                self._deserializers[name] = self._dynamic_converter(field.annotation)
+                self._trusted_deserializers[name] = self._dynamic_converter(field.annotation, trusted=True)
+            else:
+                self._deserializers[name] = _converter(classes)
+                trusted = _converter(classes, trusted=True)
+                if trusted is not None:
+                    self._trusted_deserializers[name] = trusted
+
+    def deserialize(self, values: Dict[str, Any], trusted: bool = False) -> Dict[str, Any]:
+        """Convert the attributes of a DynamoDB item, in place, to the python types of the model."""
+        if trusted:
+            # only the attributes that need converting are visited
+            for k, deserializer in self._trusted_deserializers.items():
+                if k in values:
+                    values[k] = deserializer(values[k])
+            return values
+
+        deserializers = self._deserializers
+        for k, v in values.items():
+            deserializer = deserializers.get(k)
+            if deserializer is not None:
+                values[k] = deserializer(v)
+        return values
+
+    def deserialize_attribute(self, name: str, value: Any, trusted: bool = False) -> Any:
+        """Convert a single attribute of a DynamoDB item to the python type of its field."""
+        deserializer = (self._trusted_deserializers if trusted else self._deserializers).get(name)
+        return value if deserializer is None else deserializer(value)
+
+    def construct(self, values: Dict[str, Any]) -> BaseModel:
+        """Build the model from a DynamoDB item without validation, converting the item in place."""
+        model_cls = self._model_cls
+        values = self.deserialize(values, trusted=True)
+        if model_cls.__pydantic_post_init__:
+            return model_cls.model_construct(**values)
+
+        # what model_construct does, without the aliases and extra attributes a stored item doesn't have
+        fields = {name: values[name] for name in self._field_names if name in values}
+        fields_set = set(fields)
+        if len(fields) < len(self._field_names):
+            for name, field in self._optional_fields:
+                if name not in fields:
+                    fields[name] = field.get_default(call_default_factory=True)
+        model = model_cls.__new__(model_cls)
+        _object_setattr(model, "__dict__", fields)
+        _object_setattr(model, "__pydantic_fields_set__", fields_set)
+        _object_setattr(model, "__pydantic_extra__", None)
+        _object_setattr(model, "__pydantic_private__", None)
+        return model
+
+    def serialize(self, model: BaseModel, attributes: List[str] | None = None) -> Dict[str, Dict[str, Any]]:
+        """Convert a model straight to a DynamoDB item in wire format, leaving out ``None`` attributes."""
+        if self._dump_model:
+            values = model.model_dump()
+            return {
+                k: serialize_value(v)
+                for k, v in values.items()
+                if v is not None and (attributes is None or k in attributes)
+            }
+
+        item = {}
+        dumped = self._dumped_fields if attributes is None else self._dumped_fields.intersection(attributes)
+        dumps = model.model_dump(include=dumped) if dumped else {}
+        for name, serializer in self._serializers.items():
+            if attributes is not None and name not in attributes:
+                continue
+            value = dumps[name] if name in dumps else getattr(model, name)
+            if value is not None:
+                item[name] = serializer(value)
+        return item
+
+    def _dynamic_converter(self, type_hint: Any, trusted: bool = False) -> Callable[[Any], Any]:
+        def converter(value):
+            classes = _unique_classes_with_order(self._model_cls._get_base_class(type_hint, value, []))
+            if len(classes) == 0:
+                return value
+            convert = _converter(classes, trusted)
+            return value if convert is None else convert(value)
+
+        return converter
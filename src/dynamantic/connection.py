@@ -0,0 +1,107 @@
+import threading
+from typing import Dict, NamedTuple, Tuple
+
+import boto3
+from botocore.config import Config
+
+from mypy_boto3_dynamodb import DynamoDBClient, DynamoDBServiceResource
+from mypy_boto3_dynamodb.service_resource import _Table
+
+# large enough that every thread of the async request pool can hold a connection
+DEFAULT_MAX_POOL_CONNECTIONS = 64
+
+
+class ConnectionKey(NamedTuple):
+    region_name: str | None
+    endpoint_url: str | None
+    aws_access_key_id: str | None
+    aws_secret_access_key: str | None
+    aws_session_token: str | None
+    # compared by identity, models that share a Config object share a connection
+    config: Config | None
+
+
+class ConnectionRegistry:
+    """Share a DynamoDB client and connection pool between every model that connects the same way.
+
+    Connections are keyed by region, endpoint, credentials and the model's botocore ``Config``, so all
+    models of a table (and all tables of an account) reuse the same warm connections. Creation is locked, so
+    concurrent first use from many threads still creates a single client.
+
+    Args:
+        config (Config, optional):
+                The default botocore config, merged under the config of each model. Defaults to a
+                config with ``max_pool_connections`` of ``DEFAULT_MAX_POOL_CONNECTIONS``.
+    """
+
+    def __init__(self, config: Config | None = None) -> None:
+        self._lock = threading.Lock()
+        self._config = config or Config(max_pool_connections=DEFAULT_MAX_POOL_CONNECTIONS)
+        self._connections: Dict[ConnectionKey, Tuple[DynamoDBClient, DynamoDBServiceResource]] = {}
+        self._tables: Dict[Tuple[ConnectionKey, str], _Table] = {}
+
+    @property
+    def config(self) -> Config:
+        return self._config
+
+    def configure(self, config: Config | None = None, **kwargs) -> None:
+        """Replace the default botocore config, e.g. ``configure(max_pool_connections=128)``.
+
+        Keyword arguments are merged over ``config`` (or the current default). Connections created
+        with the previous config are dropped, models connect again on their next request.
+        """
+        config = config or self._config
+        if kwargs:
+            config = config.merge(Config(**kwargs))
+        with self._lock:
+            self._config = config
+            self._connections = {}
+            self._tables = {}
+
+    def clear(self) -> None:
+        """Drop every connection."""
+        with self._lock:
+            self._connections = {}
+            self._tables = {}
+
+    def client(self, key: ConnectionKey) -> DynamoDBClient:
+        return self._connection(key)[0]
+
+    def resource(self, key: ConnectionKey) -> DynamoDBServiceResource:
+        return self._connection(key)[1]
+
+    def table(self, key: ConnectionKey, table_name: str) -> _Table:
+        table = self._tables.get((key, table_name))
+        if table is None:
+            table = self.resource(key).Table(table_name)
+            with self._lock:
+                table = self._tables.setdefault((key, table_name), table)
+        return table
+
+    def _connection(self, key: ConnectionKey) -> Tuple[DynamoDBClient, DynamoDBServiceResource]:
+        connection = self._connections.get(key)
+        if connection is None:
+            with self._lock:
+                connection = self._connections.get(key)
+                if connection is None:
+                    connection = self._create(key)
+                    self._connections[key] = connection
+        return connection
+
+    def _create(self, key: ConnectionKey) -> Tuple[DynamoDBClient, DynamoDBServiceResource]:
+        config = self._config if key.config is None else self._config.merge(key.config)
+        params = {
+            "region_name": key.region_name,
+            "endpoint_url": key.endpoint_url,
+            "aws_access_key_id": key.aws_access_key_id,
+            "aws_secret_access_key": key.aws_secret_access_key,
+            "aws_session_token": key.aws_session_token,
+            "config": config,
+        }
+        # the default boto3 session is not safe to share between threads, each connection has its own.
+        # the client of the resource converts python values, so wire format requests use a plain client
+        session = boto3.session.Session()
+        return session.client("dynamodb", **params), session.resource("dynamodb", **params)
+
+
+connections = ConnectionRegistry()
@@ -0,0 +1,253 @@
+import time
+import random
+from collections import deque
+from decimal import Decimal
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Deque, Dict, Hashable, List, Tuple, Type
+
+from botocore.client import ClientError
+from botocore.exceptions import BotoCoreError
+
+from mypy_boto3_dynamodb import DynamoDBClient
+
+from dynamantic.exceptions import BatchGetError, BatchWriteError, DynamanticException
+
+BOTOCORE_EXCEPTIONS = (BotoCoreError, ClientError)
+
+BATCH_WRITE_LIMIT = 25
+BATCH_GET_LIMIT = 100
+
+# (table name, request or key, attempt, identity) of the work left to send
+_Entry = Tuple[str, Dict, int, Hashable]
+
+
+def key_identity(table_name: str, key: Dict[str, Dict[str, Any]]) -> Tuple:
+    """A hashable identity for a key (or the key attributes of an item) in DynamoDB wire format."""
+    parts = []
+    for name, typed_value in key.items():
+        dynamodb_type, value = next(iter(typed_value.items()))
+        if dynamodb_type == "N":
+            value = Decimal(str(value))
+        elif dynamodb_type == "B":
+            value = bytes(value)
+        parts.append((name, dynamodb_type, value))
+    return (table_name, tuple(sorted(parts)))
+
+
+class BatchStats:
+    """Counters for the requests sent by a ``BatchExecutor``."""
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.items = 0
+        self.unprocessed = 0
+        # the number of times the most retried item in each batch had been resubmitted, in send order
+        self.retry_counts: List[int] = []
+
+    @property
+    def retries(self) -> int:
+        return sum(1 for count in self.retry_counts if count > 0)
+
+
+class BatchExecutor:
+    """Send batch requests, resubmitting unprocessed work with exponential backoff and full jitter.
+
+    Unprocessed items are put back at the front of the pending work, so they are coalesced with items
+    that have not been sent yet into full batches instead of being sent on their own. Writes of the same
+    key are sent one after the other, in order, even when batches are sent concurrently.
+
+    Args:
+        client (DynamoDBClient):
+                The client used to send the requests.
+
+        max_retries (int, optional):
+                Number of times an item is resubmitted before giving up. Defaults to 10.
+
+        base_delay (float, optional):
+                Delay in seconds of the first retry, doubled for every retry after. Defaults to 0.05.
+
+        max_delay (float, optional):
+                Maximum delay in seconds between retries. Defaults to 5.
+
+        max_workers (int, optional):
+                Number of batches sent concurrently. Defaults to 1.
+    """
+
+    def __init__(
+        self,
+        client: DynamoDBClient,
+        max_retries: int = 10,
+        base_delay: float = 0.05,
+        max_delay: float = 5.0,
+        max_workers: int = 1,
+    ) -> None:
+        self._client = client
+        self._max_workers = max(max_workers, 1)
+        self._max_retries = max_retries
+        self._base_delay = base_delay
+        self._max_delay = max_delay
+        self.stats = BatchStats()
+
+    def write(self, operations: List[Tuple[str, Dict]], keys: List[Dict[str, Dict]] | None = None) -> None:
+        """Send ``PutRequest``/``DeleteRequest`` operations, given as (table name, request) pairs.
+
+        ``keys`` holds the primary key of each operation. A write is only sent once the earlier writes of
+        its key have been processed, so a put followed by a delete of the same item can't be reordered by
+        concurrent batches or retries. Without ``keys``, batches are sent one at a time.
+        """
+
+        def send(batch: List[_Entry]) -> Tuple[List[Tuple[str, Dict]], None]:
+            request_items: Dict[str, List[Dict]] = {}
+            for table, request, *_ in batch:
+                request_items.setdefault(table, []).append(request)
+
+            result = self._client.batch_write_item(RequestItems=request_items)
+            unprocessed = [
+                (table, request)
+                for table, requests in result.get("UnprocessedItems", {}).items()
+                for request in requests
+            ]
+            return unprocessed, None
+
+        identities = None
+        if keys is not None:
+            identities = [key_identity(table, key) for (table, _), key in zip(operations, keys)]
+        self._dispatch(
+            operations,
+            BATCH_WRITE_LIMIT,
+            send,
+            lambda _: None,
+            BatchWriteError,
+            "items",
+            identities=identities,
+            max_workers=self._max_workers if keys is not None else 1,
+        )
+
+    def get(
+        self, operations: List[Tuple[str, Dict]], table_options: Dict[str, Dict] | None = None
+    ) -> Dict[Tuple, Dict[str, Dict]]:
+        """Read keys, given as (table name, key) pairs, returning the items found by ``key_identity``.
+
+        Duplicate keys are only requested once, since DynamoDB rejects a request that contains them.
+        Every requester of a key finds the same item in the result. ``table_options`` holds extra
+        parameters per table, such as ``ConsistentRead`` or ``ProjectionExpression``.
+        """
+        if table_options is None:
+            table_options = {}
+
+        unique: Dict[Tuple, Tuple[str, Dict]] = {}
+        for table, key in operations:
+            unique.setdefault(key_identity(table, key), (table, key))
+        operations = list(unique.values())
+
+        items: Dict[Tuple, Dict[str, Dict]] = {}
+        key_names = {table: list(key) for table, key in operations}
+
+        def send(batch: List[_Entry]) -> Tuple[List[Tuple[str, Dict]], Dict]:
+            request_items: Dict[str, Dict] = {}
+            for table, key, *_ in batch:
+                request_items.setdefault(table, {"Keys": [], **table_options.get(table, {})})["Keys"].append(key)
+
+            result = self._client.batch_get_item(RequestItems=request_items)
+            unprocessed = [
+                (table, key) for table, request in result.get("UnprocessedKeys", {}).items() for key in request["Keys"]
+            ]
+            return unprocessed, result.get("Responses", {})
+
+        def add_items(responses: Dict[str, List[Dict]]) -> None:
+            for table, table_items in responses.items():
+                for item in table_items:
+                    items[key_identity(table, {name: item[name] for name in key_names[table]})] = item
+
+        self._dispatch(operations, BATCH_GET_LIMIT, send, add_items, BatchGetError, "keys")
+        return items
+
+    def _dispatch(
+        self,
+        operations: List[Tuple[str, Dict]],
+        batch_limit: int,
+        send: Callable[[List[_Entry]], Tuple[List[Tuple[str, Dict]], Any]],
+        on_result: Callable[[Any], None],
+        error_cls: Type[DynamanticException],
+        noun: str,
+        identities: List[Hashable] | None = None,
+        max_workers: int | None = None,
+    ) -> None:
+        # up to max_workers batches are in flight, results and retries are handled on this thread
+        if max_workers is None:
+            max_workers = self._max_workers
+        if identities is None:
+            identities = list(range(len(operations)))
+
+        # only the first operation of each identity is pending, the others wait for it to be processed
+        pending: Deque[_Entry] = deque()
+        waiting: Dict[Hashable, Deque[_Entry]] = {}
+        for (table, request), identity in zip(operations, identities):
+            if identity in waiting:
+                waiting[identity].append((table, request, 0, identity))
+            else:
+                waiting[identity] = deque()
+                pending.append((table, request, 0, identity))
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            in_flight: Dict[Future, Tuple[List, int]] = {}
+            while pending or in_flight:
+                while pending and len(in_flight) < max_workers:
+                    batch = [pending.popleft() for _ in range(min(batch_limit, len(pending)))]
+                    attempt = max(item[2] for item in batch)
+                    in_flight[pool.submit(self._send, send, batch, attempt)] = (batch, attempt)
+
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    batch, attempt = in_flight.pop(future)
+                    try:
+                        unprocessed, result = future.result()
+                    except BOTOCORE_EXCEPTIONS as exc:
+                        raise error_cls(f"Failed to send batch: {exc}", exc) from exc
+
+                    on_result(result)
+                    self._record(batch, attempt, unprocessed)
+                    if len(unprocessed) > 0 and attempt >= self._max_retries:
+                        raise error_cls(f"{len(unprocessed)} {noun} were not processed after {attempt} retries.")
+
+                    retried = _unprocessed_entries(batch, unprocessed)
+                    retried_ids = {id(entry) for entry in retried}
+                    released = []
+                    for entry in batch:
+                        if id(entry) in retried_ids:
+                            continue
+                        followers = waiting.get(entry[3])
+                        if followers:
+                            released.append(followers.popleft())
+                        else:
+                            waiting.pop(entry[3], None)
+                    retried = [(table, request, attempt + 1, identity) for table, request, _, identity in retried]
+                    pending.extendleft(reversed(retried + released))
+
+    def _send(self, send: Callable, batch: List[_Entry], attempt: int) -> Tuple[List, Any]:
+        if attempt > 0:
+            time.sleep(random.uniform(0, min(self._max_delay, self._base_delay * 2 ** (attempt - 1))))
+        return send(batch)
+
+    def _record(self, batch: List, attempt: int, unprocessed: List) -> None:
+        self.stats.requests += 1
+        self.stats.items += len(batch)
+        self.stats.unprocessed += len(unprocessed)
+        self.stats.retry_counts.append(attempt)
+
+
+def _unprocessed_entries(batch: List[_Entry], unprocessed: List[Tuple[str, Dict]]) -> List:
+    """The entries of a batch returned unprocessed, matched by table and request.
+
+    A request that matches no entry is still retried, on its own identity.
+    """
+    remaining = list(batch)
+    entries = []
+    for table, request in unprocessed:
+        for index, entry in enumerate(remaining):
+            if entry[0] == table and entry[1] == request:
+                entries.append(remaining.pop(index))
+                break
+        else:
+            entries.append((table, request, 0, object()))
+    return entries
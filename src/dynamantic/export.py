@@ -0,0 +1,211 @@
+# pylint: disable=W0212
+
+import os
+import time
+import typing
+from datetime import date, datetime, time as dt_time
+from decimal import Decimal
+from enum import Enum
+from itertools import islice
+from types import NoneType, UnionType
+from typing import Any, Callable, Dict, Generic, Iterable, Iterator, List, TextIO, Tuple, Type
+
+from pydantic import BaseModel
+from pydantic_core import to_json
+
+from dynamantic.main import T
+
+# the Arrow type of each python type written as it is, see _arrow_type
+_SCALAR_TYPES: Dict[type, Callable[[Any], Any]] = {
+    str: lambda pa: pa.string(),
+    bool: lambda pa: pa.bool_(),
+    float: lambda pa: pa.float64(),
+    bytes: lambda pa: pa.binary(),
+    datetime: lambda pa: pa.timestamp("us"),
+    date: lambda pa: pa.date32(),
+    dt_time: lambda pa: pa.time64("us"),
+}
+
+
+def _pyarrow():
+    try:
+        import pyarrow  # pylint: disable=import-outside-toplevel
+    except ImportError as exc:
+        raise ImportError("Exporting to Arrow and Parquet requires pyarrow, install dynamantic[arrow].") from exc
+    return pyarrow
+
+
+def _value(value: Any) -> Any:
+    return value
+
+
+def _json(value: Any) -> str:
+    return to_json(value, bytes_mode="base64").decode()
+
+
+def _optional(convert: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    def converter(value):
+        if value is None:
+            return value
+        return convert(value)
+
+    return converter
+
+
+def _arrow_type(pa, annotation: Any) -> Tuple[Any, Callable[[Any], Any]]:
+    """The Arrow type of a field and the converter of its values to what pyarrow accepts for that type.
+
+    Values that have no Arrow equivalent, such as dicts, unions and ``Any``, are written as JSON strings.
+    """
+    origin = typing.get_origin(annotation)
+    args = [arg for arg in typing.get_args(annotation) if arg is not NoneType]
+    if origin is typing.Annotated:
+        return _arrow_type(pa, args[0])
+    if origin in (typing.Union, UnionType) and len(args) == 1:
+        return _arrow_type(pa, args[0])
+
+    if origin in (list, set, frozenset, tuple) and len(args) > 0:
+        if origin is tuple and (len(args) != 2 or args[1] is not Ellipsis):
+            return pa.string(), _optional(_json)
+        value_type, convert = _arrow_type(pa, args[0])
+        return pa.list_(value_type), _optional(lambda value: [convert(val) for val in value])
+
+    if annotation in _SCALAR_TYPES:
+        return _SCALAR_TYPES[annotation](pa), _value
+    if annotation is int:
+        # DynamoDB numbers have up to 38 digits, beyond the range of int64
+        return pa.decimal128(38, 0), _optional(Decimal)
+    if annotation is Decimal:
+        # DynamoDB numbers have up to 38 digits with any exponent, kept exact as strings
+        return pa.string(), _optional(str)
+    if isinstance(annotation, type) and issubclass(annotation, Enum) and len(annotation) > 0:
+        value_type, convert = _arrow_type(pa, type(next(iter(annotation)).value))
+        return value_type, _optional(lambda value: convert(value.value))
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        fields = [(name, *_arrow_type(pa, field.annotation)) for name, field in annotation.model_fields.items()]
+        struct = pa.struct([pa.field(name, value_type) for name, value_type, _ in fields])
+        return struct, _optional(lambda value: {name: convert(getattr(value, name)) for name, _, convert in fields})
+    return pa.string(), _optional(_json)
+
+
+def _arrow_fields(model: Type[T]) -> Tuple[Any, List[Tuple[str, Callable[[Any], Any]]]]:
+    pa = _pyarrow()
+    fields = [(name, *_arrow_type(pa, field.annotation)) for name, field in model.model_fields.items()]
+    schema = pa.schema([pa.field(name, value_type) for name, value_type, _ in fields])
+    return schema, [(name, convert) for name, _, convert in fields]
+
+
+def arrow_schema(model: Type[T]):
+    """The Arrow schema of the items of a model, every field is nullable.
+
+    Lists, sets and tuples of a single type become Arrow lists, nested models become structs, ``int`` is a
+    38 digit ``decimal128`` as DynamoDB numbers can be, ``Decimal`` is kept exact as a string, and the
+    values with no Arrow equivalent are written as JSON strings.
+    """
+    return model._class_cache("__dynamantic_arrow__", lambda: _arrow_fields(model))[0]
+
+
+class ExportStats:
+    """Counters for an ``Export``."""
+
+    def __init__(self) -> None:
+        self.items = 0
+        self.batches = 0
+        self.write_seconds = 0.0
+
+
+class Export(Generic[T]):
+    """Stream the items of a scan or query to a file, a fixed-size batch at a time.
+
+    Only ``batch_size`` items, and the pages the scan reads ahead, are held in memory however large the
+    table is. By default the table is read with ``Dynamantic.parallel_scan``, whose workers fetch the
+    next pages while a batch is written, and the instances are built without validation. Any iterable of
+    instances, such as ``iter_query`` results, can be exported instead. The items can only be exported
+    once.
+
+    Writing Arrow record batches and Parquet files requires ``pyarrow``, see ``arrow_schema`` for how the
+    fields are mapped.
+
+    Args:
+        model (Type[Dynamantic]):
+                The model of the items exported.
+
+        results (Iterable[Dynamantic], optional):
+                The items to export. Defaults to a parallel scan of the table.
+
+        batch_size (int, optional):
+                Number of items written at once, the rows of a Parquet row group. Defaults to 1000.
+
+        total_segments (int, optional):
+                Number of segments of the default parallel scan. Defaults to 4.
+    """
+
+    def __init__(
+        self,
+        model: Type[T],
+        results: Iterable[T] | None = None,
+        batch_size: int = 1000,
+        total_segments: int = 4,
+    ) -> None:
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        if results is None:
+            results = model.parallel_scan(total_segments=total_segments, page_size=batch_size, trusted=True)
+        self._model = model
+        self._batch_size = batch_size
+        self.results = results
+        self.stats = ExportStats()
+
+    def batches(self) -> Iterator[List[T]]:
+        """Yield the items in lists of ``batch_size``."""
+        items = iter(self.results)
+        while batch := list(islice(items, self._batch_size)):
+            self.stats.items += len(batch)
+            self.stats.batches += 1
+            yield batch
+
+    def to_jsonl(self, file: str | os.PathLike | TextIO) -> ExportStats:
+        """Write every item as a line of JSON to the path, or the open text file.
+
+        Items are dumped with ``model_dump_json``, so the model configuration applies.
+        """
+        if isinstance(file, (str, os.PathLike)):
+            with open(file, "w", encoding="utf-8") as output:
+                return self.to_jsonl(output)
+
+        for batch in self.batches():
+            started = time.monotonic()
+            file.write("".join(item.model_dump_json() + "\n" for item in batch))
+            self.stats.write_seconds += time.monotonic() - started
+        return self.stats
+
+    def record_batches(self) -> Iterator[Any]:
+        """Yield each batch of items as a ``pyarrow.RecordBatch`` with the schema of the model."""
+        pa = _pyarrow()
+        schema, fields = self._model._class_cache("__dynamantic_arrow__", lambda: _arrow_fields(self._model))
+        for batch in self.batches():
+            columns = [
+                pa.array([convert(getattr(item, name)) for item in batch], type=schema.field(name).type)
+                for name, convert in fields
+            ]
+            yield pa.RecordBatch.from_arrays(columns, schema=schema)
+
+    def to_parquet(self, path: str | os.PathLike, compression: str = "snappy") -> ExportStats:
+        """Write the items to a Parquet file, one row group per batch.
+
+        Args:
+            path (str | PathLike):
+                    The file to write.
+
+            compression (str, optional):
+                    The Parquet compression codec. Defaults to "snappy".
+        """
+        pa = _pyarrow()
+        import pyarrow.parquet as pq  # pylint: disable=import-outside-toplevel
+
+        with pq.ParquetWriter(path, arrow_schema(self._model), compression=compression) as writer:
+            for batch in self.record_batches():
+                started = time.monotonic()
+                writer.write_table(pa.Table.from_batches([batch]))
+                self.stats.write_seconds += time.monotonic() - started
+        return self.stats
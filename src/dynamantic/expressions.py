@@ -0,0 +1,67 @@
+import re
+from typing import Any, Dict, List, Literal, Tuple
+
+UPDATE_ACTIONS = ("SET", "REMOVE", "ADD", "DELETE")
+
+_PATH_PART = re.compile(r"([^.\[\]]+)|(\[\d+\])")
+
+
+class UpdateExpressionBuilder:
+    """Build an update expression with any mix of ``SET``, ``REMOVE``, ``ADD`` and ``DELETE`` clauses.
+
+    Every attribute name in a path is replaced with a generated ``#`` placeholder, so reserved words and
+    special characters can be used as attribute names, and every value gets a generated ``:``
+    placeholder. The prefix keeps the placeholders apart from those of a condition expression.
+    """
+
+    def __init__(self, prefix: str = "u") -> None:
+        self._prefix = prefix
+        self._clauses: Dict[str, List[str]] = {action: [] for action in UPDATE_ACTIONS}
+        self._names: Dict[str, str] = {}
+        self.expression_attribute_names: Dict[str, str] = {}
+        self.expression_attribute_values: Dict[str, Any] = {}
+
+    def __len__(self) -> int:
+        return sum(len(clauses) for clauses in self._clauses.values())
+
+    def name(self, path: str) -> str:
+        """Replace the attribute names in a document path (``a.b[0].c``) with placeholders."""
+        parts = []
+        for name, index in _PATH_PART.findall(path):
+            if index:
+                parts[-1] += index
+                continue
+            placeholder = self._names.get(name)
+            if placeholder is None:
+                placeholder = f"#{self._prefix}{len(self._names)}"
+                self._names[name] = placeholder
+                self.expression_attribute_names[placeholder] = name
+            parts.append(placeholder)
+        return ".".join(parts)
+
+    def value(self, value: Any) -> str:
+        placeholder = f":{self._prefix}{len(self.expression_attribute_values)}"
+        self.expression_attribute_values[placeholder] = value
+        return placeholder
+
+    def set(self, path: str, value: Any) -> None:
+        self.add_clause("SET", f"{self.name(path)} = {self.value(value)}")
+
+    def remove(self, path: str) -> None:
+        self.add_clause("REMOVE", self.name(path))
+
+    def add(self, path: str, value: Any) -> None:
+        self.add_clause("ADD", f"{self.name(path)} {self.value(value)}")
+
+    def delete(self, path: str, value: Any) -> None:
+        self.add_clause("DELETE", f"{self.name(path)} {self.value(value)}")
+
+    def add_clause(self, action: Literal["SET", "REMOVE", "ADD", "DELETE"], clause: str) -> None:
+        self._clauses[action].append(clause)
+
+    def build(self) -> Tuple[str, Dict[str, str], Dict[str, Any]]:
+        """The update expression, its attribute names and its attribute values."""
+        expression = " ".join(
+            f"{action} {', '.join(clauses)}" for action, clauses in self._clauses.items() if len(clauses) > 0
+        )
+        return expression, self.expression_attribute_names, self.expression_attribute_values
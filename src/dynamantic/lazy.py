@@ -0,0 +1,77 @@
+# pylint: disable=W0212
+
+from typing import Any, Dict, FrozenSet, Generic, Type, TypeVar
+
+from boto3.dynamodb.types import TypeDeserializer
+
+T = TypeVar("T")
+
+_object_setattr = object.__setattr__
+
+_DESERIALIZER = TypeDeserializer()
+
+
+class LazyItem(Generic[T]):
+    """A read-only view of an item that converts each attribute the first time it is read.
+
+    The item is kept in DynamoDB wire format. Reading an attribute deserializes it, nested models
+    included, and keeps the value, so reading a wide item costs in proportion to the attributes used.
+    Values are converted as they are for trusted reads, without validation. ``model_load`` builds the
+    instance, to validate the whole item or to change it.
+
+    Args:
+        model_cls (Type[Dynamantic]):
+                The model of the item.
+
+        item (Dict):
+                The item in DynamoDB wire format.
+    """
+
+    def __init__(self, model_cls: Type[T], item: Dict[str, Dict[str, Any]]) -> None:
+        _object_setattr(self, "_model_cls", model_cls)
+        _object_setattr(self, "_item", item)
+
+    def __getattr__(self, name: str) -> Any:
+        # only called until the attribute has been read, the value is then found in __dict__
+        if name.startswith("_"):
+            raise AttributeError(name)
+        field = self._model_cls.model_fields.get(name)
+        if field is None:
+            raise AttributeError(f"'{self._model_cls.__name__}' object has no attribute '{name}'")
+
+        if name in self._item:
+            value = _DESERIALIZER.deserialize(self._item[name])
+            value = self._model_cls._codec().deserialize_attribute(name, value, trusted=True)
+        elif field.is_required():
+            # left out of the item, e.g. by a projection
+            raise AttributeError(f"'{name}' is not in the item of '{self._model_cls.__name__}'")
+        else:
+            value = field.get_default(call_default_factory=True)
+        self.__dict__[name] = value
+        return value
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{self.__class__.__name__} is read-only, change the instance from model_load().")
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}[{self._model_cls.__name__}]({', '.join(sorted(self.model_fields_loaded))})"
+
+    @property
+    def model_item(self) -> Dict[str, Dict[str, Any]]:
+        """The item in DynamoDB wire format."""
+        return self._item
+
+    @property
+    def model_fields_loaded(self) -> FrozenSet[str]:
+        """The fields converted so far."""
+        return frozenset(name for name in self.__dict__ if not name.startswith("_"))
+
+    def model_load(self, trusted: bool | None = None) -> T:
+        """Build the instance from the whole item.
+
+        Args:
+            trusted (bool, optional):
+                    Build the instance without validating the item, see ``__trusted_reads__``.
+                    Defaults to the model's ``__trusted_reads__``.
+        """
+        return self._model_cls.from_raw(self._item, wire=True, trusted=trusted)
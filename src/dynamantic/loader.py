@@ -0,0 +1,152 @@
+# pylint: disable=W0212
+
+import asyncio
+import threading
+from contextvars import Token
+from typing import Any, Dict, List, Tuple, Type
+
+from dynamantic.aio import run_sync
+from dynamantic.batch import BatchGet
+from dynamantic.exceptions import GetError
+from dynamantic.executor import key_identity
+from dynamantic.main import T, _DynamanticFuture, _current_loader
+
+
+class _LoaderFuture(_DynamanticFuture[T]):
+    """A model future that sends every pending key of its loader the first time it is read."""
+
+    def __init__(self, model_cls: Type[T], loader: "GetLoader", trusted: bool | None = None) -> None:
+        super().__init__(model_cls, trusted=trusted)
+        self._loader = loader
+        self._error: Exception | None = None
+        # set by the dispatch that takes the key, and set once the batch completes
+        self._done: threading.Event | None = None
+
+    def refresh(self) -> T:
+        if self._done is None:
+            self._loader.dispatch()
+        # the key may be in a batch another thread sent, which is still in flight
+        self._done.wait()
+        if self._error is not None:
+            raise self._error
+        return self._model
+
+    def model_dump(self) -> Dict[str, Any]:
+        return self.refresh().model_dump()
+
+
+class GetLoader:
+    """Gather single item reads into ``BatchGetItem`` requests.
+
+    Keys requested with ``load`` are collected until one of the results is read or the scope ends, then
+    every pending key is sent at once through ``BatchGet``, up to 100 keys per request. A key requested
+    more than once is only read once, and every caller gets the same future. Loads of the same key that
+    differ in ``trusted`` get separate futures, each built as requested, from a single read.
+
+    ``aload`` gathers the keys requested in the same event loop tick, so ``Model.aget`` calls run
+    concurrently inside a loader scope (``with GetLoader():`` or ``async with GetLoader():``) become a
+    single batch. Strongly consistent reads are not batched.
+
+    Args:
+        max_retries (int, optional):
+                Number of times unprocessed keys are resubmitted. Defaults to 10.
+
+        max_workers (int, optional):
+                Number of batch requests sent concurrently. Defaults to 4.
+    """
+
+    def __init__(self, max_retries: int = 10, max_workers: int = 4) -> None:
+        self._max_retries = max_retries
+        self._max_workers = max_workers
+        self._lock = threading.Lock()
+        self._pending: Dict[Tuple, Tuple[Type[T], Any, Any, bool | None, _LoaderFuture]] = {}
+        self._tick: asyncio.Task | None = None
+        self._tokens: List[Token] = []
+
+        self.loads = 0
+        self.batches = 0
+
+    def __enter__(self):
+        self._tokens.append(_current_loader.set(self))
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _current_loader.reset(self._tokens.pop())
+        self.dispatch()
+
+    async def __aenter__(self):
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        _current_loader.reset(self._tokens.pop())
+        await run_sync(self.dispatch)
+
+    def load(
+        self, model: Type[T], hash_key: Any, range_key: Any = None, trusted: bool | None = None
+    ) -> _DynamanticFuture[T]:
+        """Request an item, returning a future that is resolved when the pending keys are sent.
+
+        ``trusted`` builds the instance without validating the item, see ``__trusted_reads__``. It defaults
+        to the model's ``__trusted_reads__``.
+        """
+        identity = (key_identity(model.__table_name__, model._key(hash_key, range_key)), trusted)
+        with self._lock:
+            self.loads += 1
+            if identity not in self._pending:
+                future = _LoaderFuture(model, self, trusted)
+                self._pending[identity] = (model, hash_key, range_key, trusted, future)
+            return self._pending[identity][4]
+
+    async def aload(self, model: Type[T], hash_key: Any, range_key: Any = None, trusted: bool | None = None) -> T:
+        """Request an item and wait for it, batched with every other key requested in the same tick."""
+        future = self.load(model, hash_key, range_key, trusted)
+        if self._tick is None:
+            self._tick = asyncio.ensure_future(self._dispatch_next_tick())
+        await asyncio.shield(self._tick)
+        if future._done is None or not future._done.is_set():
+            # the key was taken by a batch sent before this tick, or is still pending
+            return await run_sync(future.refresh)
+        return future.refresh()
+
+    def dispatch(self) -> None:
+        """Send every pending key. Errors are raised when the result of an affected key is read."""
+        done = threading.Event()
+        with self._lock:
+            pending, self._pending = list(self._pending.values()), {}
+            for *_, future in pending:
+                future._done = done
+            if len(pending) > 0:
+                self.batches += 1
+        if len(pending) == 0:
+            return
+
+        try:
+            self._send(pending)
+        finally:
+            done.set()
+
+    def _send(self, pending: List[Tuple[Type[T], Any, Any, bool | None, _LoaderFuture]]) -> None:
+        batch = BatchGet(max_retries=self._max_retries, max_workers=self._max_workers)
+        futures = [
+            batch.get(model, hash_key, range_key, trusted=trusted) for model, hash_key, range_key, trusted, _ in pending
+        ]
+        try:
+            batch.__exit__(None, None, None)
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            for *_, future in pending:
+                future._error = exc
+            return
+
+        for (*_, future), result in zip(pending, futures):
+            if result._resolved:
+                future._model = result._model
+                future._resolved = True
+            else:
+                future._error = GetError("Item doesn't exist.")
+
+    async def _dispatch_next_tick(self) -> None:
+        # let every coroutine scheduled in this tick add its key first
+        await asyncio.sleep(0)
+        # keys requested while this batch is in flight go in the next one
+        self._tick = None
+        await run_sync(self.dispatch)
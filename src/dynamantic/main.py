@@ -1,35 +1,39 @@
 # pylint: disable=W0212
+import copy
+import re
 import json
 import inspect
+import threading
 import typing
-from typing import Callable, List, Literal, Set, Type, Dict, Any, TypeVar, Generic, Tuple
+from contextvars import ContextVar
+from types import UnionType
+from typing import Callable, FrozenSet, List, Literal, Set, Type, Dict, Any, TypeVar, Generic, Tuple
 from decimal import Decimal
 from datetime import datetime, time, date
 
-import boto3
-
 from boto3.dynamodb.conditions import (
+    AttributeBase,
+    Between,
     ComparisonCondition,
     ConditionExpressionBuilder,
     ConditionBase,
 )
-from boto3.dynamodb.types import Binary, TypeDeserializer
+from boto3.dynamodb.types import Binary, TypeDeserializer, TypeSerializer
 from botocore.client import ClientError
+from botocore.config import Config
 from botocore.exceptions import BotoCoreError
 
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter, ValidationError
 
-from mypy_boto3_dynamodb import DynamoDBClient, DynamoDBServiceResource
+from mypy_boto3_dynamodb import DynamoDBClient
 from mypy_boto3_dynamodb.type_defs import (
     GlobalSecondaryIndexTypeDef,
     LocalSecondaryIndexTypeDef,
     QueryInputRequestTypeDef,
-    QueryOutputTableTypeDef,
-    ScanOutputTypeDef,
 )
 from mypy_boto3_dynamodb.service_resource import _Table
 
-from dynamantic.attrs import K
+from dynamantic.attrs import A, K
 from dynamantic.indexes import LocalSecondaryIndex, GlobalSecondaryIndex
 from dynamantic.exceptions import (
     UpdateError,
@@ -41,6 +45,15 @@ from dynamantic.exceptions import (
     AttributeTypeInvalidError,
     AttributeInvalidError,
 )
+from dynamantic.aio import AsyncResultIterator, run_sync
+from dynamantic.cache import ItemCache, QueryCache, normalize
+from dynamantic.codec import ModelCodec, serialize_value, set_delta, wire_equal
+from dynamantic.connection import ConnectionKey, connections
+from dynamantic.executor import BatchExecutor, key_identity
+from dynamantic.expressions import UpdateExpressionBuilder
+from dynamantic.lazy import LazyItem
+from dynamantic.pagination import ParallelScan, ResultIterator
+from dynamantic.singleflight import SingleFlight, SingleFlightStats
 from dynamantic.types import serialize_map, type_serialize, dynamodb_compatible_value
 
 BOTOCORE_EXCEPTIONS = (BotoCoreError, ClientError)
@@ -51,6 +64,23 @@ E = TypeVar("E", bound="Expr")
 CE = TypeVar("CE", bound="ConditionExpression")
 F = TypeVar("F", bound="Field")
 
+# the GetLoader of the enclosing loader scope, see dynamantic.loader
+_current_loader: ContextVar[Any] = ContextVar("dynamantic_get_loader", default=None)
+# the identity map of the enclosing session scope, see dynamantic.session
+_current_session: ContextVar[Any] = ContextVar("dynamantic_session", default=None)
+
+_object_setattr = object.__setattr__
+
+# the slot holding the snapshot of an instance, see Dynamantic._set_snapshot
+_SNAPSHOT = "__dynamantic_snapshot__"
+
+# guards building the per class caches, see Dynamantic._class_cache
+_class_cache_lock = threading.RLock()
+
+
+def _raw_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    return item
+
 
 class _TableMetadata:
     __table_name__: str | Callable[[], str]
@@ -69,12 +99,57 @@ class _TableMetadata:
     __write_capacity_units__: int | None = 1
     __read_capacity_units__: int | None = 1
 
-    _dynamodb_rsc: DynamoDBServiceResource | None = None
-    _dynamodb_client: DynamoDBClient | None = None
+    # re-read the item with a strongly consistent get after every write instead of reconciling locally
+    __refresh_on_write__: bool = False
+
+    # read-through cache of get and batch_get, see dynamantic.cache.ItemCache
+    __item_cache__: ItemCache | None = None
+    # cache of query results, see dynamantic.cache.QueryCache
+    __query_cache__: QueryCache | None = None
+    # concurrent identical eventually consistent gets and queries share one request, opt-in
+    __single_flight__: bool = False
+    # build read results without validation, for items only written through the model
+    __trusted_reads__: bool = False
+    # keep the attributes of each instance as last read or written, for save(partial=True)
+    __partial_save__: bool = False
+
+    # connection pool size, timeouts and retries, merged over the default config of the connection registry
+    __botocore_config__: Config | None = None
 
 
 class Dynamantic(_TableMetadata, BaseModel):
-    def save(self, condition_expression: ComparisonCondition | None = None):
+    # outside of the fields and private attributes pydantic compares, dumps and initializes on every read
+    __slots__ = (_SNAPSHOT,)
+
+    def save(
+        self,
+        condition_expression: ComparisonCondition | None = None,
+        refresh: bool | None = None,
+        partial: bool = False,
+    ):
+        """Put the item in DynamoDB.
+
+        Args:
+            condition_expression (ComparisonCondition, optional):
+                    Condition that must be satisfied for the put to succeed. Defaults to None.
+
+            refresh (bool, optional):
+                    Re-read the item with a strongly consistent get after the write. The local state
+                    is already what was written, so this defaults to the model's ``__refresh_on_write__``.
+
+            partial (bool, optional):
+                    Only write the attributes changed since the item was read from or written to
+                    DynamoDB, with a single UpdateItem. Elements added to or removed from a set are
+                    written with ADD and DELETE. Items that were never read or written are put in full.
+                    Requires the model's ``__partial_save__``. Defaults to False.
+        """
+        if partial and not self.__partial_save__:
+            raise InvalidStateError("Partial saves require __partial_save__ to be set on the model.")
+        snapshot = self._snapshot()
+        if partial and snapshot is not None:
+            self._save_changes(snapshot, condition_expression, refresh)
+            return
+
         payload = {
             "TableName": self.__table_name__,
             "Item": self.serialize(),
@@ -88,67 +163,307 @@ class Dynamantic(_TableMetadata, BaseModel):
 
         try:
             self._dynamodb_table().put_item(**payload)
-            self.refresh()
         except BOTOCORE_EXCEPTIONS as exc:
-            self.refresh()
+            self.refresh(consistent_read=True)
             raise PutError(f"Failed to put item: {exc}", exc) from exc
 
+        self._set_snapshot(payload["Item"])
+        if self._refresh_on_write(refresh):
+            self.refresh(consistent_read=True)
+
+        self._track_write("add")
+
+    def _save_changes(
+        self,
+        snapshot: Dict[str, Any],
+        condition_expression: ComparisonCondition | None = None,
+        refresh: bool | None = None,
+    ):
+        builder = self._changes(snapshot)
+        if len(builder) == 0:
+            return
+
+        # never recreate a deleted item from the changed attributes alone
+        condition = A(self.__hash_key__).exists()
+        if condition_expression:
+            condition = condition & condition_expression
+        condition, names, values = self._build_expression(condition)
+        expression, update_names, update_values = builder.build()
+
+        payload = {
+            "TableName": self.__table_name__,
+            "Key": self._primary_key(),
+            "UpdateExpression": expression,
+            "ConditionExpression": condition,
+            "ExpressionAttributeNames": update_names | names,
+            "ExpressionAttributeValues": update_values | {k: serialize_value(v) for k, v in values.items()},
+        }
+        if len(payload["ExpressionAttributeValues"]) == 0:
+            del payload["ExpressionAttributeValues"]
+
+        try:
+            self._dynamodb().update_item(**payload)
+        except BOTOCORE_EXCEPTIONS as exc:
+            try:
+                self.refresh(consistent_read=True)
+            except GetError:
+                # deleted since it was read, the next save puts it in full
+                self._set_snapshot(None)
+            raise PutError(f"Failed to save changes: {exc}", exc) from exc
+
+        self._snapshot_state()
+        if self._refresh_on_write(refresh):
+            self.refresh(consistent_read=True)
+
+        self._track_write("add")
+
+    def _changes(self, snapshot: Dict[str, Any]) -> UpdateExpressionBuilder:
+        """The update of the attributes that differ from the ``snapshot`` of the item in DynamoDB."""
+        current = self._serialize_wire()
+        builder = UpdateExpressionBuilder()
+        for name in self.model_fields:
+            # attributes that were not read (a projection) and were not assigned are left alone
+            if name in (self.__hash_key__, self.__range_key__) or (
+                name not in snapshot and name not in self.model_fields_set
+            ):
+                continue
+
+            before = serialize_value(snapshot[name]) if name in snapshot else None
+            after = current.get(name)
+            if wire_equal(before, after):
+                continue
+
+            dynamodb_type = next(iter(after)) if after is not None else None
+            if after is None:
+                builder.remove(name)
+            elif dynamodb_type in ("SS", "NS", "BS") and before is not None and dynamodb_type in before:
+                added, removed = set_delta(dynamodb_type, before[dynamodb_type], after[dynamodb_type])
+                if len(added) > 0 and len(removed) > 0:
+                    # a path can only appear in one clause
+                    builder.set(name, after)
+                elif len(added) > 0:
+                    builder.add(name, {dynamodb_type: added})
+                else:
+                    builder.delete(name, {dynamodb_type: removed})
+            else:
+                builder.set(name, after)
+        return builder
+
     @classmethod
-    def get(cls: Type[T], hash_key: str, range_key: str | None = None) -> T:
-        params = {}
-        params[cls.__hash_key__] = hash_key
-        if cls.__range_key__:
-            params[cls.__range_key__] = range_key
+    def get(
+        cls: Type[T],
+        hash_key: str,
+        range_key: str | None = None,
+        consistent_read: bool = False,
+        trusted: bool | None = None,
+        lazy: bool = False,
+    ) -> T:
+        """Get an item by its primary key.
 
-        item = (
-            cls._dynamodb_table()
-            .get_item(
-                TableName=cls.__table_name__,
-                Key=params,
+        Args:
+            hash_key (str):
+                    The hash key of the item.
+
+            range_key (str, optional):
+                    The range key of the item, for tables with a range key. Defaults to None.
+
+            consistent_read (bool, optional):
+                    Use a strongly consistent read. Defaults to False.
+
+            trusted (bool, optional):
+                    Build the instance without validating the item, see ``__trusted_reads__``.
+                    Defaults to the model's ``__trusted_reads__``.
+
+            lazy (bool, optional):
+                    Return a ``LazyItem`` view that converts each attribute the first time it is read.
+                    The item is always read from DynamoDB. Defaults to False.
+        """
+        if lazy:
+            item = (
+                cls._dynamodb()
+                .get_item(
+                    TableName=cls.__table_name__,
+                    Key=cls._key(hash_key, range_key),
+                    ConsistentRead=consistent_read,
+                )
+                .get("Item")
             )
-            .get("Item", {})
-        )
+            if item is None:
+                raise GetError("Item doesn't exist.")
+            return LazyItem(cls, item)
+
+        session = _current_session.get()
+        if session is not None and not consistent_read:
+            item = session.lookup(cls, hash_key, range_key)
+            if item is not None:
+                return item
+
+        cache = cls.__item_cache__
+        identity = cls._key_identity(hash_key, range_key)
+        item = cache.lookup(identity) if cache is not None and not consistent_read else None
+
+        shared = cache is not None
+        if item is None:
+
+            def fetch() -> Dict[str, Any]:
+                generation = cache.generation if cache is not None else None
+                params = {}
+                params[cls.__hash_key__] = hash_key
+                if cls.__range_key__:
+                    params[cls.__range_key__] = range_key
+
+                item = (
+                    cls._dynamodb_table()
+                    .get_item(
+                        TableName=cls.__table_name__,
+                        Key=params,
+                        ConsistentRead=consistent_read,
+                    )
+                    .get("Item", {})
+                )
+                if cache is not None:
+                    cache.put(identity, item, generation)
+                return item
+
+            if consistent_read:
+                # joining a read already in flight could miss a write that completed before this call
+                item = fetch()
+            else:
+                item, coalesced = cls._single_flight(("get", identity), fetch)
+                shared = shared or coalesced
+
         if item == {}:
             raise GetError("Item doesn't exist.")
 
-        return cls._return_value(item)
+        # deserializing converts the item in place, cached and shared items are copied first
+        item = cls._return_value(copy.deepcopy(item) if shared else item, trusted)
+        return item if session is None else session.merge(item)
 
     @classmethod
-    def batch_get(cls: Type[T], items: List[str] | List[Tuple[str, str]]) -> List[T]:
+    def batch_get(
+        cls: Type[T],
+        items: List[str] | List[Tuple[str, str]],
+        max_retries: int = 10,
+        max_workers: int = 4,
+        trusted: bool | None = None,
+        raw: bool | Literal["wire"] = False,
+    ) -> List[T]:
+        if cls.__hash_key__ and cls.__range_key__:
+            keys = [(cls.__table_name__, cls._key(key[0], key[1])) for key in items]
+        else:
+            keys = [(cls.__table_name__, cls._key(key)) for key in items]
+
+        # cached keys are served locally, including keys known not to exist
+        cache = cls.__item_cache__
+        identities = [key_identity(*key) for key in keys]
+        cached: Dict[Tuple, Dict[str, Any]] = {}
+        generation = None
+        if cache is not None:
+            generation = cache.generation
+            for identity in set(identities):
+                item = cache.lookup(identity)
+                if item is not None:
+                    cached[identity] = item
+
+        # unprocessed keys are retried with backoff, results are returned in the order requested
+        results = {}
+        missing = [key for key, identity in zip(keys, identities) if identity not in cached]
+        if len(missing) > 0:
+            results = BatchExecutor(cls._dynamodb(), max_retries=max_retries, max_workers=max_workers).get(missing)
+            if cache is not None:
+                for key in missing:
+                    identity = key_identity(*key)
+                    item = results.get(identity, {})
+                    cache.put(identity, {k: TypeDeserializer().deserialize(v) for k, v in item.items()}, generation)
+
         all_results: List[T] = []
-        chunked = [items[i : i + 25] for i in range(0, len(items), 25)]
-        for chunk in chunked:
-            if cls.__hash_key__ and cls.__range_key__:
-                request = {cls.__table_name__: {"Keys": [cls._key(key[0], key[1]) for key in chunk]}}
-            else:
-                request = {cls.__table_name__: {"Keys": [cls._key(key) for key in chunk]}}
-            results = cls._dynamodb().batch_get_item(RequestItems=request)["Responses"][cls.__table_name__]
-            for item in results:
+        for identity in identities:
+            if identity in cached:
+                if cached[identity]:
+                    item = copy.deepcopy(cached[identity])
+                    if raw == "wire":
+                        item = {k: TypeSerializer().serialize(v) for k, v in item.items()}
+                    all_results.append(item if raw else cls._return_value(item, trusted))
+                continue
+            item = results.get(identity)
+            if item is not None:
+                if raw == "wire":
+                    all_results.append(item)
+                    continue
                 item = {k: TypeDeserializer().deserialize(v) for k, v in item.items()}
-                all_results.append(cls(**cls.deserialize(item)))
+                all_results.append(item if raw else cls._return_value(item, trusted))
         return all_results
 
-    def update(self, actions: List["ConditionExpression"], condition_expression: ComparisonCondition | None = None):
-        last_action_type, all_actions, all_attribute_values = self._update(actions)
+    def update(
+        self,
+        actions: List["ConditionExpression"],
+        condition_expression: ComparisonCondition | None = None,
+        refresh: bool | None = None,
+    ):
+        """Update the item in DynamoDB.
+
+        Args:
+            actions (List[ConditionExpression]):
+                    The update actions to apply.
+
+            condition_expression (ComparisonCondition, optional):
+                    Condition that must be satisfied for the update to succeed. Defaults to None.
+
+            refresh (bool, optional):
+                    Re-read the item with a strongly consistent get after the write. Otherwise the
+                    instance is reconciled from the return values of the update. Defaults to the
+                    model's ``__refresh_on_write__``.
+        """
+        update_expression, names, values = self._update(actions)
 
         payload = {
             "Key": self._key_params(),
-            "UpdateExpression": " ".join([last_action_type, ", ".join(all_actions)]),
-            "ExpressionAttributeValues": {
-                key: TypeDeserializer().deserialize(value) for key, value in all_attribute_values.items()
-            },
+            "UpdateExpression": update_expression,
+            "ExpressionAttributeNames": names,
+            "ReturnValues": self._update_return_values(actions),
         }
+        if len(values) > 0:
+            payload["ExpressionAttributeValues"] = {
+                key: TypeDeserializer().deserialize(value) for key, value in values.items()
+            }
 
         if condition_expression:
             payload["ConditionExpression"] = condition_expression
 
         try:
-            self._dynamodb_table().update_item(**payload)
-            self.refresh()
+            result = self._dynamodb_table().update_item(**payload)
         except BOTOCORE_EXCEPTIONS as exc:
-            self.refresh()
+            self.refresh(consistent_read=True)
             raise UpdateError(f"Failed to update item: {exc}", exc) from exc
 
+        self._reconcile_update(result.get("Attributes", {}), self._update_cleared(actions), refresh)
+
+    def _reconcile_update(self, attributes: Dict[str, Any], cleared: Dict[str, Any], refresh: bool | None) -> None:
+        """Bring the instance in line with an update, from the attributes it returned."""
+        if self._refresh_on_write(refresh):
+            self.refresh(consistent_read=True)
+        else:
+            updated = self.deserialize(attributes)
+            self.from_raw_data(dict(self.__class__(**(self.model_dump() | cleared | updated))))
+            self._snapshot_state()
+
+        self._track_write("add")
+
+    @staticmethod
+    def _update_return_values(actions: List["ConditionExpression"]) -> Literal["ALL_NEW", "UPDATED_NEW"]:
+        # top level attributes come back whole with UPDATED_NEW, nested paths only return the
+        # updated portion of the attribute so the whole item is needed to reconcile
+        return "ALL_NEW" if any(len(action._expr._fields) > 1 for action in actions) else "UPDATED_NEW"
+
+    @staticmethod
+    def _update_cleared(actions: List["ConditionExpression"]) -> Dict[str, Any]:
+        # removed attributes, and sets emptied by a DELETE, are not returned at all, DynamoDB drops empty sets
+        return {
+            action._expr._fields[0]._key: None
+            for action in actions
+            if action._expr._action in ("REMOVE", "DELETE") and len(action._expr._fields) == 1
+        }
+
     def delete(self, condition_expression: ComparisonCondition | None = None):
         payload = {
             "Key": self._key_params(),
@@ -162,12 +477,17 @@ class Dynamantic(_TableMetadata, BaseModel):
         except BOTOCORE_EXCEPTIONS as exc:
             raise DeleteError(f"Failed to delete item: {exc}", exc) from exc
 
+        self._track_write("remove")
+
     @classmethod
     def scan(
         cls: Type[T],
         filter_condition: ComparisonCondition | None = None,
         index: GlobalSecondaryIndex | LocalSecondaryIndex | None = None,
         attributes_to_get: List[str] | None = None,
+        trusted: bool | None = None,
+        raw: bool | Literal["wire"] = False,
+        lazy: bool = False,
     ) -> List[T]:
         """Perform a scan of DynamoDB.
 
@@ -182,18 +502,185 @@ class Dynamantic(_TableMetadata, BaseModel):
                     List of attributes to get. Any required fields in the model will be returned as well.
                     Defaults to None.
 
+            trusted (bool, optional):
+                    Build the instances without validating the items, see ``__trusted_reads__``.
+                    Defaults to the model's ``__trusted_reads__``.
+
+            raw (bool | "wire", optional):
+                    Return the items as dicts of python values, or in DynamoDB wire format with ``"wire"``,
+                    without building instances, see ``from_raw``. Defaults to False.
+
+            lazy (bool, optional):
+                    Return ``LazyItem`` views that convert each attribute the first time it is read.
+                    Defaults to False.
+
         Returns:
             List[T]: List of model instances.
         """
+        return list(cls.iter_scan(filter_condition, index, attributes_to_get, trusted=trusted, raw=raw, lazy=lazy))
+
+    @classmethod
+    def iter_scan(
+        cls: Type[T],
+        filter_condition: ComparisonCondition | None = None,
+        index: GlobalSecondaryIndex | LocalSecondaryIndex | None = None,
+        attributes_to_get: List[str] | None = None,
+        limit: int | None = None,
+        page_size: int | None = None,
+        last_evaluated_key: Dict[str, Any] | None = None,
+        segment: int | None = None,
+        total_segments: int | None = None,
+        trusted: bool | None = None,
+        raw: bool | Literal["wire"] = False,
+        lazy: bool = False,
+    ) -> ResultIterator[T]:
+        """Lazily scan DynamoDB, fetching pages as the results are consumed.
+
+        Args:
+            filter_condition (ComparisonCondition, optional):
+                    Filter the scan using a condition expression. Defaults to None.
+
+            index (GlobalSecondaryIndex | LocalSecondaryIndex, optional):
+                    Provide an index to scan. Defaults to None.
+
+            attributes_to_get (List[str], optional):
+                    List of attributes to get. Any required fields in the model will be returned as well.
+                    Defaults to None.
+
+            limit (int, optional):
+                    Maximum number of items to return. Defaults to None.
+
+            page_size (int, optional):
+                    Maximum number of items DynamoDB evaluates per request. Defaults to None.
+
+            last_evaluated_key (Dict, optional):
+                    Resume from the ``last_evaluated_key`` of a previous iterator. Defaults to None.
+
+            segment (int, optional):
+                    The segment to scan when the table is split into ``total_segments``. Defaults to None.
+
+            total_segments (int, optional):
+                    The number of segments the table is split into. Defaults to None.
+
+            trusted (bool, optional):
+                    Build the instances without validating the items, see ``__trusted_reads__``.
+                    Defaults to the model's ``__trusted_reads__``.
+
+            raw (bool | "wire", optional):
+                    Return the items as dicts of python values, or in DynamoDB wire format with ``"wire"``,
+                    without building instances, see ``from_raw``. Defaults to False.
+
+            lazy (bool, optional):
+                    Return ``LazyItem`` views that convert each attribute the first time it is read.
+                    Defaults to False.
+
+        Returns:
+            ResultIterator[T]: Iterator of model instances.
+        """
         params = cls._prepare_operation(
             "", index=index, filter_condition=filter_condition, attributes_to_get=attributes_to_get
         )
 
         del params["KeyConditionExpression"]
 
-        result: ScanOutputTypeDef = cls._dynamodb_table().scan(**params)
-        items = [cls._return_value(item) for item in result["Items"]]
-        return items
+        if total_segments is not None:
+            params["Segment"] = segment
+            params["TotalSegments"] = total_segments
+
+        operation, params, mapper = cls._read_operation("scan", params, raw, trusted, lazy)
+        return ResultIterator(
+            operation,
+            params,
+            mapper,
+            cls._index_key_names(index),
+            limit=limit,
+            page_size=page_size,
+            last_evaluated_key=last_evaluated_key,
+        )
+
+    @classmethod
+    def parallel_scan(
+        cls: Type[T],
+        total_segments: int = 4,
+        filter_condition: ComparisonCondition | None = None,
+        index: GlobalSecondaryIndex | LocalSecondaryIndex | None = None,
+        attributes_to_get: List[str] | None = None,
+        page_size: int | None = None,
+        max_workers: int | None = None,
+        segment_callback: Callable[[int, List[T]], None] | None = None,
+        resume_tokens: Dict[int, Dict[str, Any] | None] | None = None,
+        trusted: bool | None = None,
+        raw: bool | Literal["wire"] = False,
+        lazy: bool = False,
+    ) -> ParallelScan[T]:
+        """Scan DynamoDB with ``total_segments`` segments read concurrently on a thread pool.
+
+        Args:
+            total_segments (int, optional):
+                    The number of segments to split the table into. Defaults to 4.
+
+            filter_condition (ComparisonCondition, optional):
+                    Filter the scan using a condition expression. Defaults to None.
+
+            index (GlobalSecondaryIndex | LocalSecondaryIndex, optional):
+                    Provide an index to scan. Defaults to None.
+
+            attributes_to_get (List[str], optional):
+                    List of attributes to get. Any required fields in the model will be returned as well.
+                    Defaults to None.
+
+            page_size (int, optional):
+                    Maximum number of items DynamoDB evaluates per request. Defaults to None.
+
+            max_workers (int, optional):
+                    Maximum number of segments scanned at once. Defaults to ``total_segments``.
+
+            segment_callback (Callable[[int, List[T]], None], optional):
+                    Called with the segment number and each page of results as it is read.
+
+            resume_tokens (Dict[int, Dict | None], optional):
+                    The ``resume_tokens`` of a previous parallel scan. Only the segments that did not
+                    finish are scanned, starting from where they stopped. Defaults to None.
+
+            trusted (bool, optional):
+                    Build the instances without validating the items, see ``__trusted_reads__``.
+                    Defaults to the model's ``__trusted_reads__``.
+
+            raw (bool | "wire", optional):
+                    Return the items as dicts of python values, or in DynamoDB wire format with ``"wire"``,
+                    without building instances, see ``from_raw``. Defaults to False.
+
+            lazy (bool, optional):
+                    Return ``LazyItem`` views that convert each attribute the first time it is read.
+                    Defaults to False.
+
+        Returns:
+            ParallelScan[T]: Iterator of model instances from every segment.
+        """
+        params = cls._prepare_operation(
+            "", index=index, filter_condition=filter_condition, attributes_to_get=attributes_to_get
+        )
+
+        del params["KeyConditionExpression"]
+        operation, params, mapper = cls._read_operation("scan", params, raw, trusted, lazy)
+
+        def segment_iterator(segment: int, start_key: Dict[str, Any] | None) -> ResultIterator[T]:
+            return ResultIterator(
+                operation,
+                params | {"Segment": segment, "TotalSegments": total_segments},
+                mapper,
+                cls._index_key_names(index),
+                page_size=page_size,
+                last_evaluated_key=start_key,
+            )
+
+        return ParallelScan(
+            segment_iterator,
+            total_segments,
+            resume_tokens=resume_tokens,
+            max_workers=max_workers,
+            segment_callback=segment_callback,
+        )
 
     @classmethod
     def query(
@@ -203,6 +690,9 @@ class Dynamantic(_TableMetadata, BaseModel):
         filter_condition: ComparisonCondition | None = None,
         index: GlobalSecondaryIndex | LocalSecondaryIndex | None = None,
         attributes_to_get: List[str] | None = None,
+        trusted: bool | None = None,
+        raw: bool | Literal["wire"] = False,
+        lazy: bool = False,
     ) -> List[T]:
         """Perform a query of DynamoDB.
 
@@ -225,25 +715,346 @@ class Dynamantic(_TableMetadata, BaseModel):
                     List of attributes to get. Any required fields in the model will
                     be returned as well. Defaults to None.
 
+            trusted (bool, optional):
+                    Build the instances without validating the items, see ``__trusted_reads__``.
+                    Defaults to the model's ``__trusted_reads__``.
+
+            raw (bool | "wire", optional):
+                    Return the items as dicts of python values, or in DynamoDB wire format with ``"wire"``,
+                    without building instances, see ``from_raw``. Defaults to False.
+
+            lazy (bool, optional):
+                    Return ``LazyItem`` views that convert each attribute the first time it is read.
+                    Defaults to False.
+
         Returns:
             List[T]: List of model instances.
         """
+        cache = cls.__query_cache__
+        if raw == "wire" or lazy or (cache is None and not cls.__single_flight__):
+            # the query cache holds deserialized items, wire format items are always read from DynamoDB
+            return list(
+                cls.iter_query(
+                    value,
+                    range_key_condition,
+                    filter_condition,
+                    index,
+                    attributes_to_get,
+                    trusted=trusted,
+                    raw=raw,
+                    lazy=lazy,
+                )
+            )
+
+        key = cls._query_cache_key(value, range_key_condition, filter_condition, index, attributes_to_get)
+        items = cache.lookup(key) if cache is not None else None
+        shared = cache is not None
+        if items is None:
+
+            def fetch() -> List[Dict[str, Any]]:
+                generation = cache.generation if cache is not None else None
+                params = cls._prepare_operation(value, index, range_key_condition, filter_condition, attributes_to_get)
+                params["ScanIndexForward"] = True
+                items = list(
+                    ResultIterator(cls._dynamodb_table().query, params, lambda item: item, cls._index_key_names(index))
+                )
+                if cache is not None:
+                    cache.put(key, items, [cls._query_cache_tag(value, index)], generation)
+                return items
+
+            items, coalesced = cls._single_flight(("query", key), fetch)
+            shared = shared or coalesced
+
+        # deserializing converts the items in place, cached and shared items are copied first
+        if shared:
+            items = copy.deepcopy(items)
+        if raw:
+            return items
+        return [cls._return_value(item, trusted) for item in items]
+
+    @classmethod
+    def iter_query(
+        cls: Type[T],
+        value: str,
+        range_key_condition: ComparisonCondition | None = None,
+        filter_condition: ComparisonCondition | None = None,
+        index: GlobalSecondaryIndex | LocalSecondaryIndex | None = None,
+        attributes_to_get: List[str] | None = None,
+        limit: int | None = None,
+        page_size: int | None = None,
+        last_evaluated_key: Dict[str, Any] | None = None,
+        scan_index_forward: bool = True,
+        trusted: bool | None = None,
+        raw: bool | Literal["wire"] = False,
+        lazy: bool = False,
+    ) -> ResultIterator[T]:
+        """Lazily query DynamoDB, fetching pages as the results are consumed.
+
+        Args:
+            value (str):
+                    The hash key value to query for.
+                    The hash key for the table if no index, or the index if provided.
+
+            range_key_condition (ComparisonCondition, optional):
+                    The condition expression to use on the range key. Defaults to None.
+
+            filter_condition (ComparisonCondition, optional):
+                    Filter the query using a condition expression. Defaults to None.
+
+            index (GlobalSecondaryIndex | LocalSecondaryIndex, optional):
+                    Provide an index to query. Defaults to None.
+
+            attributes_to_get (List[str], optional):
+                    List of attributes to get. Any required fields in the model will
+                    be returned as well. Defaults to None.
+
+            limit (int, optional):
+                    Maximum number of items to return. Defaults to None.
+
+            page_size (int, optional):
+                    Maximum number of items DynamoDB evaluates per request. Defaults to None.
+
+            last_evaluated_key (Dict, optional):
+                    Resume from the ``last_evaluated_key`` of a previous iterator. Defaults to None.
+
+            scan_index_forward (bool, optional):
+                    Return items in ascending range key order. Defaults to True.
+
+            trusted (bool, optional):
+                    Build the instances without validating the items, see ``__trusted_reads__``.
+                    Defaults to the model's ``__trusted_reads__``.
+
+            raw (bool | "wire", optional):
+                    Return the items as dicts of python values, or in DynamoDB wire format with ``"wire"``,
+                    without building instances, see ``from_raw``. Defaults to False.
+
+            lazy (bool, optional):
+                    Return ``LazyItem`` views that convert each attribute the first time it is read.
+                    Defaults to False.
+
+        Returns:
+            ResultIterator[T]: Iterator of model instances.
+        """
         params = cls._prepare_operation(value, index, range_key_condition, filter_condition, attributes_to_get)
-        result: QueryOutputTableTypeDef = cls._dynamodb_table().query(**params)
-        items = [cls._return_value(item) for item in result["Items"]]
-        return items
+        params["ScanIndexForward"] = scan_index_forward
+
+        operation, params, mapper = cls._read_operation("query", params, raw, trusted, lazy)
+        return ResultIterator(
+            operation,
+            params,
+            mapper,
+            cls._index_key_names(index),
+            limit=limit,
+            page_size=page_size,
+            last_evaluated_key=last_evaluated_key,
+        )
 
-    def refresh(self: T) -> T:
+    def refresh(self: T, consistent_read: bool = False) -> T:
         """Refresh the model from the database."""
         item = self.model_dump()
         item = (
-            self.get(item[self.__hash_key__], item[self.__range_key__])
+            self.get(item[self.__hash_key__], item[self.__range_key__], consistent_read=consistent_read)
             if self.__range_key__
-            else self.get(item[self.__hash_key__])
+            else self.get(item[self.__hash_key__], consistent_read=consistent_read)
         )
         self.from_raw_data(item)
+        self._set_snapshot(item._snapshot())
         return self
 
+    @classmethod
+    async def aget(
+        cls: Type[T],
+        hash_key: str,
+        range_key: str | None = None,
+        consistent_read: bool = False,
+        trusted: bool | None = None,
+    ) -> T:
+        """Asynchronous version of ``get``, the request is sent off the event loop.
+
+        Inside a ``GetLoader`` scope, reads that are not strongly consistent are batched with the other
+        ``aget`` calls of the same event loop tick.
+        """
+        loader = _current_loader.get()
+        if loader is not None and not consistent_read:
+            session = _current_session.get()
+            item = None if session is None else session.lookup(cls, hash_key, range_key)
+            if item is None:
+                item = await loader.aload(cls, hash_key, range_key, trusted=trusted)
+                item = item if session is None else session.merge(item)
+            return item
+        return await run_sync(cls.get, hash_key, range_key, consistent_read=consistent_read, trusted=trusted)
+
+    @classmethod
+    async def abatch_get(
+        cls: Type[T],
+        items: List[str] | List[Tuple[str, str]],
+        max_retries: int = 10,
+        max_workers: int = 4,
+        trusted: bool | None = None,
+        raw: bool | Literal["wire"] = False,
+    ) -> List[T]:
+        """Asynchronous version of ``batch_get``."""
+        return await run_sync(
+            cls.batch_get, items, max_retries=max_retries, max_workers=max_workers, trusted=trusted, raw=raw
+        )
+
+    async def asave(self, condition_expression: ComparisonCondition | None = None, refresh: bool | None = None):
+        """Asynchronous version of ``save``."""
+        await run_sync(self.save, condition_expression, refresh=refresh)
+
+    async def aupdate(
+        self,
+        actions: List["ConditionExpression"],
+        condition_expression: ComparisonCondition | None = None,
+        refresh: bool | None = None,
+    ):
+        """Asynchronous version of ``update``."""
+        await run_sync(self.update, actions, condition_expression, refresh=refresh)
+
+    async def adelete(self, condition_expression: ComparisonCondition | None = None):
+        """Asynchronous version of ``delete``."""
+        await run_sync(self.delete, condition_expression)
+
+    async def arefresh(self: T, consistent_read: bool = False) -> T:
+        """Asynchronous version of ``refresh``."""
+        return await run_sync(self.refresh, consistent_read=consistent_read)
+
+    @classmethod
+    async def aquery(
+        cls: Type[T],
+        value: str,
+        range_key_condition: ComparisonCondition | None = None,
+        filter_condition: ComparisonCondition | None = None,
+        index: GlobalSecondaryIndex | LocalSecondaryIndex | None = None,
+        attributes_to_get: List[str] | None = None,
+        limit: int | None = None,
+        page_size: int | None = None,
+        last_evaluated_key: Dict[str, Any] | None = None,
+        scan_index_forward: bool = True,
+        trusted: bool | None = None,
+        raw: bool | Literal["wire"] = False,
+        lazy: bool = False,
+    ) -> List[T]:
+        """Asynchronous version of ``query``, accepting the same arguments as ``iter_query``."""
+        iterator = cls.aiter_query(
+            value,
+            range_key_condition,
+            filter_condition,
+            index,
+            attributes_to_get,
+            limit=limit,
+            page_size=page_size,
+            last_evaluated_key=last_evaluated_key,
+            scan_index_forward=scan_index_forward,
+            trusted=trusted,
+            raw=raw,
+            lazy=lazy,
+        )
+        return [item async for item in iterator]
+
+    @classmethod
+    async def ascan(
+        cls: Type[T],
+        filter_condition: ComparisonCondition | None = None,
+        index: GlobalSecondaryIndex | LocalSecondaryIndex | None = None,
+        attributes_to_get: List[str] | None = None,
+        limit: int | None = None,
+        page_size: int | None = None,
+        last_evaluated_key: Dict[str, Any] | None = None,
+        segment: int | None = None,
+        total_segments: int | None = None,
+        trusted: bool | None = None,
+        raw: bool | Literal["wire"] = False,
+        lazy: bool = False,
+    ) -> List[T]:
+        """Asynchronous version of ``scan``, accepting the same arguments as ``iter_scan``."""
+        iterator = cls.aiter_scan(
+            filter_condition,
+            index,
+            attributes_to_get,
+            limit=limit,
+            page_size=page_size,
+            last_evaluated_key=last_evaluated_key,
+            segment=segment,
+            total_segments=total_segments,
+            trusted=trusted,
+            raw=raw,
+            lazy=lazy,
+        )
+        return [item async for item in iterator]
+
+    @classmethod
+    def aiter_query(
+        cls: Type[T],
+        value: str,
+        range_key_condition: ComparisonCondition | None = None,
+        filter_condition: ComparisonCondition | None = None,
+        index: GlobalSecondaryIndex | LocalSecondaryIndex | None = None,
+        attributes_to_get: List[str] | None = None,
+        limit: int | None = None,
+        page_size: int | None = None,
+        last_evaluated_key: Dict[str, Any] | None = None,
+        scan_index_forward: bool = True,
+        trusted: bool | None = None,
+        raw: bool | Literal["wire"] = False,
+        lazy: bool = False,
+    ) -> AsyncResultIterator[T]:
+        """Use ``async for`` over a query, accepting the same arguments as ``iter_query``.
+
+        Each page is fetched off the event loop when the previous one has been consumed.
+        """
+        return AsyncResultIterator(
+            cls.iter_query(
+                value,
+                range_key_condition,
+                filter_condition,
+                index,
+                attributes_to_get,
+                limit=limit,
+                page_size=page_size,
+                last_evaluated_key=last_evaluated_key,
+                scan_index_forward=scan_index_forward,
+                trusted=trusted,
+                raw=raw,
+                lazy=lazy,
+            )
+        )
+
+    @classmethod
+    def aiter_scan(
+        cls: Type[T],
+        filter_condition: ComparisonCondition | None = None,
+        index: GlobalSecondaryIndex | LocalSecondaryIndex | None = None,
+        attributes_to_get: List[str] | None = None,
+        limit: int | None = None,
+        page_size: int | None = None,
+        last_evaluated_key: Dict[str, Any] | None = None,
+        segment: int | None = None,
+        total_segments: int | None = None,
+        trusted: bool | None = None,
+        raw: bool | Literal["wire"] = False,
+        lazy: bool = False,
+    ) -> AsyncResultIterator[T]:
+        """Use ``async for`` over a scan, accepting the same arguments as ``iter_scan``.
+
+        Each page is fetched off the event loop when the previous one has been consumed.
+        """
+        return AsyncResultIterator(
+            cls.iter_scan(
+                filter_condition,
+                index,
+                attributes_to_get,
+                limit=limit,
+                page_size=page_size,
+                last_evaluated_key=last_evaluated_key,
+                segment=segment,
+                total_segments=total_segments,
+                trusted=trusted,
+                raw=raw,
+                lazy=lazy,
+            )
+        )
+
     @classmethod
     def table_exists(cls):
         tables = cls._dynamodb().list_tables()["TableNames"]
@@ -336,6 +1147,9 @@ class Dynamantic(_TableMetadata, BaseModel):
     def from_raw_data(self, item: Dict[str, Any]) -> None:
         self.__dict__.update(item)
 
+    def _refresh_on_write(self, refresh: bool | None = None) -> bool:
+        return self.__refresh_on_write__ if refresh is None else refresh
+
     @classmethod
     def _required_fields(cls, blacklist: List[str] = None) -> List[str]:
         """Return the fields required for this model. Optionally, provide other attributes
@@ -395,8 +1209,109 @@ class Dynamantic(_TableMetadata, BaseModel):
         return params
 
     @classmethod
-    def _return_value(cls, item: dict) -> T:
-        return cls(**cls.deserialize(item))
+    def _index_key_names(cls, index: GlobalSecondaryIndex | LocalSecondaryIndex | None = None) -> List[str]:
+        """Attributes making up ``LastEvaluatedKey`` for the table, or the index when provided."""
+        keys = [cls.__hash_key__]
+        if cls.__range_key__:
+            keys.append(cls.__range_key__)
+        if index:
+            keys.extend(key for key in (index.hash_key, index.range_key) if key and key not in keys)
+        return keys
+
+    @classmethod
+    def _return_value(cls, item: dict, trusted: bool | None = None) -> T:
+        snapshot = None
+        if cls.__partial_save__:
+            # deserializing converts the item in place, nested values are copied so changes made to the
+            # model never reach the snapshot
+            snapshot = {k: copy.deepcopy(v) if isinstance(v, (dict, list)) else v for k, v in item.items()}
+        if cls.__trusted_reads__ if trusted is None else trusted:
+            model = cls._codec().construct(item)
+        else:
+            model = cls(**cls.deserialize(item))
+        if snapshot is not None:
+            model._set_snapshot(snapshot)
+        return model
+
+    @classmethod
+    def _result_mapper(cls, trusted: bool | None = None) -> Callable[[Dict[str, Any]], T]:
+        if trusted is None:
+            return cls._return_value
+        return lambda item: cls._return_value(item, trusted)
+
+    @classmethod
+    def _read_operation(
+        cls,
+        name: Literal["query", "scan"],
+        params: Dict[str, Any],
+        raw: bool | Literal["wire"],
+        trusted: bool | None,
+        lazy: bool = False,
+    ) -> Tuple[Callable[..., Dict], Dict[str, Any], Callable[[Dict[str, Any]], Any]]:
+        """The operation, parameters and item mapper of a query or scan for the ``raw`` and ``lazy`` modes."""
+        if lazy and raw:
+            raise ValueError("raw and lazy can't be combined.")
+        if raw == "wire" or lazy:
+            # the client returns the items as they are on the wire, the table resource would deserialize them
+            client = cls._dynamodb()
+            params = cls._wire_params(params) | {"TableName": cls.__table_name__}
+            return getattr(client, name), params, (lambda item: LazyItem(cls, item)) if lazy else _raw_item
+        return getattr(cls._dynamodb_table(), name), params, _raw_item if raw else cls._result_mapper(trusted)
+
+    @classmethod
+    def _wire_params(cls, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the conditions of table resource parameters into expressions for the client."""
+        params = dict(params)
+        builder = ConditionExpressionBuilder()
+        names, values = {}, {}
+        for key, is_key_condition in (("KeyConditionExpression", True), ("FilterExpression", False)):
+            if key in params:
+                expression, expression_names, expression_values = builder.build_expression(
+                    params[key], is_key_condition=is_key_condition
+                )
+                params[key] = expression
+                names.update(expression_names)
+                values.update(expression_values)
+        if len(names) > 0:
+            params["ExpressionAttributeNames"] = names
+        if len(values) > 0:
+            params["ExpressionAttributeValues"] = {k: serialize_value(v) for k, v in values.items()}
+        return params
+
+    @classmethod
+    def from_raw(cls: Type[T], item: Dict[str, Any], wire: bool = False, trusted: bool | None = None) -> T:
+        """Build an instance from an item returned by a read with ``raw`` set.
+
+        Args:
+            item (Dict):
+                    The item, as returned by the read.
+
+            wire (bool, optional):
+                    The item is in DynamoDB wire format, read with ``raw="wire"``. Defaults to False.
+
+            trusted (bool, optional):
+                    Build the instance without validating the item, see ``__trusted_reads__``.
+                    Defaults to the model's ``__trusted_reads__``.
+        """
+        if wire:
+            item = {k: TypeDeserializer().deserialize(v) for k, v in item.items()}
+        else:
+            # deserializing converts the item in place, the caller keeps its dict
+            item = dict(item)
+        return cls._return_value(item, trusted)
+
+    def _snapshot(self) -> Dict[str, Any] | None:
+        """The attributes of the item as last read from or written to DynamoDB, see ``__partial_save__``."""
+        return getattr(self, _SNAPSHOT, None)
+
+    def _set_snapshot(self, item: Dict[str, Any] | None) -> None:
+        if self.__partial_save__:
+            _object_setattr(self, _SNAPSHOT, item)
+
+    def _snapshot_state(self) -> None:
+        """Record the current state of the instance as what DynamoDB holds."""
+        if self.__partial_save__:
+            self._set_snapshot(self.serialize())
 
     @classmethod
     def _build_expression(cls, condition_expression: ConditionBase):
@@ -408,32 +1323,33 @@ class Dynamantic(_TableMetadata, BaseModel):
 
     @classmethod
     def _dynamodb(cls) -> DynamoDBClient:
-        if cls._dynamodb_client is None:
-            cls._dynamodb_client = boto3.client(
-                "dynamodb",
-                region_name=cls.__table_region__,
-                endpoint_url=cls.__table_host__,
-                aws_access_key_id=cls.__aws_access_key_id__,
-                aws_secret_access_key=cls.__aws_secret_access_key__,
-                aws_session_token=cls.__aws_session_token__,
-            )
-        return cls._dynamodb_client
+        return connections.client(cls._connection_key())
 
     @classmethod
     def _dynamodb_table(cls) -> _Table:
-        if cls._dynamodb_rsc is None:
-            cls._dynamodb_rsc = boto3.resource(
-                "dynamodb",
-                region_name=cls.__table_region__,
-                endpoint_url=cls.__table_host__,
-                aws_access_key_id=cls.__aws_access_key_id__,
-                aws_secret_access_key=cls.__aws_secret_access_key__,
-                aws_session_token=cls.__aws_session_token__,
-            )
-        return cls._dynamodb_rsc.Table(cls.__table_name__)
+        return connections.table(cls._connection_key(), cls.__table_name__)
+
+    @classmethod
+    def _connection_key(cls) -> ConnectionKey:
+        return ConnectionKey(
+            cls.__table_region__,
+            cls.__table_host__,
+            cls.__aws_access_key_id__,
+            cls.__aws_secret_access_key__,
+            cls.__aws_session_token__,
+            cls.__botocore_config__,
+        )
 
     @classmethod
-    def _pydantic_types(cls, key: str) -> Set[Type]:
+    def _pydantic_types(cls, key: str) -> FrozenSet[Type]:
+        return cls._codec().attribute_classes[key]
+
+    @classmethod
+    def _dynamodb_type(cls, key: str) -> Literal["S", "N", "B", "M", "L", "BOOL", "NS", "BS", "SS"]:
+        return cls._codec().attribute_types[key]
+
+    @classmethod
+    def _resolve_pydantic_types(cls, key: str) -> Set[Type]:
         def traverse(options, full_set: set):
             for option in options:
                 if frozenset == typing.get_origin(option):
@@ -461,8 +1377,8 @@ class Dynamantic(_TableMetadata, BaseModel):
         return final_set
 
     @classmethod
-    def _dynamodb_type(cls, key: str) -> Literal["S", "N", "B", "M", "L", "BOOL", "NS", "BS", "SS"]:
-        classes = cls._pydantic_types(key)
+    def _resolve_dynamodb_type(cls, key: str) -> Literal["S", "N", "B", "M", "L", "BOOL", "NS", "BS", "SS"]:
+        classes = cls._resolve_pydantic_types(key)
         if set in classes or frozenset in classes:
             if str in classes:
                 return "SS"
@@ -506,73 +1422,120 @@ class Dynamantic(_TableMetadata, BaseModel):
         serialize_map(values)
         return {key: value for key, value in values.items() if value is not None}
 
+    def _serialize_wire(self, attributes: List[str] | None = None) -> Dict[str, Dict[str, Any]]:
+        """Serialize the model straight to DynamoDB wire format, optionally only some attributes."""
+        return self._codec().serialize(self, attributes)
+
+    def _primary_key(self) -> Dict[str, Dict[str, Any]]:
+        return self._serialize_wire([self.__hash_key__, self.__range_key__])
+
     @classmethod
     def deserialize(cls, values: dict) -> Dict[str, Any]:
-        def _create_instance(value, class_, collection_class=None):
-            # if the class fails to deserialize, it is because the value was changed in DynamoDB
-            # and is no longer compatible
-            if value == None:
-                return value
-
-            if class_ in (datetime, date, time):
-                return class_.fromisoformat(value)
-            if collection_class in (list, tuple, frozenset):
-                new_list = []
-                for val in value:
-                    new_list.append(_create_instance(val, class_))
-                return collection_class(new_list)
-            if collection_class == set:
-                new_set = set()
-                for val in iter(value):
-                    new_set.add(_create_instance(val, class_))
-                return new_set
-            if issubclass(class_, Dynamantic):
-                deserialized = class_.deserialize(value)
-                return class_(**deserialized)
-            return class_(value)
-
-        def _deserialize_value(value, classes: list):
-            if len(classes) == 1:
-                return _create_instance(value, classes[0])
-            return _create_instance(value, classes[0], classes[1])
-
-        def _unique_classes_with_order(class_list):
-            seen = set()
-            unique_classes = [cls for cls in class_list if cls not in seen and not seen.add(cls)]
-            return unique_classes
-
-        for k, v in values.items():
-            type_hint = next(cls.model_fields.get(key_).annotation for key_ in cls.model_fields if key_ == k)
-            classes = cls._get_base_class(type_hint, v, [])
-            unique_classes = _unique_classes_with_order(classes)
-            updated_value = _deserialize_value(v, unique_classes)
-            values[k] = updated_value
-        return values
-
-    @classmethod
-    def _update(cls, actions=List["ConditionExpression"]):
-        last_action_type = None
-        all_actions = []
-        all_attribute_values = {}
-        for action in actions:
-            action_parts = action.update_expression.split(" ")
-            action_type = action_parts.pop(0)
-            if last_action_type is None:
-                last_action_type = action_type
-            elif action_type != last_action_type:
-                raise UpdateError(f"All actions must be the same. {action_type} != {last_action_type}")
-            all_actions.append(" ".join(action_parts))
-            all_attribute_values = all_attribute_values | action.expression_attribute_values
+        return cls._codec().deserialize(values)
 
-        return last_action_type, all_actions, all_attribute_values
+    @classmethod
+    def _codec(cls) -> ModelCodec:
+        """The codec compiled for this model class, built on first use."""
+        return cls._class_cache("__dynamantic_codec__", lambda: ModelCodec(cls))
+
+    @classmethod
+    def _json_schema(cls) -> Dict[str, Any]:
+        """The JSON schema of the model, used to validate update and condition expressions."""
+        return cls._class_cache("__dynamantic_schema__", cls.model_json_schema)
+
+    @classmethod
+    def _schema_definition(cls, ref: str) -> Dict[str, Any]:
+        """The properties of a nested model from its ``$ref`` in the JSON schema."""
+        model_type = ref.split("/")[-1]
+        return cls._json_schema().get("$defs").get(model_type).get("properties")
+
+    @classmethod
+    def _class_cache(cls, name: str, factory: Callable[[], Any]) -> Any:
+        # cached per class, and rebuilt when pydantic rebuilds the class (e.g. model_rebuild)
+        cached = cls.__dict__.get(name)
+        if cached is None or cached[0] is not cls.__pydantic_core_schema__:
+            # built once, threads racing on the first use share the same value (e.g. the SingleFlight)
+            with _class_cache_lock:
+                cached = cls.__dict__.get(name)
+                if cached is None or cached[0] is not cls.__pydantic_core_schema__:
+                    cached = (cls.__pydantic_core_schema__, factory())
+                    setattr(cls, name, cached)
+        return cached[1]
+
+    @classmethod
+    def _update(cls, actions=List["ConditionExpression"]) -> Tuple[str, Dict[str, str], Dict[str, Any]]:
+        """Group any mix of actions into one update expression, with its attribute names and values."""
+        builder = UpdateExpressionBuilder()
+        for action in actions:
+            action.apply(builder)
+        if len(builder) == 0:
+            raise UpdateError("At least one action is required.")
+        return builder.build()
 
     @classmethod
     def _key(cls, hash_key: Any, range_key: Any = None) -> Dict[str, Any]:
-        key = {cls.__hash_key__: {cls._dynamodb_type(cls.__hash_key__): hash_key}}
+        attribute_types = cls._codec().attribute_types
+        key = {cls.__hash_key__: {attribute_types[cls.__hash_key__]: hash_key}}
         if range_key:
-            key[cls.__range_key__] = {cls._dynamodb_type(cls.__range_key__): range_key}
+            key[cls.__range_key__] = {attribute_types[cls.__range_key__]: range_key}
         return key
 
+    @classmethod
+    def _single_flight(cls, key: Tuple, fetch: Callable[[], Any]) -> Tuple[Any, bool]:
+        """The result of ``fetch``, shared with the identical reads in flight, and whether it was shared."""
+        if not cls.__single_flight__:
+            return fetch(), False
+        return cls._class_cache("__dynamantic_single_flight__", SingleFlight).do(key, fetch)
+
+    @classmethod
+    def single_flight_stats(cls) -> SingleFlightStats:
+        """How many gets and queries of the model were sent, and how many joined one in flight."""
+        return cls._class_cache("__dynamantic_single_flight__", SingleFlight).stats
+
+    @classmethod
+    def _key_identity(cls, hash_key: Any, range_key: Any = None) -> Tuple:
+        return key_identity(cls.__table_name__, cls._key(hash_key, range_key))
+
+    def _identity(self) -> Tuple:
+        return key_identity(self.__table_name__, self._primary_key())
+
+    def _track_write(self, track: Literal["add", "remove", "discard"]) -> None:
+        """Keep the session scope and the caches of the model in line with a write of this item."""
+        session = _current_session.get()
+        if session is not None:
+            getattr(session, track)(self)
+        if self.__item_cache__ is not None:
+            self.__item_cache__.invalidate(self._identity())
+        if self.__query_cache__ is not None:
+            self.__query_cache__.invalidate_tags(
+                [self._query_cache_tag(getattr(self, self.__hash_key__)), (self.__table_name__, "gsi")]
+            )
+
+    @classmethod
+    def _query_cache_key(
+        cls,
+        value: Any,
+        range_key_condition: ComparisonCondition | None = None,
+        filter_condition: ComparisonCondition | None = None,
+        index: GlobalSecondaryIndex | LocalSecondaryIndex | None = None,
+        attributes_to_get: List[str] | None = None,
+    ) -> Tuple:
+        return (
+            cls.__table_name__,
+            index.index_name if index else None,
+            normalize(value),
+            normalize(range_key_condition),
+            normalize(filter_condition),
+            tuple(sorted(set(attributes_to_get))) if attributes_to_get else None,
+        )
+
+    @classmethod
+    def _query_cache_tag(cls, value: Any, index: GlobalSecondaryIndex | LocalSecondaryIndex | None = None) -> Tuple:
+        # a global secondary index key can change on any write, local secondary indexes share the partition
+        if isinstance(index, GlobalSecondaryIndex):
+            return (cls.__table_name__, "gsi")
+        return (cls.__table_name__, "partition", normalize(value))
+
     def _key_params(self) -> Dict[str, str | float | int | Decimal | Binary]:
         params = {}
         params[self.__hash_key__] = getattr(self, self.__hash_key__)
@@ -590,13 +1553,15 @@ class _DynamanticFuture(Generic[T]):
     _model_cls: T
     _resolved: bool
 
-    def __init__(self, model_cls: Type[T]) -> None:
+    def __init__(self, model_cls: Type[T], raw: bool | Literal["wire"] = False, trusted: bool | None = None) -> None:
         self._model_cls = model_cls
         self._model: T = None
         self._resolved = False
+        self._raw = raw
+        self._trusted = trusted
 
     def from_raw_data(self, item: Dict[str, Any]) -> None:
-        self._model = self._model_cls(**self._model_cls.deserialize(item))
+        self._model = item if self._raw else self._model_cls._return_value(item, self._trusted)
         self._resolved = True
 
     def model_dump(self) -> Dict[str, Any]:
@@ -621,7 +1586,8 @@ class ConditionExpression:
         self._expr = expression
         self._expression_attribute_values = {}
 
-        self._type_check(value)
+        if self._expr._action != "REMOVE":
+            self._type_check(value)
         self._create_update_expression(value)
 
     def _type_check(self, value):
@@ -750,19 +1716,38 @@ class ConditionExpression:
             raise AttributeTypeInvalidError("time", json.dumps(self._expr._properties)) from ve
 
     def _create_update_expression(self, value: Any):
+        path = self._expr._compile()
+        key = f":{self._expr._key}"
+        if self._expr._action == "REMOVE":
+            self.update_expression = f"REMOVE {path}"
+            self.expression_attribute_values = {}
+            return
+
         equals = ""
         if self._expr._action == "SET":
             equals = "= "
 
         # Create the update expression string
-        self.update_expression = f"{self._expr._action} {self._expr._compile()} {equals}{self._expr._operand}"
-        key = f":{self._expr._key}"
+        operand = self._expr._operand.format(path=path, value=key)
+        self.update_expression = f"{self._expr._action} {path} {equals}{operand}"
         serialized = type_serialize(key=key, value=value)
         for k, v in serialized[key].items():
             if k in ("NS", "BS", "SS"):
                 serialized[key][k] = list(v)
         self.expression_attribute_values = serialized
 
+    def apply(self, builder: UpdateExpressionBuilder) -> None:
+        """Add the action to an update expression, with generated attribute names and values."""
+        action = self._expr._action
+        path = builder.name(self._expr._compile())
+        if action == "REMOVE":
+            builder.add_clause(action, path)
+            return
+
+        value = builder.value(next(iter(self.expression_attribute_values.values())))
+        operand = self._expr._operand.format(path=path, value=value)
+        builder.add_clause(action, f"{path} = {operand}" if action == "SET" else f"{path} {operand}")
+
     def _check_model(self, value: BaseModel):
         if not issubclass(value.__class__, BaseModel) or (
             issubclass(value.__class__, BaseModel)
@@ -810,9 +1795,7 @@ class Field:
                 return self.__class__(self._expr, self._properties, key=key)
 
         if "$ref" in self._properties:
-            model_type = self._properties.get("$ref").split("/")[-1]
-            nested_model = self._expr._cls_model.model_json_schema().get("$defs").get(model_type)
-            props = nested_model.get("properties")
+            props = self._expr._cls_model._schema_definition(self._properties.get("$ref"))
             if key in props:
                 return self.__class__(self._expr, props.get(key), key)
 
@@ -821,9 +1804,7 @@ class Field:
             if len(refs) > 0:
                 # is a nested model
                 ref = refs[0]
-                model_type = ref.get("$ref").split("/")[-1]
-                nested_model = self._expr._cls_model.model_json_schema().get("$defs").get(model_type)
-                props = nested_model.get("properties")
+                props = self._expr._cls_model._schema_definition(ref.get("$ref"))
                 if key in props:
                     return self.__class__(self._expr, props.get(key), key)
 
@@ -841,9 +1822,7 @@ class Field:
                     if len(refs) > 0:
                         # of subclasses
                         ref = refs[0]["items"]
-                        model_type = ref.get("$ref").split("/")[-1]
-                        nested_model = self._expr._cls_model.model_json_schema().get("$defs").get(model_type)
-                        props = nested_model.get("properties")
+                        props = self._expr._cls_model._schema_definition(ref.get("$ref"))
                         return self.__class__(self._expr, props, idx)
                     return self.__class__(self._expr, arrays[0], idx)
 
@@ -856,7 +1835,7 @@ class Field:
     def set(self, value: Any) -> ConditionExpression:
         self._expr._action = "SET"
         self._expr._value = value
-        self._expr._operand = f":{self._expr._key}"
+        self._expr._operand = "{value}"
         return ConditionExpression(value=value, expression=self._expr)
 
     def set_add(self, value: int | float | Decimal) -> ConditionExpression:
@@ -866,7 +1845,7 @@ class Field:
             # float must be converted to Decimal and appended to approved classes
             value = dynamodb_compatible_value(value)
         if isinstance(value, (int, Decimal)):
-            self._expr._operand = f"{self._expr._compile()} + :{self._expr._key}"
+            self._expr._operand = "{path} + {value}"
         else:
             raise AttributeTypeInvalidError(str(value.__class__), str({int, float, Decimal}))
         return ConditionExpression(value=value, expression=self._expr)
@@ -875,13 +1854,27 @@ class Field:
         self._expr._action = "SET" if isinstance(value, list) else "ADD"
         self._expr._value = value
         if isinstance(value, list):
-            self._expr._operand = f"list_append({self._expr._compile()}, :{self._expr._key})"
+            self._expr._operand = "list_append({path}, {value})"
         elif isinstance(value, set):
-            self._expr._operand = f":{self._expr._key}"
+            self._expr._operand = "{value}"
         else:
             raise AttributeTypeInvalidError(str(value.__class__), str({list, set}))
         return ConditionExpression(value=value, expression=self._expr)
 
+    def set_delete(self, value: Set[Any]) -> ConditionExpression:
+        self._expr._action = "DELETE"
+        self._expr._value = value
+        if not isinstance(value, set):
+            raise AttributeTypeInvalidError(str(value.__class__), str({set}))
+        self._expr._operand = "{value}"
+        return ConditionExpression(value=value, expression=self._expr)
+
+    def remove(self) -> ConditionExpression:
+        self._expr._action = "REMOVE"
+        self._expr._value = None
+        self._expr._operand = ""
+        return ConditionExpression(value=None, expression=self._expr)
+
 
 class Expr:
     _cls_model: T
@@ -905,7 +1898,7 @@ class Expr:
         self._cls_model = cls_model
 
     def field(self, key: str) -> Field:
-        props = self._cls_model.model_json_schema().get("properties")
+        props = self._cls_model._json_schema().get("properties")
         if key in props:
             self._properties = props.get(key)
             return Field(self, self._properties, key)
@@ -920,3 +1913,190 @@ class Expr:
             else:
                 expr = f"{expr}[{field._key}]"
         return expr
+
+
+class PreparedUpdate:
+    """An update compiled once, executed many times with new values.
+
+    The actions are validated against the model, and the update expression, the attribute names and the
+    condition expression are built, when the statement is prepared. Executing it only serializes the
+    values bound to it, one per action that has a value (every action but ``remove``), in the order of the
+    actions. Each is validated with a ``TypeAdapter`` of the annotation of its field, built when the
+    statement is prepared, and must have the DynamoDB type of the value it was prepared with. Values that
+    are not bound keep the value they were prepared with, as do the values of the condition unless
+    ``condition_values`` are bound, in the order they appear in the condition. Condition values compared
+    to a field of the model (``eq``, ``lt``, ``between``, ``is_in`` and the like) are validated the same
+    way, the others, such as those of attributes the model doesn't declare, are not.
+
+    Args:
+        actions (List[ConditionExpression]):
+                The update actions, built with sample values.
+
+        condition_expression (ComparisonCondition, optional):
+                Condition that must be satisfied for the update to succeed. Defaults to None.
+    """
+
+    def __init__(
+        self, actions: List[ConditionExpression], condition_expression: ComparisonCondition | None = None
+    ) -> None:
+        if len(actions) == 0:
+            raise UpdateError("At least one action is required.")
+        self._model: Type[Dynamantic] = actions[0]._expr._cls_model
+        self._return_values = self._model._update_return_values(actions)
+        self._cleared = self._model._update_cleared(actions)
+
+        self._update_expression, names, self._values = self._model._update(actions)
+        # the placeholders are generated in the order of the actions
+        self._placeholders = list(self._values)
+        self._checks = [
+            self._value_check(action._expr._compile()) for action in actions if action._expr._action != "REMOVE"
+        ]
+        self._condition_expression = None
+        self._condition_placeholders: List[str] = []
+        self._condition_checks: List[Tuple[Any, TypeAdapter] | None] = []
+        if condition_expression:
+            self._condition_expression, condition_names, condition_values = self._model._build_expression(
+                condition_expression
+            )
+            names = names | condition_names
+            self._condition_placeholders = list(condition_values)
+            self._condition_checks = self._condition_value_checks(condition_expression)
+            self._values = self._values | {k: serialize_value(v) for k, v in condition_values.items()}
+        self._names = names
+
+    def bind(self, *values: Any, condition_values: List[Any] | None = None) -> Dict[str, Any]:
+        """The ``UpdateItem`` parameters, without the table and key, with the values bound."""
+        if len(values) > len(self._placeholders):
+            raise ValueError(f"Expected at most {len(self._placeholders)} values, got {len(values)}")
+        if condition_values is not None and len(condition_values) != len(self._condition_placeholders):
+            raise ValueError(
+                f"Expected {len(self._condition_placeholders)} condition values, got {len(condition_values)}"
+            )
+
+        bound = dict(self._values)
+        for placeholder, check, value in zip(self._placeholders, self._checks, values):
+            if check is not None:
+                _validate(check, value)
+            serialized = serialize_value(value)
+            expected = next(iter(self._values[placeholder]))
+            if expected not in serialized:
+                raise AttributeTypeInvalidError(next(iter(serialized)), expected)
+            bound[placeholder] = serialized
+        for placeholder, check, value in zip(
+            self._condition_placeholders, self._condition_checks, condition_values or ()
+        ):
+            if check is not None:
+                _validate(check, value)
+            bound[placeholder] = serialize_value(value)
+
+        params = {
+            "UpdateExpression": self._update_expression,
+            "ExpressionAttributeNames": self._names,
+        }
+        if len(bound) > 0:
+            params["ExpressionAttributeValues"] = bound
+        if self._condition_expression is not None:
+            params["ConditionExpression"] = self._condition_expression
+        return params
+
+    def _condition_value_checks(self, condition: ConditionBase) -> List[Tuple[Any, TypeAdapter] | None]:
+        """A check of each value of the condition, in the order of its placeholders.
+
+        Only the values compared to a field of the model are checked, the others, such as the prefix of
+        ``begins_with``, a ``size`` or the values of attributes the model doesn't declare, have None.
+        """
+        checks = []
+        operands = condition.get_expression()["values"]
+        attribute = operands[0]
+        check = None
+        if (
+            isinstance(condition, (ComparisonCondition, Between))
+            and isinstance(attribute, AttributeBase)
+            and not isinstance(attribute, ConditionBase)
+        ):
+            check = self._value_check(attribute.name)
+
+        for operand in operands:
+            if isinstance(operand, ConditionBase):
+                checks.extend(self._condition_value_checks(operand))
+            elif isinstance(operand, AttributeBase):
+                # compared to another attribute, there is no value
+                continue
+            elif condition.has_grouped_values:
+                checks.extend(check for _ in operand)
+            else:
+                checks.append(check)
+        return checks
+
+    def _value_check(self, path: str) -> Tuple[Any, TypeAdapter] | None:
+        """The annotation of the field at an attribute path such as ``nested.values[0]`` and its adapter.
+
+        None when the model doesn't declare the field, or it accepts any value.
+        """
+        annotation = self._model
+        for name, index in re.findall(r"([^.\[\]]+)|\[(\d+)\]", path):
+            options = _annotation_options(annotation)
+            if name:
+                models = [option for option in options if inspect.isclass(option) and issubclass(option, BaseModel)]
+                fields = [model.model_fields[name] for model in models if name in model.model_fields]
+                annotation = fields[0].annotation if fields else None
+            else:
+                lists = [option for option in options if typing.get_origin(option) in (list, tuple)]
+                annotation = typing.get_args(lists[0])[0] if lists and typing.get_args(lists[0]) else None
+            if annotation is None:
+                return None
+        if annotation is Any:
+            return None
+        return annotation, TypeAdapter(annotation)
+
+    def execute(
+        self,
+        item: Dynamantic,
+        *values: Any,
+        condition_values: List[Any] | None = None,
+        refresh: bool | None = None,
+    ) -> None:
+        """Update the item with the values bound, see ``Dynamantic.update``."""
+        payload = {
+            "TableName": item.__table_name__,
+            "Key": item._primary_key(),
+            "ReturnValues": self._return_values,
+            **self.bind(*values, condition_values=condition_values),
+        }
+
+        try:
+            result = item._dynamodb().update_item(**payload)
+        except BOTOCORE_EXCEPTIONS as exc:
+            item.refresh(consistent_read=True)
+            raise UpdateError(f"Failed to update item: {exc}", exc) from exc
+
+        attributes = {k: TypeDeserializer().deserialize(v) for k, v in result.get("Attributes", {}).items()}
+        item._reconcile_update(attributes, self._cleared, refresh)
+
+    async def aexecute(
+        self,
+        item: Dynamantic,
+        *values: Any,
+        condition_values: List[Any] | None = None,
+        refresh: bool | None = None,
+    ) -> None:
+        """Asynchronous version of ``execute``."""
+        await run_sync(self.execute, item, *values, condition_values=condition_values, refresh=refresh)
+
+
+def _annotation_options(annotation: Any) -> List[Any]:
+    """The types an annotation allows, through ``Optional``, unions and ``Annotated``."""
+    origin = typing.get_origin(annotation)
+    if origin is typing.Annotated:
+        return _annotation_options(typing.get_args(annotation)[0])
+    if origin in (typing.Union, UnionType):
+        return [option for arg in typing.get_args(annotation) for option in _annotation_options(arg)]
+    return [annotation]
+
+
+def _validate(check: Tuple[Any, TypeAdapter], value: Any) -> None:
+    annotation, adapter = check
+    try:
+        adapter.validate_python(value)
+    except ValidationError as exc:
+        raise AttributeTypeInvalidError(str(value.__class__), str(annotation)) from exc
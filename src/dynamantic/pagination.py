@@ -0,0 +1,266 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Generic, Iterator, List, Tuple, TypeVar
+
+from dynamantic.exceptions import InvalidStateError, ScanError
+
+R = TypeVar("R")
+
+
+class ResultIterator(Generic[R]):
+    """Lazily iterate over the items of a query or scan, fetching one page at a time.
+
+    Args:
+        operation (Callable[..., Dict]):
+                The table operation to call for each page (``Table.query`` or ``Table.scan``).
+
+        params (Dict):
+                The parameters to pass to the operation.
+
+        map_fn (Callable[[Dict], R]):
+                Converts a raw item into the value yielded by the iterator.
+
+        key_names (List[str]):
+                The key attributes of the table (and index) used to build a resume cursor.
+
+        limit (int, optional):
+                Maximum number of items to yield in total. Defaults to None.
+
+        page_size (int, optional):
+                Maximum number of items to evaluate per request (DynamoDB ``Limit``). Defaults to None.
+
+        last_evaluated_key (Dict, optional):
+                A cursor returned by a previous iterator to resume from. Defaults to None.
+    """
+
+    def __init__(
+        self,
+        operation: Callable[..., Dict],
+        params: Dict[str, Any],
+        map_fn: Callable[[Dict[str, Any]], R],
+        key_names: List[str],
+        limit: int | None = None,
+        page_size: int | None = None,
+        last_evaluated_key: Dict[str, Any] | None = None,
+    ) -> None:
+        self._operation = operation
+        self._params = params
+        self._map_fn = map_fn
+        self._key_names = key_names
+        self._limit = limit
+        self._page_size = page_size
+
+        self._last_evaluated_key = last_evaluated_key
+        self._started = False
+        self._exhausted = False
+
+        self.count = 0
+        self.scanned_count = 0
+        self.page_count = 0
+
+    def __iter__(self) -> Iterator[R]:
+        self._start()
+        while (page := self._next_page()) is not None:
+            yield from self._page_items(page)
+            if self._remaining() == 0:
+                return
+        self._last_evaluated_key = None
+
+    def pages(self) -> Iterator[List[R]]:
+        """Yield each page of results as a list."""
+        self._start()
+        while (page := self._next_page()) is not None:
+            if len(page) > 0:
+                yield self._page_models(page)
+            if self._remaining() == 0:
+                return
+        self._last_evaluated_key = None
+
+    def first(self) -> R | None:
+        """Return the first item, or None when there are no results."""
+        return next(iter(self.take(1)), None)
+
+    def take(self, n: int) -> List[R]:
+        """Return up to ``n`` items, only fetching as many pages as needed."""
+        items = []
+        if n <= 0:
+            return items
+        for item in self:
+            items.append(item)
+            if len(items) >= n:
+                break
+        return items
+
+    @property
+    def last_evaluated_key(self) -> Dict[str, Any] | None:
+        """Cursor to resume after the last item yielded. None once every page has been read."""
+        return self._last_evaluated_key
+
+    def _remaining(self) -> int | None:
+        if self._limit is None:
+            return None
+        return max(self._limit - self.count, 0)
+
+    def _item_key(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        return {k: item[k] for k in self._key_names if k in item}
+
+    def _start(self) -> None:
+        if self._started:
+            raise InvalidStateError("Results can only be iterated once.")
+        self._started = True
+        self._page_key = self._last_evaluated_key
+
+    def _next_page(self) -> List[Dict[str, Any]] | None:
+        """Fetch the next raw page, which may be empty. None once there is nothing left to read."""
+        if self._exhausted or self._remaining() == 0:
+            return None
+
+        params = dict(self._params)
+        if self._page_key:
+            params["ExclusiveStartKey"] = self._page_key
+        page_size = self._page_size or self._remaining()
+        if page_size:
+            params["Limit"] = min(page_size, self._remaining() or page_size)
+
+        result = self._operation(**params)
+        self.page_count += 1
+        self.scanned_count += result.get("ScannedCount", 0)
+
+        self._page_key = result.get("LastEvaluatedKey")
+        if self._page_key is None:
+            self._exhausted = True
+        return result.get("Items", [])
+
+    def _page_items(self, page: List[Dict[str, Any]]) -> Iterator[R]:
+        for x, item in enumerate(page):
+            self.count += 1
+            # the page cursor is exact once the last item of a page has been consumed
+            self._last_evaluated_key = self._page_key if x == len(page) - 1 else self._item_key(item)
+            yield self._map_fn(item)
+            if self._remaining() == 0:
+                return
+
+    def _page_models(self, page: List[Dict[str, Any]]) -> List[R]:
+        remaining = self._remaining()
+        if remaining is not None and remaining < len(page):
+            page = page[:remaining]
+            self._last_evaluated_key = self._item_key(page[-1])
+        else:
+            self._last_evaluated_key = self._page_key
+        self.count += len(page)
+        return [self._map_fn(item) for item in page]
+
+
+class ParallelScan(Generic[R]):
+    """Scan every segment of a table concurrently, streaming results as each page arrives.
+
+    Pages are handed from the worker threads to the consumer through a bounded buffer so memory stays
+    flat however large the table is. ``resume_tokens`` tracks the cursor of every segment that has not
+    finished, so a failed scan can be continued by passing it back to ``Dynamantic.parallel_scan``.
+
+    Args:
+        iterator_factory (Callable[[int, Dict | None], ResultIterator]):
+                Creates the iterator for a segment, starting from the provided cursor.
+
+        total_segments (int):
+                The number of segments the table is split into.
+
+        resume_tokens (Dict[int, Dict | None], optional):
+                The segments to scan and the cursor each one starts from. Defaults to every segment
+                from the beginning.
+
+        max_workers (int, optional):
+                Maximum number of segments scanned at once. Defaults to ``total_segments``.
+
+        segment_callback (Callable[[int, List], None], optional):
+                Called from the worker thread with the segment number and each page of results.
+
+        max_buffered_pages (int, optional):
+                Number of pages that can wait for the consumer before workers block. Defaults to None,
+                which is twice the number of workers.
+    """
+
+    def __init__(
+        self,
+        iterator_factory: Callable[[int, Dict[str, Any] | None], ResultIterator[R]],
+        total_segments: int,
+        resume_tokens: Dict[int, Dict[str, Any] | None] | None = None,
+        max_workers: int | None = None,
+        segment_callback: Callable[[int, List[R]], None] | None = None,
+        max_buffered_pages: int | None = None,
+    ) -> None:
+        if resume_tokens is None:
+            resume_tokens = {segment: None for segment in range(total_segments)}
+
+        self._iterator_factory = iterator_factory
+        self._total_segments = total_segments
+        self._resume_tokens = dict(resume_tokens)
+        self._max_workers = max_workers or max(len(self._resume_tokens), 1)
+        self._segment_callback = segment_callback
+        self._max_buffered_pages = max_buffered_pages or self._max_workers * 2
+        self._stop = threading.Event()
+        self._started = False
+
+        self.count = 0
+        self.errors: Dict[int, Exception] = {}
+
+    def __iter__(self) -> Iterator[R]:
+        if self._started:
+            raise InvalidStateError("Results can only be iterated once.")
+        self._started = True
+
+        pages: queue.Queue = queue.Queue(maxsize=self._max_buffered_pages)
+        segments = list(self._resume_tokens.items())
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            for segment, start_key in segments:
+                executor.submit(self._scan_segment, segment, start_key, pages)
+            try:
+                finished = 0
+                while finished < len(segments):
+                    segment, items, cursor, error = pages.get()
+                    if items is None:
+                        finished += 1
+                        if error is not None:
+                            self.errors[segment] = error
+                        else:
+                            del self._resume_tokens[segment]
+                        continue
+                    for item in items:
+                        self.count += 1
+                        yield item
+                    self._resume_tokens[segment] = cursor
+            finally:
+                self._stop.set()
+
+        if len(self.errors) > 0:
+            segment, error = next(iter(self.errors.items()))
+            raise ScanError(f"Failed to scan {len(self.errors)} segment(s), first was {segment}: {error}", error)
+
+    @property
+    def resume_tokens(self) -> Dict[int, Dict[str, Any] | None]:
+        """The cursor for every segment that has not been scanned to the end."""
+        return dict(self._resume_tokens)
+
+    def _scan_segment(self, segment: int, start_key: Dict[str, Any] | None, pages: queue.Queue) -> None:
+        error = None
+        try:
+            results = self._iterator_factory(segment, start_key)
+            for page in results.pages():
+                if self._segment_callback:
+                    self._segment_callback(segment, page)
+                if not self._put(pages, (segment, page, results.last_evaluated_key, None)):
+                    return
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            error = exc
+        self._put(pages, (segment, None, None, error))
+
+    def _put(self, pages: queue.Queue, entry: Tuple) -> bool:
+        # the consumer may stop early, so never block forever on a full buffer
+        while not self._stop.is_set():
+            try:
+                pages.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
@@ -0,0 +1,96 @@
+# pylint: disable=W0212
+
+import threading
+from contextvars import Token
+from typing import Any, Dict, List, Tuple, Type
+
+from dynamantic.exceptions import GetError
+from dynamantic.main import Dynamantic, T, _current_session
+
+_DELETED = object()
+
+
+class Session:
+    """A request scoped identity map of the items read and written by this process.
+
+    Inside ``with Session():`` (or ``async with``), ``Dynamantic.get`` and ``refresh`` return the
+    instance already loaded for a primary key instead of reading it again, so every read of a key in
+    the scope sees the same object. Items written with ``save``/``update``/``delete`` and through
+    ``BatchWrite``/``TransactWrite`` are tracked, so reads after writes are served locally, and the
+    results of ``TransactGet`` are added to the map.
+
+    Strongly consistent reads always go to DynamoDB, and update the instance in the map in place.
+    Items updated through a ``TransactWrite`` are read again the next time they are requested, since
+    the new values are not returned.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._items: Dict[Tuple, Any] = {}
+        self._tokens: List[Token] = []
+
+        self.hits = 0
+        self.misses = 0
+
+    def __enter__(self):
+        self._tokens.append(_current_session.set(self))
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _current_session.reset(self._tokens.pop())
+
+    async def __aenter__(self):
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self.__exit__(exc_type, exc_value, traceback)
+
+    def __len__(self) -> int:
+        return sum(1 for item in self._items.values() if item is not _DELETED)
+
+    def __contains__(self, item: Dynamantic) -> bool:
+        return self._items.get(item._identity()) is item
+
+    def lookup(self, model: Type[T], hash_key: Any, range_key: Any = None) -> T | None:
+        """The instance loaded for a key, None when it has not been seen. Raises ``GetError`` once deleted."""
+        identity = model._key_identity(hash_key, range_key)
+        with self._lock:
+            item = self._items.get(identity)
+            if item is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        if item is _DELETED:
+            raise GetError("Item doesn't exist.")
+        return item
+
+    def merge(self, item: T) -> T:
+        """Track a freshly read item, updating and returning the instance already loaded for its key."""
+        identity = item._identity()
+        with self._lock:
+            existing = self._items.get(identity)
+            if existing is None or existing is _DELETED or type(existing) is not type(item):
+                self._items[identity] = item
+                return item
+        if existing is not item:
+            existing.from_raw_data(dict(item))
+        return existing
+
+    def add(self, item: Dynamantic) -> None:
+        """Track an item that was written, it becomes the instance returned for its key."""
+        with self._lock:
+            self._items[item._identity()] = item
+
+    def remove(self, item: Dynamantic) -> None:
+        """Track an item that was deleted, reads of its key raise ``GetError``."""
+        with self._lock:
+            self._items[item._identity()] = _DELETED
+
+    def discard(self, item: Dynamantic) -> None:
+        """Forget an item, so the next read of its key goes to DynamoDB."""
+        with self._lock:
+            self._items.pop(item._identity(), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items = {}
@@ -0,0 +1,72 @@
+import threading
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+
+class SingleFlightStats:
+    """Counters for a ``SingleFlight``."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.coalesced = 0
+        self.errors = 0
+
+    @property
+    def coalesced_ratio(self) -> float:
+        requests = self.calls + self.coalesced
+        return self.coalesced / requests if requests else 0.0
+
+
+class _Call:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+        self.followers = 0
+
+
+class SingleFlight:
+    """Run a function once for every caller asking for the same key while it is in flight.
+
+    The first caller of a key runs the function, callers that arrive before it returns wait for its
+    result, or its error, instead of running the function again. A call only covers the callers that
+    arrived while it was running, so a result is never served after the call completed.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.stats = SingleFlightStats()
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    def do(self, key: Hashable, func: Callable[[], Any]) -> Tuple[Any, bool]:
+        """The result of ``func`` and whether it was shared with other callers, who may not modify it."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.stats.calls += 1
+            else:
+                call.followers += 1
+                self.stats.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = func()
+        except BaseException as exc:
+            call.error = exc
+            self.stats.errors += 1
+            raise
+        finally:
+            # no caller joins once the call is removed, so the number of followers is final
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, call.followers > 0
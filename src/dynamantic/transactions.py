@@ -1,11 +1,12 @@
 # pylint: disable=W0212
 
-from typing import List, Any, Type, Dict
+from typing import List, Any, Type, Dict, Tuple
 
 from mypy_boto3_dynamodb.type_defs import TransactGetItemTypeDef, TransactWriteItemTypeDef
-from boto3.dynamodb.types import TypeSerializer, TypeDeserializer
+from boto3.dynamodb.types import TypeDeserializer
 
-from dynamantic.main import Dynamantic, ConditionExpression, T, _DynamanticFuture
+from dynamantic.aio import run_sync
+from dynamantic.main import Dynamantic, ConditionExpression, T, _DynamanticFuture, _current_session
 from dynamantic.exceptions import TransactGetError
 
 
@@ -18,10 +19,19 @@ class TransactContext:
         self._operations = []
         self._futures = []
         self._models = []
+        # the items written and the session method that tracks each one
+        self._written: List[Tuple[T, str]] = []
 
     def __enter__(self):
         return self
 
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        # the requests are sent off the event loop
+        await run_sync(self.__exit__, exc_type, exc_value, traceback)
+
     def _add_model(self, model: T) -> _DynamanticFuture[T]:
         model_future = _DynamanticFuture(model_cls=model)
         self._futures.append(model_future)
@@ -33,39 +43,37 @@ class TransactWrite(TransactContext):
     _operations: List[TransactWriteItemTypeDef] = []
 
     def _primary_key(self, item: T) -> Dict[str, Dict]:
-        update_item = {k: TypeSerializer().serialize(v) for k, v in item.serialize().items()}
-        primary_key = {}
-        for k, v in update_item.items():
-            if k in (item.__hash_key__, item.__range_key__):
-                primary_key[k] = v
-        return primary_key
+        return item._primary_key()
 
     def save(self, item: T) -> None:
         """Perform a transact PUT operation on the database."""
-        put_item = {k: TypeSerializer().serialize(v) for k, v in item.serialize().items()}
+        put_item = item._serialize_wire()
         self._operations.append({"Put": {"Item": put_item, "TableName": item.__table_name__}})
         self._add_model(item.__class__)
+        self._written.append((item, "add"))
 
     def update(self, item: T, actions: List[ConditionExpression]) -> Dict:
         """Perform a transact UPDATE operation on the database."""
-        last_action_type, all_operations, all_attribute_values = item._update(actions)
-
-        self._operations.append(
-            {
-                "Update": {
-                    "Key": self._primary_key(item),
-                    "TableName": item.__table_name__,
-                    "UpdateExpression": " ".join([last_action_type, ", ".join(all_operations)]),
-                    "ExpressionAttributeValues": all_attribute_values,
-                }
-            }
-        )
+        update_expression, names, values = item._update(actions)
+
+        update = {
+            "Key": self._primary_key(item),
+            "TableName": item.__table_name__,
+            "UpdateExpression": update_expression,
+            "ExpressionAttributeNames": names,
+        }
+        if len(values) > 0:
+            update["ExpressionAttributeValues"] = values
+        self._operations.append({"Update": update})
         self._add_model(item.__class__)
+        # the new values are not returned, so the item is read again the next time it is requested
+        self._written.append((item, "discard"))
 
     def delete(self, item: T) -> None:
         """Perform a transact DELETE operation on the database."""
         self._operations.append({"Delete": {"Key": self._primary_key(item), "TableName": item.__table_name__}})
         self._add_model(item.__class__)
+        self._written.append((item, "remove"))
 
     def __exit__(self, exc_type, exc_value, traceback):
         if len(self._operations) > 0:
@@ -73,15 +81,15 @@ class TransactWrite(TransactContext):
             model: Dynamantic = next(iter(self._models))
             model._dynamodb().transact_write_items(TransactItems=self._operations)
 
+        for item, track in self._written:
+            item._track_write(track)
+
 
 class TransactGet(TransactContext):
     _operations: List[TransactGetItemTypeDef] = []
 
     def _key(self, model: Type[T], hash_key: Any, range_key: Any = None) -> Dict[str, Any]:
-        key = {model.__hash_key__: {model._dynamodb_type(model.__hash_key__): hash_key}}
-        if range_key:
-            key[model.__range_key__] = {model._dynamodb_type(model.__range_key__): range_key}
-        return key
+        return model._key(hash_key, range_key)
 
     def get(self, model: Type[T], hash_key: Any, range_key: Any = None) -> _DynamanticFuture[T]:
         key = self._key(model, hash_key, range_key)
@@ -99,3 +107,8 @@ class TransactGet(TransactContext):
                         raise TransactGetError(f"{key} does not exist in the table.")
                 item = {k: TypeDeserializer().deserialize(v) for k, v in item["Item"].items()}
                 self._futures[x].from_raw_data(item)
+
+            session = _current_session.get()
+            if session is not None:
+                for future in self._futures:
+                    future._model = session.merge(future._model)
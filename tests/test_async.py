@@ -0,0 +1,159 @@
+import asyncio
+import inspect
+import threading
+
+import pytest
+
+from dynamantic import aio, BatchWrite, Expr, TransactWrite
+from dynamantic.exceptions import GetError
+from tests.conftest import _create_item, _save_items, BaseModel, RangeKeyModel
+
+
+def test_aget(dynamodb):
+    _save_items(RangeKeyModel)
+    item = asyncio.run(RangeKeyModel.aget("hello:world", "relation_id:hello:world"))
+    assert item.my_str == "item1"
+
+
+def test_aget_fails(dynamodb):
+    _save_items(RangeKeyModel)
+    with pytest.raises(GetError, match="Item doesn't exist"):
+        asyncio.run(RangeKeyModel.aget("hello:world", "doesnt_exist"))
+
+
+def test_asave_aupdate_adelete(dynamodb):
+    item = _create_item(BaseModel, item_id="async")
+
+    async def run():
+        await item.asave()
+        await item.aupdate([Expr(BaseModel).field("my_str").set("updated")])
+        fetched = await BaseModel.aget("async")
+        await item.adelete()
+        return fetched
+
+    assert asyncio.run(run()).my_str == "updated"
+    assert item.my_str == "updated"
+    with pytest.raises(GetError):
+        BaseModel.get("async")
+
+
+def test_aget_concurrent(dynamodb):
+    items = _save_items(BaseModel, add_count=10)
+
+    async def run():
+        return await asyncio.gather(*[BaseModel.aget(item.item_id) for item in items])
+
+    results = asyncio.run(run())
+    assert [result.item_id for result in results] == [item.item_id for item in items]
+
+
+def test_requests_run_off_the_event_loop(dynamodb, monkeypatch):
+    _save_items(BaseModel)
+    threads = []
+    get = BaseModel.get.__func__
+
+    def recording_get(cls, *args, **kwargs):
+        threads.append(threading.current_thread())
+        return get(cls, *args, **kwargs)
+
+    monkeypatch.setattr(BaseModel, "get", classmethod(recording_get))
+    asyncio.run(BaseModel.aget("foo:bar"))
+    assert threads[0] is not threading.main_thread()
+
+
+def test_aiter_query(dynamodb):
+    _save_items(RangeKeyModel, add_count=5)
+
+    async def run():
+        results = RangeKeyModel.aiter_query("hello:world", page_size=2)
+        items = [item async for item in results]
+        return items, results
+
+    items, results = asyncio.run(run())
+    assert len(items) == 7
+    assert results.page_count == 4
+    assert results.last_evaluated_key is None
+
+
+def test_aiter_query_pages_and_resume(dynamodb):
+    _save_items(RangeKeyModel, add_count=5)
+
+    async def run():
+        pages = [page async for page in RangeKeyModel.aiter_query("hello:world", page_size=3).pages()]
+        first = RangeKeyModel.aiter_query("hello:world", limit=4, page_size=3)
+        head = await first.take(4)
+        rest = await RangeKeyModel.aquery("hello:world", last_evaluated_key=first.last_evaluated_key)
+        return pages, head, rest
+
+    pages, head, rest = asyncio.run(run())
+    assert [len(page) for page in pages] == [3, 3, 1]
+    assert len(head) == 4
+    assert len(rest) == 3
+    assert {item.relation_id for item in head}.isdisjoint({item.relation_id for item in rest})
+
+
+def test_ascan(dynamodb):
+    _save_items(RangeKeyModel)
+
+    async def run():
+        first = await RangeKeyModel.aiter_scan().first()
+        return first, await RangeKeyModel.ascan()
+
+    first, items = asyncio.run(run())
+    assert first is not None
+    assert len(items) == 3
+
+
+@pytest.mark.parametrize(
+    "async_method, sync_method",
+    [("aquery", "iter_query"), ("aiter_query", "iter_query"), ("ascan", "iter_scan"), ("aiter_scan", "iter_scan")],
+)
+def test_async_signatures_match_sync(async_method, sync_method):
+    async_parameters = inspect.signature(getattr(RangeKeyModel, async_method)).parameters
+    assert async_parameters == inspect.signature(getattr(RangeKeyModel, sync_method)).parameters
+
+
+def test_aquery_arguments(dynamodb):
+    _save_items(RangeKeyModel, add_count=5)
+
+    async def run():
+        return await RangeKeyModel.aquery("hello:world", scan_index_forward=False, raw=True)
+
+    items = asyncio.run(run())
+    assert [item["relation_id"] for item in items] == sorted((item["relation_id"] for item in items), reverse=True)
+
+
+def test_async_batch_write(dynamodb):
+    items = [_create_item(BaseModel, item_id=f"item:{x}") for x in range(30)]
+
+    async def run():
+        async with BatchWrite() as batch:
+            for item in items:
+                batch.save(item)
+        return await BaseModel.abatch_get([item.item_id for item in items])
+
+    assert len(asyncio.run(run())) == 30
+
+
+def test_async_transact_write(dynamodb):
+    item = _create_item(RangeKeyModel, relation_id="range_key")
+
+    async def run():
+        async with TransactWrite() as transaction:
+            transaction.save(item)
+        return await RangeKeyModel.aget(item.item_id, "range_key")
+
+    assert asyncio.run(run()).item_id == item.item_id
+
+
+def test_set_max_concurrency(dynamodb):
+    _save_items(BaseModel)
+    with pytest.raises(ValueError):
+        aio.set_max_concurrency(0)
+
+    aio.set_max_concurrency(2)
+    try:
+        assert aio._get_executor()._max_workers == 2
+        assert asyncio.run(BaseModel.aget("foo:bar")).item_id == "foo:bar"
+    finally:
+        aio.set_max_concurrency(aio.DEFAULT_MAX_CONCURRENCY)
@@ -1,7 +1,11 @@
+import time
+import threading
+
 import pytest
 
 from dynamantic.batch import BatchGet, BatchWrite
-from dynamantic.exceptions import GetError
+from dynamantic.executor import BatchExecutor, key_identity
+from dynamantic.exceptions import GetError, BatchWriteError, BatchGetError
 
 from tests.conftest import BaseModel, RangeKeyModel, RangeKeyModelTable2, _save_items, _create_item
 
@@ -119,3 +123,236 @@ def test_simple_batch_get_many(dynamodb):
     items = RangeKeyModel.batch_get([(item.item_id, item.relation_id) for item in all_items])
     assert items[0].my_int == 5
     assert items[99].my_int == 96  # 99 - 3 pre-created items
+
+
+class ThrottledClient:
+    """Leaves the last item of each of the first ``throttled`` requests unprocessed."""
+
+    def __init__(self, throttled: int) -> None:
+        self.throttled = throttled
+        self.written = []
+        self.requests = []
+
+    def batch_write_item(self, RequestItems):
+        requests = [(table, request) for table, table_requests in RequestItems.items() for request in table_requests]
+        self.requests.append(list(requests))
+        if self.throttled > 0:
+            self.throttled -= 1
+            table, request = requests.pop()
+            self.written.extend(requests)
+            return {"UnprocessedItems": {table: [request]}}
+        self.written.extend(requests)
+        return {"UnprocessedItems": {}}
+
+    def batch_get_item(self, RequestItems):
+        keys = [(table, key) for table, request in RequestItems.items() for key in request["Keys"]]
+        self.requests.append(list(keys))
+        unprocessed = {}
+        if self.throttled > 0:
+            self.throttled -= 1
+            table, key = keys.pop()
+            unprocessed = {table: {"Keys": [key]}}
+        responses = {}
+        for table, key in keys:
+            responses.setdefault(table, []).append(key | {"value": {"S": key["id"]["S"] + "-value"}})
+        return {"Responses": responses, "UnprocessedKeys": unprocessed}
+
+
+def _put(i):
+    return ("table", {"PutRequest": {"Item": {"id": {"S": str(i)}}}})
+
+
+def _delete(i):
+    return ("table", {"DeleteRequest": {"Key": {"id": {"S": str(i)}}}})
+
+
+def _key(i):
+    return {"id": {"S": str(i)}}
+
+
+def test_executor_write_retries_unprocessed():
+    client = ThrottledClient(throttled=2)
+    executor = BatchExecutor(client, base_delay=0)
+    executor.write([_put(i) for i in range(30)])
+    assert sorted(client.written, key=lambda op: int(op[1]["PutRequest"]["Item"]["id"]["S"])) == [
+        _put(i) for i in range(30)
+    ]
+    assert executor.stats.unprocessed == 2
+    assert executor.stats.retry_counts == [0, 1, 2]
+
+
+def test_executor_write_coalesces_leftovers():
+    client = ThrottledClient(throttled=1)
+    executor = BatchExecutor(client, base_delay=0)
+    executor.write([_put(i) for i in range(50)])
+    # the unprocessed item is sent with the next 24 fresh items, then the last one is sent alone
+    assert [len(request) for request in client.requests] == [25, 25, 1]
+
+
+def test_executor_write_gives_up():
+    executor = BatchExecutor(ThrottledClient(throttled=10), max_retries=3, base_delay=0)
+    with pytest.raises(BatchWriteError, match="1 items were not processed after 3 retries."):
+        executor.write([_put(0)])
+
+
+def test_executor_get_retries_unprocessed():
+    client = ThrottledClient(throttled=1)
+    executor = BatchExecutor(client, base_delay=0)
+    keys = [("table", {"id": {"S": str(i)}}) for i in range(3)]
+    items = executor.get(keys)
+    assert len(items) == 3
+    assert items[key_identity("table", {"id": {"S": "2"}})]["value"] == {"S": "2-value"}
+    assert executor.stats.retry_counts == [0, 1]
+
+
+def test_executor_get_gives_up():
+    executor = BatchExecutor(ThrottledClient(throttled=10), max_retries=2, base_delay=0)
+    with pytest.raises(BatchGetError, match="1 keys were not processed after 2 retries."):
+        executor.get([("table", {"id": {"S": "0"}})])
+
+
+def test_batch_write_stats(dynamodb):
+    all_items = [_create_item(RangeKeyModel, relation_id=f"range_key_{i}") for i in range(30)]
+    with BatchWrite() as transaction:
+        for item in all_items:
+            transaction.save(item)
+
+    assert transaction.stats.requests == 2
+    assert transaction.stats.items == 30
+
+
+class SlowClient(ThrottledClient):
+    """Records the highest number of requests in flight at once."""
+
+    def __init__(self) -> None:
+        super().__init__(throttled=0)
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def batch_write_item(self, RequestItems):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(0.02)
+        with self.lock:
+            self.in_flight -= 1
+            return super().batch_write_item(RequestItems)
+
+
+def test_executor_write_concurrent():
+    client = SlowClient()
+    executor = BatchExecutor(client, max_workers=3)
+    executor.write([_put(i) for i in range(250)], [_key(i) for i in range(250)])
+    assert len(client.written) == 250
+    assert executor.stats.requests == 10
+    assert client.max_in_flight == 3
+
+
+def test_executor_concurrent_retries():
+    client = ThrottledClient(throttled=4)
+    executor = BatchExecutor(client, base_delay=0, max_workers=4)
+    executor.write([_put(i) for i in range(100)], [_key(i) for i in range(100)])
+    assert len(client.written) == 100
+    assert executor.stats.unprocessed == 4
+
+
+def test_executor_write_keeps_order_of_key():
+    client = ThrottledClient(throttled=1)
+    executor = BatchExecutor(client, base_delay=0, max_workers=2)
+    # the delete of 24 waits for its put, even when the put is left unprocessed and retried
+    executor.write([_put(i) for i in range(30)] + [_delete(24)], [_key(i) for i in range(30)] + [_key(24)])
+    assert client.written.index(_put(24)) < client.written.index(_delete(24))
+    assert len(client.written) == 31
+    for request in client.requests:
+        ids = [next(iter(op.values()))["Item" if "PutRequest" in op else "Key"]["id"]["S"] for _, op in request]
+        assert len(ids) == len(set(ids))
+
+
+def test_executor_write_without_keys_is_sequential():
+    client = SlowClient()
+    executor = BatchExecutor(client, max_workers=3)
+    executor.write([_put(i) for i in range(100)])
+    assert len(client.written) == 100
+    assert client.max_in_flight == 1
+
+
+def test_batch_write_save_then_delete(dynamodb):
+    item = _create_item(RangeKeyModel, relation_id="range_key_deleted")
+    with BatchWrite(max_workers=4) as transaction:
+        transaction.save(item)
+        transaction.delete(item)
+
+    assert transaction.stats.requests == 2
+    with pytest.raises(GetError):
+        RangeKeyModel.get(item.item_id, item.relation_id)
+
+
+def test_batch_get_many_concurrent(dynamodb):
+    all_items = _save_items(RangeKeyModel, add_count=60)
+
+    futures = []
+    with BatchGet(max_workers=8) as transaction:
+        for item in all_items:
+            futures.append(transaction.get(item.__class__, item.item_id, item.relation_id))
+
+    assert [future.refresh().relation_id for future in futures] == [item.relation_id for item in all_items]
+
+
+def test_executor_get_packs_100_keys():
+    client = ThrottledClient(throttled=0)
+    executor = BatchExecutor(client)
+    executor.get([("table", {"id": {"S": str(i)}}) for i in range(150)] + [("other", {"id": {"S": "0"}})])
+    assert [len(request) for request in client.requests] == [100, 51]
+
+
+def test_executor_get_deduplicates_keys():
+    client = ThrottledClient(throttled=0)
+    executor = BatchExecutor(client)
+    items = executor.get([("table", {"id": {"S": str(i % 3)}}) for i in range(9)])
+    assert [len(request) for request in client.requests] == [3]
+    assert len(items) == 3
+
+
+def test_batch_get_duplicate_keys(dynamodb):
+    _save_items(RangeKeyModel)
+    _save_items(RangeKeyModelTable2, extra_arg=6)
+    with BatchGet() as transaction:
+        item1 = transaction.get(RangeKeyModel, "foo:bar", "relation_id:foo:bar")
+        item2 = transaction.get(RangeKeyModelTable2, "foo:bar", "relation_id:foo:bar")
+        item3 = transaction.get(RangeKeyModel, "foo:bar", "relation_id:foo:bar")
+
+    assert transaction.stats.items == 2
+    assert item1.refresh().item_id == item3.refresh().item_id == "foo:bar"
+    assert item2.refresh().extra_arg == 6
+
+
+def test_batch_get_many_stats(dynamodb):
+    all_items = _save_items(RangeKeyModel, add_count=100)
+    with BatchGet() as transaction:
+        for item in all_items:
+            transaction.get(item.__class__, item.item_id, item.relation_id)
+
+    assert transaction.stats.requests == 2
+
+
+def test_simple_batch_get_duplicates(dynamodb):
+    _save_items(BaseModel)
+    items = BaseModel.batch_get(["foo:bar", "foo:bar", "hello:world"])
+    assert [item.item_id for item in items] == ["foo:bar", "foo:bar", "hello:world"]
+
+
+def test_batch_get_raw(dynamodb):
+    _save_items(RangeKeyModel)
+    with BatchGet() as transaction:
+        model = transaction.get(RangeKeyModel, "hello:world", "relation_id:hello:world")
+        item = transaction.get(RangeKeyModel, "hello:world", "relation_id:hello:world", raw=True)
+        wire_item = transaction.get(RangeKeyModel, "foo:bar", "relation_id:foo:bar", raw="wire")
+
+    assert item.refresh()["my_int"] == 5
+    assert RangeKeyModel.from_raw(item.refresh()) == model.refresh()
+    assert wire_item.refresh()["my_str"] == {"S": "item2"}
+
+    items = RangeKeyModel.batch_get([("hello:world", "relation_id:hello:world"), ("blah", "blah")], raw="wire")
+    assert [RangeKeyModel.from_raw(item, wire=True) for item in items] == [model.refresh()]
+    assert RangeKeyModel.batch_get([("hello:world", "relation_id:hello:world")], raw=True)[0]["my_str"] == "item1"
@@ -0,0 +1,184 @@
+import time
+
+import pytest
+
+from dynamantic import Expr, WriteBuffer
+from dynamantic.exceptions import InvalidStateError, UpdateError
+from tests.conftest import _create_item, BaseModel, RangeKeyModel
+
+
+class CountingClient:
+    def __init__(self, client) -> None:
+        self._client = client
+        self.updates = []
+        self.batch_writes = []
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+    def update_item(self, **kwargs):
+        self.updates.append(kwargs)
+        return self._client.update_item(**kwargs)
+
+    def batch_write_item(self, RequestItems):
+        self.batch_writes.append(sum(len(requests) for requests in RequestItems.values()))
+        return self._client.batch_write_item(RequestItems=RequestItems)
+
+
+@pytest.fixture
+def counting_client(dynamodb, monkeypatch):
+    client = CountingClient(BaseModel._dynamodb())
+    monkeypatch.setattr(BaseModel, "_dynamodb", classmethod(lambda cls: client))
+    return client
+
+
+def test_increments_are_coalesced(counting_client):
+    item = _create_item(BaseModel, my_int=0, my_float=0.0)
+    item.save()
+
+    with WriteBuffer(BaseModel, flush_interval=None) as buffer:
+        for _ in range(100):
+            buffer.update(item, [Expr(BaseModel).field("my_int").set_add(1)])
+            buffer.update(item, [Expr(BaseModel).field("my_float").set_add(0.5)])
+        assert len(buffer) == 1
+
+    assert len(counting_client.updates) == 1
+    fetched = BaseModel.get(item.item_id)
+    assert (fetched.my_int, fetched.my_float) == (100, 50.0)
+    assert buffer.stats.writes == 200
+    assert buffer.stats.coalesced == 199
+    assert buffer.stats.updates == 1
+
+
+def test_last_put_wins(counting_client):
+    items = [_create_item(BaseModel, item_id=f"item:{x}") for x in range(10)]
+
+    with WriteBuffer(BaseModel, flush_interval=None) as buffer:
+        for value in range(5):
+            for item in items:
+                item.my_int = value
+                buffer.save(item.model_copy())
+
+    assert counting_client.batch_writes == [10]
+    assert {BaseModel.get(item.item_id).my_int for item in items} == {4}
+    assert buffer.stats.puts == 10
+
+
+def test_put_then_increment(counting_client):
+    item = _create_item(BaseModel, my_int=1)
+
+    with WriteBuffer(BaseModel, flush_interval=None) as buffer:
+        buffer.update(item, [Expr(BaseModel).field("my_str").set("overwritten")])
+        buffer.save(item)
+        buffer.update(item, [Expr(BaseModel).field("my_int").set_add(2)])
+        buffer.update(item, [Expr(BaseModel).field("my_int").set_add(3)])
+
+    fetched = BaseModel.get(item.item_id)
+    assert fetched.my_int == 6
+    assert fetched.my_str == item.my_str
+    assert len(counting_client.updates) == 1
+
+
+def test_update_keeps_pending_put(counting_client):
+    item = _create_item(BaseModel, my_str="saved", my_int=1)
+    other = item.model_copy(update={"my_str": "not saved"})
+
+    with WriteBuffer(BaseModel, flush_interval=None) as buffer:
+        buffer.save(item)
+        buffer.update(other, [Expr(BaseModel).field("my_int").set_add(1)])
+
+    fetched = BaseModel.get(item.item_id)
+    assert (fetched.my_str, fetched.my_int) == ("saved", 2)
+
+
+def test_mixed_actions_are_combined(counting_client):
+    item = _create_item(BaseModel, my_str="remove me")
+    item.save()
+
+    with WriteBuffer(BaseModel, flush_interval=None) as buffer:
+        buffer.update(item, [Expr(BaseModel).field("my_int_set").set_append({3})])
+        buffer.update(item, [Expr(BaseModel).field("my_int_set").set_append({4})])
+        buffer.update(item, [Expr(BaseModel).field("my_str").remove()])
+        buffer.update(item, [Expr(BaseModel).field("my_int").set(7), Expr(BaseModel).field("my_int").set_add(1)])
+
+    (update,) = counting_client.updates
+    fetched = BaseModel.get(item.item_id)
+    assert fetched.my_int_set == {1, 2, 3, 4}
+    assert fetched.my_str is None
+    assert fetched.my_int == 8
+    assert {"N": "8"} in update["ExpressionAttributeValues"].values()
+
+
+def test_actions_that_cant_be_combined_flush_the_key(counting_client):
+    item = _create_item(BaseModel)
+    item.save()
+
+    with WriteBuffer(BaseModel, flush_interval=None) as buffer:
+        buffer.update(item, [Expr(BaseModel).field("my_int_set").set_append({3})])
+        buffer.update(item, [Expr(BaseModel).field("my_int_set").set_delete({1})])
+
+    assert len(counting_client.updates) == 2
+    assert BaseModel.get(item.item_id).my_int_set == {2, 3}
+
+    with pytest.raises(UpdateError, match="can't be combined"):
+        buffer_ = WriteBuffer(BaseModel, flush_interval=None)
+        buffer_.update(
+            item,
+            [
+                Expr(BaseModel).field("my_int_set").set_append({3}),
+                Expr(BaseModel).field("my_int_set").set_delete({1}),
+            ],
+        )
+
+
+def test_flush_on_size_applies_backpressure(counting_client):
+    items = [_create_item(BaseModel, item_id=f"item:{x}") for x in range(25)]
+
+    with WriteBuffer(BaseModel, max_keys=10, flush_interval=None) as buffer:
+        for item in items:
+            buffer.save(item)
+        assert len(buffer) == 5
+
+    assert counting_client.batch_writes == [10, 10, 5]
+    assert buffer.stats.backpressure == 2
+    assert buffer.stats.flushes == 3
+
+
+def test_flush_on_interval(counting_client):
+    item = _create_item(BaseModel)
+    buffer = WriteBuffer(BaseModel, flush_interval=0.01)
+    buffer.save(item)
+
+    deadline = time.monotonic() + 5
+    while buffer.stats.puts == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert len(buffer) == 0
+    assert BaseModel.get(item.item_id).item_id == item.item_id
+    buffer.close()
+
+
+def test_failed_writes_are_put_back(counting_client):
+    missing = _create_item(BaseModel)
+
+    buffer = WriteBuffer(BaseModel, flush_interval=None)
+    # appending to an attribute that doesn't exist fails
+    buffer.update(missing, [Expr(BaseModel).field("my_required_str_list").set_append(["a"])])
+    with pytest.raises(UpdateError):
+        buffer.flush()
+    assert len(buffer) == 1
+    assert buffer.stats.errors == 1
+    assert isinstance(buffer.last_error, UpdateError)
+
+    buffer.save(missing)
+    buffer.close()
+    assert BaseModel.get(missing.item_id).my_required_str_list == missing.my_required_str_list
+
+
+def test_closed_buffer_rejects_writes(counting_client):
+    buffer = WriteBuffer(BaseModel, flush_interval=None)
+    buffer.close()
+    with pytest.raises(InvalidStateError):
+        buffer.save(_create_item(BaseModel))
+    with pytest.raises(ValueError):
+        WriteBuffer(RangeKeyModel, flush_interval=None).save(_create_item(BaseModel))
@@ -0,0 +1,281 @@
+from decimal import Decimal
+
+import pytest
+
+from dynamantic import A, K, BatchWrite, Expr, TransactWrite
+from dynamantic.cache import ItemCache, QueryCache, item_size, normalize
+from dynamantic.exceptions import GetError
+from tests.conftest import _create_item, _save_items, GSI, GSIModel, RangeKeyModel
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class CachedModel(RangeKeyModel):
+    __item_cache__ = ItemCache(max_items=100)
+
+
+class QueryCachedModel(GSIModel):
+    __query_cache__ = QueryCache(ttl=60)
+
+
+class CountingTable:
+    def __init__(self, table) -> None:
+        self._table = table
+        self.get_items = 0
+        self.queries = 0
+
+    def __getattr__(self, name):
+        return getattr(self._table, name)
+
+    def get_item(self, **kwargs):
+        self.get_items += 1
+        return self._table.get_item(**kwargs)
+
+    def query(self, **kwargs):
+        self.queries += 1
+        return self._table.query(**kwargs)
+
+
+@pytest.fixture
+def counting_table(dynamodb, monkeypatch):
+    CachedModel.__item_cache__.clear()
+    _save_items(CachedModel)
+    table = CountingTable(CachedModel._dynamodb_table())
+    monkeypatch.setattr(CachedModel, "_dynamodb_table", classmethod(lambda cls: table))
+    return table
+
+
+def test_lru_eviction():
+    cache = ItemCache(max_items=2)
+    cache.put("a", {"id": "a"})
+    cache.put("b", {"id": "b"})
+    assert cache.lookup("a") == {"id": "a"}
+    cache.put("c", {"id": "c"})
+
+    assert cache.lookup("b") is None
+    assert cache.lookup("a") == {"id": "a"}
+    assert cache.stats.evictions == 1
+    assert (cache.stats.hits, cache.stats.misses) == (2, 1)
+
+
+def test_byte_bound():
+    cache = ItemCache(max_items=None, max_bytes=100)
+    cache.put("a", {"value": "x" * 40})
+    cache.put("b", {"value": "x" * 40})
+    cache.put("c", {"value": "x" * 40})
+    cache.put("too_big", {"value": "x" * 200})
+
+    assert len(cache) == 2
+    assert cache.size <= 100
+    assert cache.lookup("a") is None
+    assert cache.lookup("too_big") is None
+
+
+def test_ttl_expiration():
+    clock = FakeClock()
+    cache = ItemCache(ttl=10, negative_ttl=1, clock=clock)
+    cache.put("a", {"id": "a"})
+    cache.put("missing", {})
+
+    clock.now = 5
+    assert cache.lookup("a") == {"id": "a"}
+    assert cache.lookup("missing") is None
+    clock.now = 10
+    assert cache.lookup("a") is None
+    assert cache.stats.expirations == 2
+
+
+def test_negative_caching():
+    cache = ItemCache()
+    cache.put("missing", {})
+    assert cache.lookup("missing") == {}
+    assert cache.stats.negative_hits == 1
+
+    cache = ItemCache(cache_misses=False)
+    cache.put("missing", {})
+    assert cache.lookup("missing") is None
+
+
+def test_stale_put_is_ignored():
+    cache = ItemCache()
+    generation = cache.generation
+    cache.invalidate("a")
+    cache.put("a", {"id": "stale"}, generation)
+    assert cache.lookup("a") is None
+
+
+def test_item_size():
+    assert item_size({"id": "abc", "count": 10}) == 3 + (2 + 3 + 1) + (5 + 2 + 1)
+
+
+def test_get_is_cached(counting_table):
+    item1 = CachedModel.get("hello:world", "relation_id:hello:world")
+    item2 = CachedModel.get("hello:world", "relation_id:hello:world")
+
+    assert item1 == item2
+    assert item1 is not item2
+    assert counting_table.get_items == 1
+
+    # modifying a returned instance does not change the cached item
+    item1.my_str_list.append("changed")
+    assert CachedModel.get("hello:world", "relation_id:hello:world").my_str_list == item2.my_str_list
+
+    CachedModel.get("hello:world", "relation_id:hello:world", consistent_read=True)
+    assert counting_table.get_items == 2
+
+
+def test_get_missing_is_cached(counting_table):
+    for _ in range(3):
+        with pytest.raises(GetError, match="Item doesn't exist"):
+            CachedModel.get("hello:world", "doesnt_exist")
+    assert counting_table.get_items == 1
+    assert CachedModel.__item_cache__.stats.negative_hits == 2
+
+
+def test_writes_invalidate(counting_table):
+    item = CachedModel.get("hello:world", "relation_id:hello:world")
+
+    item.update([Expr(CachedModel).field("my_str").set("updated")])
+    assert CachedModel.get("hello:world", "relation_id:hello:world").my_str == "updated"
+
+    item.my_str = "saved"
+    item.save()
+    assert CachedModel.get("hello:world", "relation_id:hello:world").my_str == "saved"
+
+    item.delete()
+    with pytest.raises(GetError):
+        CachedModel.get("hello:world", "relation_id:hello:world")
+    assert counting_table.get_items == 4
+
+
+def test_batch_and_transaction_writes_invalidate(counting_table):
+    item1 = CachedModel.get("hello:world", "relation_id:hello:world")
+    item2 = CachedModel.get("foo:bar", "relation_id:foo:bar")
+
+    item1.my_str = "batch"
+    with BatchWrite() as batch:
+        batch.save(item1)
+    with TransactWrite() as transaction:
+        transaction.update(item2, [Expr(CachedModel).field("my_str").set("transaction")])
+
+    assert CachedModel.get("hello:world", "relation_id:hello:world").my_str == "batch"
+    assert CachedModel.get("foo:bar", "relation_id:foo:bar").my_str == "transaction"
+    assert counting_table.get_items == 4
+
+
+def test_batch_get_is_cached(counting_table, monkeypatch):
+    keys = [("hello:world", "relation_id:hello:world"), ("foo:bar", "relation_id:foo:bar"), ("foo:bar", "dne")]
+    CachedModel.get(*keys[0])
+
+    requested = []
+    get = CachedModel._dynamodb().batch_get_item
+
+    def batch_get_item(RequestItems):
+        requested.extend(RequestItems[CachedModel.__table_name__]["Keys"])
+        return get(RequestItems=RequestItems)
+
+    monkeypatch.setattr(CachedModel._dynamodb(), "batch_get_item", batch_get_item)
+    first = CachedModel.batch_get(keys)
+    second = CachedModel.batch_get(keys)
+
+    assert [item.my_str for item in first] == ["item1", "item2"]
+    assert [item.my_str for item in second] == ["item1", "item2"]
+    assert len(requested) == 2
+
+
+@pytest.fixture
+def query_table(dynamodb, monkeypatch):
+    QueryCachedModel.__query_cache__.clear()
+    _save_items(QueryCachedModel)
+    table = CountingTable(QueryCachedModel._dynamodb_table())
+    monkeypatch.setattr(QueryCachedModel, "_dynamodb_table", classmethod(lambda cls: table))
+    return table
+
+
+def test_normalize_conditions():
+    first = K("relation_id").begins_with("relation_id:") & A("my_int").eq(5) & A("my_str").exists()
+    second = A("my_str").exists() & (A("my_int").eq(Decimal(5)) & K("relation_id").begins_with("relation_id:"))
+    assert normalize(first) == normalize(second)
+    assert normalize(A("my_int").eq(5)) != normalize(A("my_int").eq(6))
+    assert normalize(A("my_int").eq(5)) != normalize(A("my_int").gt(5))
+
+
+def test_normalize_keeps_dynamodb_types_apart():
+    assert normalize(A("flag").eq(True)) != normalize(A("flag").eq(1))
+    assert normalize(A("flag").eq(False)) != normalize(A("flag").eq(Decimal(0)))
+    assert normalize(A("my_dict").eq({"a": 1})) != normalize(A("my_dict").eq([("a", 1)]))
+    assert normalize(A("my_int").eq(1.0)) == normalize(A("my_int").eq(1))
+
+
+def test_query_is_cached(query_table):
+    condition = K("relation_id").begins_with("relation_id:")
+    first = QueryCachedModel.query("hello:world", range_key_condition=condition, filter_condition=A("my_int").eq(5))
+    second = QueryCachedModel.query(
+        "hello:world",
+        range_key_condition=K("relation_id").begins_with("relation_id:"),
+        filter_condition=A("my_int").eq(5),
+    )
+
+    assert len(first) == 2
+    assert first == second
+    assert first[0] is not second[0]
+    assert query_table.queries == 1
+
+    QueryCachedModel.query("hello:world", range_key_condition=condition, filter_condition=A("my_int").eq(6))
+    QueryCachedModel.query("hello:world", attributes_to_get=["my_str"])
+    assert query_table.queries == 3
+
+
+def test_query_bool_and_number_are_cached_apart(query_table):
+    QueryCachedModel.query("hello:world", filter_condition=A("my_bool").eq(True))
+    assert QueryCachedModel.query("hello:world", filter_condition=A("my_bool").eq(1)) == []
+    assert query_table.queries == 2
+
+
+def test_query_cache_ttl():
+    clock = FakeClock()
+    cache = QueryCache(ttl=10, clock=clock)
+    cache.put("key", [{"id": "a"}], tags=["tag"])
+    clock.now = 10
+    assert cache.lookup("key") is None
+
+
+def test_write_invalidates_partition(query_table):
+    QueryCachedModel.query("hello:world")
+    QueryCachedModel.query("foo:bar")
+
+    item = _create_item(QueryCachedModel, item_id="hello:world", relation_id="relation_id:new")
+    item.save()
+
+    assert len(QueryCachedModel.query("hello:world")) == 3
+    assert len(QueryCachedModel.query("foo:bar")) == 1
+    assert query_table.queries == 3
+
+
+def test_write_invalidates_gsi_queries(query_table):
+    assert len(QueryCachedModel.query("item2", index=GSI)) == 2
+
+    item = QueryCachedModel.get("foo:bar", "relation_id:foo:bar")
+    item.update([Expr(QueryCachedModel).field("my_str").set("item1")])
+
+    assert len(QueryCachedModel.query("item2", index=GSI)) == 1
+    assert query_table.queries == 2
+
+
+def test_query_cache_tags():
+    cache = QueryCache()
+    cache.put("a", [], tags=["p1"])
+    cache.put("b", [], tags=["p1", "p2"])
+    cache.put("c", [], tags=["p3"])
+
+    cache.invalidate_tags(["p1"])
+    assert cache.lookup("a") is None
+    assert cache.lookup("b") is None
+    assert cache.lookup("c") == []
+    assert cache._tags == {"p3": {"c"}}
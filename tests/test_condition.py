@@ -151,3 +151,23 @@ def test_condition_expression_set_dict():
     ce = Expr(RangeKeyModel).field("my_required_dict").set({"hello": "world"})
     assert ce.update_expression == "SET my_required_dict = :my_required_dict"
     assert ce.expression_attribute_values == {":my_required_dict": {"M": {"hello": {"S": "world"}}}}
+
+
+def test_json_schema_cached_per_class():
+    assert RangeKeyModel._json_schema() is RangeKeyModel._json_schema()
+    assert RangeKeyModel._json_schema() == RangeKeyModel.model_json_schema()
+
+
+def test_json_schema_rebuilt_with_class():
+    schema = RangeKeyModel._json_schema()
+    codec = RangeKeyModel._codec()
+    RangeKeyModel.model_rebuild(force=True)
+    assert RangeKeyModel._json_schema() is not schema
+    assert RangeKeyModel._codec() is not codec
+
+
+def test_nested_field_uses_cached_schema(monkeypatch):
+    RangeKeyModel._json_schema()
+    monkeypatch.setattr(RangeKeyModel, "model_json_schema", lambda: pytest.fail("schema rebuilt"))
+    ce = Expr(RangeKeyModel).field("my_nested_model").field("deep_nested_required").field("another_field_bytes_list")
+    assert ce.index(0)._key == "0"
@@ -0,0 +1,75 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from botocore.config import Config
+
+from dynamantic.connection import ConnectionKey, ConnectionRegistry, DEFAULT_MAX_POOL_CONNECTIONS
+from tests.conftest import BaseModel, RangeKeyModel
+
+
+class PooledModel(BaseModel):
+    __botocore_config__ = Config(max_pool_connections=8, retries={"mode": "adaptive", "max_attempts": 3})
+
+
+class OtherHostModel(BaseModel):
+    __table_host__ = "http://localhost:8000"
+
+
+def _key(**kwargs) -> ConnectionKey:
+    return ConnectionKey(**({field: None for field in ConnectionKey._fields} | kwargs))
+
+
+def test_models_share_a_client(dynamodb):
+    assert BaseModel._dynamodb() is RangeKeyModel._dynamodb()
+    assert BaseModel._dynamodb_table() is BaseModel._dynamodb_table()
+    assert OtherHostModel._dynamodb() is not BaseModel._dynamodb()
+
+
+def test_default_pool_size(dynamodb):
+    assert BaseModel._dynamodb().meta.config.max_pool_connections == DEFAULT_MAX_POOL_CONNECTIONS
+
+
+def test_model_config_is_merged(dynamodb):
+    config = PooledModel._dynamodb().meta.config
+    assert config.max_pool_connections == 8
+    assert config.retries["mode"] == "adaptive"
+    assert PooledModel._dynamodb() is not BaseModel._dynamodb()
+    assert PooledModel._dynamodb_table().meta.client.meta.config.max_pool_connections == 8
+
+
+def test_concurrent_first_use_creates_one_client(dynamodb, monkeypatch):
+    registry = ConnectionRegistry()
+    created = []
+    create = registry._create
+
+    def counting_create(key):
+        created.append(key)
+        return create(key)
+
+    monkeypatch.setattr(registry, "_create", counting_create)
+    key = _key(region_name="us-east-2")
+    barrier = threading.Barrier(16)
+
+    def first_use(_):
+        barrier.wait()
+        return registry.client(key)
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        clients = list(executor.map(first_use, range(16)))
+
+    assert len(created) == 1
+    assert all(client is clients[0] for client in clients)
+
+
+def test_configure_replaces_connections(dynamodb):
+    registry = ConnectionRegistry()
+    key = _key(region_name="us-east-2")
+    client = registry.client(key)
+
+    registry.configure(max_pool_connections=128, read_timeout=5)
+    assert registry.config.max_pool_connections == 128
+    assert registry.client(key) is not client
+    assert registry.client(key).meta.config.read_timeout == 5
+
+    registry.clear()
+    assert registry.table(key, "dynamantic-test").name == "dynamantic-test"
@@ -0,0 +1,81 @@
+import io
+import json
+
+import pytest
+
+from dynamantic import Export
+from dynamantic.export import arrow_schema
+from tests.conftest import _create_item, _save_items, BaseModel, RangeKeyModel
+
+
+def test_export_jsonl(dynamodb, tmp_path):
+    _save_items(RangeKeyModel, add_count=7)
+    items = RangeKeyModel.scan()
+
+    export = Export(RangeKeyModel, batch_size=4, total_segments=1)
+    stats = export.to_jsonl(tmp_path / "items.jsonl")
+
+    lines = (tmp_path / "items.jsonl").read_text().splitlines()
+    assert sorted(lines) == sorted(item.model_dump_json() for item in items)
+    assert (stats.items, stats.batches) == (10, 3)
+
+
+def test_export_query_to_file_object(dynamodb):
+    _save_items(RangeKeyModel, add_count=3)
+    output = io.StringIO()
+
+    Export(RangeKeyModel, RangeKeyModel.iter_query("hello:world", page_size=2), batch_size=2).to_jsonl(output)
+    assert [json.loads(line)["item_id"] for line in output.getvalue().splitlines()] == ["hello:world"] * 5
+
+    with pytest.raises(ValueError):
+        Export(RangeKeyModel, [], batch_size=0)
+
+
+def test_arrow_schema():
+    pa = pytest.importorskip("pyarrow")
+    schema = arrow_schema(BaseModel)
+
+    assert schema.field("my_int").type == pa.decimal128(38, 0)
+    assert schema.field("my_decimal").type == pa.string()
+    assert schema.field("my_bytes_list").type == pa.list_(pa.binary())
+    assert schema.field("my_str_set").type == pa.list_(pa.string())
+    assert schema.field("my_datetime").type == pa.timestamp("us")
+    assert schema.field("my_dict").type == pa.string()
+    assert schema.field("my_enum").type == pa.string()
+    nested = schema.field("my_required_nested_model").type
+    assert nested.field("deep_nested_required").type == pa.struct(
+        [pa.field("another_field_bytes_list", pa.list_(pa.binary()))]
+    )
+
+
+def test_export_parquet(dynamodb, tmp_path):
+    pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    items = [_create_item(BaseModel, item_id=f"item:{x}", my_int=x) for x in range(5)]
+    for item in items:
+        item.save()
+
+    stats = Export(BaseModel, batch_size=2, total_segments=1).to_parquet(tmp_path / "items.parquet")
+    table = pq.read_table(tmp_path / "items.parquet")
+
+    assert stats.batches == 3
+    assert pq.ParquetFile(tmp_path / "items.parquet").num_row_groups == 3
+    rows = sorted(table.to_pylist(), key=lambda row: row["item_id"])
+    assert [row["my_int"] for row in rows] == list(range(5))
+    assert rows[0]["my_required_nested_model"]["sample_field"] == items[0].my_required_nested_model.sample_field
+    # numbers in maps are read back as Decimal, which is written as a string
+    assert json.loads(rows[0]["my_required_dict"]) == json.loads(BaseModel.get("item:0").model_dump_json())[
+        "my_required_dict"
+    ]
+
+
+def test_export_parquet_large_int(dynamodb, tmp_path):
+    pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    # DynamoDB numbers have up to 38 digits, well beyond int64
+    values = [2**63, -(10**37), 10**38 - 1]
+    items = [_create_item(BaseModel, item_id=f"item:{x}", my_int=value) for x, value in enumerate(values)]
+
+    Export(BaseModel, items).to_parquet(tmp_path / "items.parquet")
+    rows = pq.read_table(tmp_path / "items.parquet").to_pylist()
+    assert [row["my_int"] for row in rows] == values
@@ -0,0 +1,179 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from dynamantic import BatchWrite, GetLoader
+from dynamantic.exceptions import GetError
+from tests.conftest import _create_item, _save_items, BaseModel, RangeKeyModel
+
+
+class CountingClient:
+    def __init__(self, client) -> None:
+        self._client = client
+        self.batch_sizes = []
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+    def batch_get_item(self, RequestItems):
+        self.batch_sizes.append(sum(len(request["Keys"]) for request in RequestItems.values()))
+        return self._client.batch_get_item(RequestItems=RequestItems)
+
+
+@pytest.fixture
+def counting_client(dynamodb, monkeypatch):
+    client = CountingClient(BaseModel._dynamodb())
+    monkeypatch.setattr(BaseModel, "_dynamodb", classmethod(lambda cls: client))
+    return client
+
+
+def test_load_is_resolved_on_first_read(counting_client):
+    _save_items(RangeKeyModel)
+    loader = GetLoader()
+    item1 = loader.load(RangeKeyModel, "hello:world", "relation_id:hello:world")
+    item2 = loader.load(RangeKeyModel, "foo:bar", "relation_id:foo:bar")
+    assert counting_client.batch_sizes == []
+
+    assert item1.refresh().my_str == "item1"
+    assert item2.refresh().my_str == "item2"
+    assert counting_client.batch_sizes == [2]
+
+
+def test_load_scope_dedupes_keys(counting_client):
+    _save_items(BaseModel)
+    with GetLoader() as loader:
+        item1 = loader.load(BaseModel, "foo:bar")
+        item2 = loader.load(BaseModel, "foo:bar")
+        item3 = loader.load(BaseModel, "hello:world")
+
+    assert item1 is item2
+    assert item1.refresh().item_id == "foo:bar"
+    assert item3.refresh().item_id == "hello:world"
+    assert counting_client.batch_sizes == [2]
+    assert loader.loads == 3
+    assert loader.batches == 1
+
+
+def test_load_missing_item_raises_on_read(counting_client):
+    _save_items(BaseModel)
+    with GetLoader() as loader:
+        missing = loader.load(BaseModel, "doesnt_exist")
+        found = loader.load(BaseModel, "foo:bar")
+
+    assert found.refresh().item_id == "foo:bar"
+    with pytest.raises(GetError, match="Item doesn't exist"):
+        missing.refresh()
+
+
+def test_aget_in_scope_is_batched(counting_client):
+    items = [_create_item(BaseModel, item_id=f"item:{x}") for x in range(150)]
+    with BatchWrite() as batch:
+        for item in items:
+            batch.save(item)
+
+    async def run():
+        async with GetLoader() as loader:
+            results = await asyncio.gather(*[BaseModel.aget(item.item_id) for item in items])
+        return loader, results
+
+    loader, results = asyncio.run(run())
+    assert [result.item_id for result in results] == [item.item_id for item in items]
+    assert loader.batches == 1
+    assert sorted(counting_client.batch_sizes) == [50, 100]
+
+
+def test_aget_in_scope_missing_item(counting_client):
+    _save_items(BaseModel)
+
+    async def run():
+        with GetLoader():
+            return await asyncio.gather(
+                BaseModel.aget("foo:bar"), BaseModel.aget("doesnt_exist"), return_exceptions=True
+            )
+
+    found, missing = asyncio.run(run())
+    assert found.item_id == "foo:bar"
+    assert isinstance(missing, GetError)
+
+
+def test_aget_in_scope_passes_trusted(counting_client, monkeypatch):
+    _save_items(BaseModel)
+    return_value = BaseModel._return_value.__func__
+    trusted_args = []
+
+    def recording_return_value(cls, item, trusted=None):
+        trusted_args.append(trusted)
+        return return_value(cls, item, trusted)
+
+    monkeypatch.setattr(BaseModel, "_return_value", classmethod(recording_return_value))
+
+    async def run():
+        async with GetLoader():
+            return await asyncio.gather(
+                BaseModel.aget("foo:bar", trusted=True),
+                BaseModel.aget("foo:bar", trusted=False),
+                BaseModel.aget("foo:bar"),
+            )
+
+    results = asyncio.run(run())
+    assert [result.item_id for result in results] == ["foo:bar"] * 3
+    assert sorted(trusted_args, key=str) == [False, None, True]
+    # the key is read once for the three loads
+    assert counting_client.batch_sizes == [1]
+
+
+def test_aget_consistent_read_is_not_batched(counting_client):
+    _save_items(BaseModel)
+
+    async def run():
+        async with GetLoader() as loader:
+            item = await BaseModel.aget("foo:bar", consistent_read=True)
+        return loader, item
+
+    loader, item = asyncio.run(run())
+    assert item.item_id == "foo:bar"
+    assert loader.loads == 0
+
+
+def test_aget_successive_ticks(counting_client):
+    _save_items(BaseModel)
+
+    async def run():
+        async with GetLoader() as loader:
+            first = await BaseModel.aget("foo:bar")
+            second = await BaseModel.aget("hello:world")
+        return loader, first, second
+
+    loader, first, second = asyncio.run(run())
+    assert (first.item_id, second.item_id) == ("foo:bar", "hello:world")
+    assert loader.batches == 2
+
+
+def test_read_waits_for_batch_in_flight(counting_client, monkeypatch):
+    _save_items(BaseModel)
+    started, release = threading.Event(), threading.Event()
+    batch_get_item = counting_client.batch_get_item
+
+    def blocking_batch_get_item(RequestItems):
+        started.set()
+        release.wait(5)
+        return batch_get_item(RequestItems)
+
+    monkeypatch.setattr(counting_client, "batch_get_item", blocking_batch_get_item)
+
+    loader = GetLoader()
+    future = loader.load(BaseModel, "foo:bar")
+    missing = loader.load(BaseModel, "dne")
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        dispatched = executor.submit(future.refresh)
+        assert started.wait(5)
+        # the keys were taken by the batch in flight, reading them waits for it
+        waiting = executor.submit(missing.refresh)
+        release.set()
+        assert dispatched.result().item_id == "foo:bar"
+        with pytest.raises(GetError):
+            waiting.result()
+    assert future.refresh().item_id == "foo:bar"
+    assert counting_client.batch_sizes == [2]
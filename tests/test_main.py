@@ -1,13 +1,16 @@
 import datetime
 import pytest
 from decimal import Decimal
+from typing import Annotated, Any, Dict, List, Set
 
-from boto3.dynamodb.types import Binary
+from boto3.dynamodb.types import Binary, TypeSerializer
+from pydantic import BaseModel as PydanticBaseModel, PlainSerializer, field_serializer, model_serializer
 
+from dynamantic import LazyItem
 from dynamantic.exceptions import TableError
 from dynamantic.types import format_float, dynamodb_compatible_value, serialize_map
 
-from tests.conftest import BaseModel, MyNestedModel, SingleFieldModel, EnumField
+from tests.conftest import _create_item, BaseModel, MyNestedModel, RangeKeyModel, SingleFieldModel, EnumField
 
 
 def test_pydantic_serialize(model_instance: BaseModel):
@@ -243,6 +246,75 @@ def test_serializer_optional_nested_model_list(serialized):
     assert serialized.get("my_nested_model_list")[0].__class__ == dict
 
 
+def _sorted_sets(value):
+    if isinstance(value, dict):
+        return {k: sorted(v) if k in ("SS", "NS", "BS") else _sorted_sets(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_sorted_sets(v) for v in value]
+    return value
+
+
+def test_serialize_wire_matches_type_serializer(model_instance: BaseModel):
+    expected = {k: TypeSerializer().serialize(v) for k, v in model_instance.serialize().items()}
+    assert _sorted_sets(model_instance._serialize_wire()) == _sorted_sets(expected)
+
+
+def test_serialize_wire_values(model_instance: BaseModel):
+    item = model_instance._serialize_wire()
+    assert item["my_float"] == {"N": "2.5"}
+    assert item["my_enum"] == {"S": "ONE"}
+    assert item["my_tuple"] == {"L": [{"N": "2.5"}, {"S": "foobar"}]}
+    assert item["my_bytes_set"]["L"][0].keys() == {"B"}
+    assert item["my_nested_model"]["M"]["nested_dict"] == {"NULL": True}
+    assert "relation_id" not in item
+
+
+def test_primary_key(model_instance: BaseModel):
+    assert model_instance._primary_key() == {"item_id": {"S": model_instance.item_id}}
+
+
+class Money(PydanticBaseModel):
+    cents: int
+
+    @field_serializer("cents")
+    def serialize_cents(self, cents: int) -> str:
+        return f"{cents / 100:.2f}"
+
+
+class SerializerModel(SingleFieldModel):
+    __hash_key__ = "single_str"
+
+    price: Money
+    tags: Set[str]
+    code: Annotated[int, PlainSerializer(lambda code: f"#{code}")]
+
+    @field_serializer("tags")
+    def serialize_tags(self, tags: Set[str]) -> List[str]:
+        return sorted(tags)
+
+
+def test_serialize_wire_field_serializer():
+    item = SerializerModel(single_str="hello", price=Money(cents=1250), tags={"b", "a"}, code=7)
+    expected = {k: TypeSerializer().serialize(v) for k, v in item.serialize().items()}
+    assert item._serialize_wire() == expected
+    assert item._serialize_wire()["tags"] == {"L": [{"S": "a"}, {"S": "b"}]}
+    assert item._serialize_wire()["price"] == {"M": {"cents": {"S": "12.50"}}}
+    assert item._serialize_wire()["code"] == {"S": "#7"}
+    assert item._primary_key() == {"single_str": {"S": "hello"}}
+
+
+class DumpedModel(SingleFieldModel):
+    __hash_key__ = "single_str"
+
+    @model_serializer
+    def serialize_model(self) -> Dict[str, Any]:
+        return {"single_str": self.single_str.upper()}
+
+
+def test_serialize_wire_model_serializer():
+    assert DumpedModel(single_str="hello")._serialize_wire() == {"single_str": {"S": "HELLO"}}
+
+
 #
 # ██████╗ ███████╗███████╗███████╗██████╗ ██╗ █████╗ ██╗     ██╗███████╗███████╗██████╗
 # ██╔══██╗██╔════╝██╔════╝██╔════╝██╔══██╗██║██╔══██╗██║     ██║╚══███╔╝██╔════╝██╔══██╗
@@ -387,6 +459,20 @@ def test_deserialzer_optional_nested_model_list(deserialized: BaseModel):
     assert deserialized.my_nested_model_list[0].__class__ == MyNestedModel
 
 
+def test_codec_compiled_once_per_class():
+    assert BaseModel._codec() is BaseModel._codec()
+    assert RangeKeyModel._codec() is not BaseModel._codec()
+
+
+def test_codec_any_field():
+    values = BaseModel.deserialize({"my_nested_data": [{"a": "b"}, "c"], "my_int": Decimal(3)})
+    assert values == {"my_nested_data": [{"a": "b"}, "c"], "my_int": 3}
+
+
+def test_codec_unknown_attribute():
+    assert BaseModel.deserialize({"not_a_field": "value"}) == {"not_a_field": "value"}
+
+
 #
 # ██████╗ ██╗   ██╗███╗   ██╗ █████╗ ███╗   ███╗ ██████╗ ██████╗ ██████╗     ████████╗██╗   ██╗██████╗ ███████╗███████╗
 # ██╔══██╗╚██╗ ██╔╝████╗  ██║██╔══██╗████╗ ████║██╔═══██╗██╔══██╗██╔══██╗    ╚══██╔══╝╚██╗ ██╔╝██╔══██╗██╔════╝██╔════╝
@@ -471,3 +557,102 @@ def test_dynamodb_type_map():
 # CUSTOM
 def test_dynamodb_type_datetime():
     assert BaseModel._dynamodb_type("my_datetime") == "S"
+
+
+def test_attribute_types_table():
+    attribute_types = BaseModel._codec().attribute_types
+    assert attribute_types["item_id"] == "S"
+    assert attribute_types["my_int_set"] == "NS"
+    with pytest.raises(TypeError):
+        attribute_types["item_id"] = "N"
+
+
+def test_key_uses_attribute_types():
+    assert RangeKeyModel._key("hash", "range") == {"item_id": {"S": "hash"}, "relation_id": {"S": "range"}}
+
+
+class TrustedModel(BaseModel):
+    __trusted_reads__ = True
+
+
+def test_trusted_get_matches_validated_get(dynamodb):
+    item = _create_item(BaseModel)
+    item.save()
+
+    validated = BaseModel.get(item.item_id)
+    trusted = BaseModel.get(item.item_id, trusted=True)
+    assert trusted == validated
+    assert trusted.my_required_nested_model.__class__ == MyNestedModel
+    assert trusted.my_required_nested_model_list[0].__class__ == MyNestedModel
+    assert trusted.model_fields_set == validated.model_fields_set
+
+
+def test_trusted_reads(dynamodb):
+    items = [_create_item(BaseModel, item_id=f"item:{x}") for x in range(3)]
+    for item in items:
+        item.save()
+
+    def validated(item):
+        return TrustedModel.get(item.item_id, trusted=False)
+
+    assert TrustedModel.get(items[0].item_id) == validated(items[0])
+    assert TrustedModel.query(items[0].item_id) == [validated(items[0])]
+    assert sorted(TrustedModel.scan(), key=lambda item: item.item_id) == [validated(item) for item in items]
+    assert TrustedModel.batch_get([item.item_id for item in items]) == [validated(item) for item in items]
+    assert list(TrustedModel.parallel_scan(total_segments=2)) != []
+
+
+
+def test_lazy_get_converts_attributes_on_read(dynamodb):
+    item = _create_item(BaseModel, my_bytes_list=[b"a", b"b"], my_nested_model_list=None)
+    item.save()
+    validated = BaseModel.get(item.item_id)
+
+    lazy = BaseModel.get(item.item_id, lazy=True)
+    assert isinstance(lazy, LazyItem)
+    assert lazy.model_fields_loaded == frozenset()
+    assert lazy.my_bytes_list == [b"a", b"b"]
+    assert lazy.my_required_nested_model == validated.my_required_nested_model
+    assert lazy.my_required_nested_model_list[0].__class__ == MyNestedModel
+    assert lazy.my_nested_model_list is None
+    assert lazy.model_fields_loaded == {
+        "my_bytes_list",
+        "my_required_nested_model",
+        "my_required_nested_model_list",
+        "my_nested_model_list",
+    }
+    # converted once, the same value is returned on every read
+    assert lazy.my_required_nested_model is lazy.my_required_nested_model
+    assert {name: getattr(lazy, name) for name in BaseModel.model_fields} == dict(validated)
+    assert lazy.model_load() == validated
+
+    with pytest.raises(AttributeError):
+        lazy.my_str = "changed"
+    with pytest.raises(AttributeError):
+        lazy.not_a_field
+
+
+def test_lazy_query_and_scan(dynamodb):
+    items = [_create_item(RangeKeyModel, item_id="lazy", relation_id=f"item:{x}", my_int=x) for x in range(3)]
+    for item in items:
+        item.save()
+
+    lazy_items = RangeKeyModel.query("lazy", lazy=True)
+    assert [item.my_int for item in lazy_items] == [0, 1, 2]
+    assert [item.model_load() for item in lazy_items] == RangeKeyModel.query("lazy")
+    assert {item.relation_id for item in RangeKeyModel.scan(lazy=True)} >= {"item:0", "item:1", "item:2"}
+
+
+def test_lazy_item_missing_attributes(dynamodb):
+    lazy = LazyItem(SingleFieldModel, {})
+    with pytest.raises(AttributeError, match="single_str"):
+        lazy.single_str
+    assert lazy.model_fields_loaded == frozenset()
+
+    lazy = LazyItem(BaseModel, {"item_id": {"S": "item"}})
+    assert lazy.my_str is None
+
+    with pytest.raises(ValueError, match="can't be combined"):
+        RangeKeyModel.query("lazy", lazy=True, raw="wire")
+    with pytest.raises(ValueError, match="can't be combined"):
+        RangeKeyModel.iter_scan(lazy=True, raw=True)
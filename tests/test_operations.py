@@ -1,8 +1,18 @@
+import datetime
+
 import pytest
+from pydantic import BaseModel as PydanticBaseModel
 
-from dynamantic.main import Expr
+from dynamantic.main import Expr, PreparedUpdate
 from dynamantic.attrs import A
-from dynamantic.exceptions import PutError, UpdateError, GetError, DeleteError
+from dynamantic.exceptions import (
+    AttributeTypeInvalidError,
+    InvalidStateError,
+    PutError,
+    UpdateError,
+    GetError,
+    DeleteError,
+)
 
 from tests.conftest import BaseModel, RangeKeyModel, _create_item
 
@@ -71,3 +81,288 @@ def test_delete_item_fails(dynamodb):
     item = _create_item(RangeKeyModel, relation_id="range_key")
     with pytest.raises(DeleteError):
         item.delete(condition_expression=A("doesnt_exist").lt(3))
+
+
+def test_update_item_reconciles_without_refresh(dynamodb):
+    item = _create_item(RangeKeyModel, relation_id="range_key")
+    item.save()
+    item.update(actions=[Expr(RangeKeyModel).field("my_int").set_add(2)], refresh=False)
+    assert item.my_int == 7
+    assert RangeKeyModel.get(item.item_id, "range_key").my_int == 7
+
+
+def test_update_item_with_refresh(dynamodb):
+    item = _create_item(RangeKeyModel, relation_id="range_key")
+    item.save(refresh=True)
+    item.update(actions=[Expr(RangeKeyModel).field("my_str").set("updated")], refresh=True)
+    assert item.my_str == "updated"
+
+
+def test_save_does_not_read_back(dynamodb, monkeypatch):
+    item = _create_item(BaseModel)
+
+    def fail_get(*args, **kwargs):
+        raise AssertionError("save should not read the item back")
+
+    monkeypatch.setattr(BaseModel, "get", fail_get)
+    item.save()
+    item.update(actions=[Expr(BaseModel).field("my_int").set(8)])
+    assert item.my_int == 8
+
+
+
+def test_update_item_mixed_actions(dynamodb):
+    item = _create_item(BaseModel, my_str="remove me")
+    item.save()
+    item.update(
+        actions=[
+            Expr(BaseModel).field("my_int").set(3),
+            Expr(BaseModel).field("my_float").set_add(1.5),
+            Expr(BaseModel).field("my_str").remove(),
+            Expr(BaseModel).field("my_int_set").set_append({3}),
+            Expr(BaseModel).field("my_str_set").set_delete({"a", "b", "c"}),
+        ]
+    )
+    assert (item.my_int, item.my_str, item.my_int_set, item.my_str_set) == (3, None, {1, 2, 3}, None)
+
+    fetched = BaseModel.get(item.item_id)
+    assert fetched == item
+    assert fetched.my_int == 3
+    assert fetched.my_float == item.my_float
+    assert fetched.my_str is None
+    assert fetched.my_int_set == {1, 2, 3}
+    assert fetched.my_str_set is None
+
+
+class RecordingClient:
+    def __init__(self, client) -> None:
+        self._client = client
+        self.updates = []
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+    def update_item(self, **kwargs):
+        self.updates.append(kwargs)
+        return self._client.update_item(**kwargs)
+
+
+@pytest.fixture
+def recording_client(dynamodb, monkeypatch):
+    client = RecordingClient(BaseModel._dynamodb())
+    monkeypatch.setattr(BaseModel, "_dynamodb", classmethod(lambda cls: client))
+    return client
+
+
+@pytest.fixture
+def partial_save(recording_client, monkeypatch):
+    monkeypatch.setattr(BaseModel, "__partial_save__", True)
+    return recording_client
+
+
+def test_partial_save_requires_opt_in(recording_client):
+    item = _create_item(BaseModel)
+    item.save()
+    fetched = BaseModel.get(item.item_id)
+    # without partial saves, reads and writes don't keep a snapshot of the item
+    assert fetched._snapshot() is None
+    assert item._snapshot() is None
+    with pytest.raises(InvalidStateError):
+        fetched.save(partial=True)
+
+
+def test_partial_save_sets_changed_attributes(partial_save):
+    item = _create_item(BaseModel, my_str="before", my_int=1)
+    item.save()
+
+    item.my_str = "after"
+    item.save(partial=True)
+
+    (update,) = partial_save.updates
+    assert update["UpdateExpression"] == "SET #u0 = :u0"
+    assert update["ExpressionAttributeNames"]["#u0"] == "my_str"
+    assert update["ExpressionAttributeValues"] == {":u0": {"S": "after"}}
+
+    fetched = BaseModel.get(item.item_id)
+    assert fetched.my_str == "after"
+    assert fetched.my_int == 1
+
+
+def test_partial_save_removes_cleared_attributes(partial_save):
+    item = _create_item(BaseModel, my_str="before")
+    item.save()
+
+    item.my_str = None
+    item.save(partial=True)
+
+    (update,) = partial_save.updates
+    assert update["UpdateExpression"] == "REMOVE #u0"
+    assert "ExpressionAttributeValues" not in update
+    assert BaseModel.get(item.item_id).my_str is None
+
+
+def test_partial_save_set_deltas(partial_save):
+    item = _create_item(BaseModel, my_required_str_set={"a", "b"})
+    item.save()
+
+    item.my_required_str_set.add("c")
+    item.save(partial=True)
+    item.my_required_str_set.discard("a")
+    item.save(partial=True)
+
+    added, removed = partial_save.updates
+    assert added["UpdateExpression"] == "ADD #u0 :u0"
+    assert added["ExpressionAttributeValues"] == {":u0": {"SS": ["c"]}}
+    assert removed["UpdateExpression"] == "DELETE #u0 :u0"
+    assert removed["ExpressionAttributeValues"] == {":u0": {"SS": ["a"]}}
+    assert BaseModel.get(item.item_id).my_required_str_set == {"b", "c"}
+
+
+def test_partial_save_without_changes(partial_save):
+    item = _create_item(BaseModel)
+    item.save()
+    fetched = BaseModel.get(item.item_id)
+
+    fetched.save(partial=True)
+    fetched.my_required_nested_model.sample_field = fetched.my_required_nested_model.sample_field
+    fetched.save(partial=True)
+    assert partial_save.updates == []
+
+
+def test_snapshot_is_not_part_of_the_instance(partial_save):
+    item = _create_item(BaseModel)
+    item.save()
+    fetched = BaseModel.get(item.item_id)
+    assert fetched._snapshot() is not None
+
+    assert BaseModel.__eq__ is PydanticBaseModel.__eq__
+    assert fetched == BaseModel(**fetched.model_dump())
+    assert fetched.__pydantic_private__ is None
+    assert "__dynamantic_snapshot__" not in fetched.model_dump()
+
+
+def test_partial_save_of_fetched_item(partial_save):
+    item = _create_item(BaseModel, my_int=1)
+    item.save()
+    fetched = BaseModel.get(item.item_id)
+
+    fetched.my_int = 2
+    fetched.my_required_dict["added"] = "value"
+    fetched.save(partial=True)
+
+    (update,) = partial_save.updates
+    assert sorted(update["ExpressionAttributeNames"].values()) == ["item_id", "my_int", "my_required_dict"]
+    fetched = BaseModel.get(item.item_id)
+    assert fetched.my_int == 2
+    assert fetched.my_required_dict["added"] == "value"
+
+
+def test_partial_save_of_new_item_puts_it(partial_save):
+    item = _create_item(BaseModel)
+    item.save(partial=True)
+    assert partial_save.updates == []
+    assert BaseModel.get(item.item_id).item_id == item.item_id
+
+
+def test_partial_save_of_deleted_item_fails(partial_save):
+    item = _create_item(BaseModel)
+    item.save()
+    BaseModel.get(item.item_id).delete()
+
+    item.my_str = "changed"
+    with pytest.raises(PutError):
+        item.save(partial=True)
+
+    item.save(partial=True)
+    assert BaseModel.get(item.item_id).my_str == "changed"
+
+
+def test_prepared_update(recording_client):
+    items = [_create_item(BaseModel, item_id=f"item:{x}", my_int=x) for x in range(3)]
+    for item in items:
+        item.save()
+
+    increment = PreparedUpdate(
+        [Expr(BaseModel).field("my_int").set_add(1), Expr(BaseModel).field("my_str").set("")],
+        condition_expression=A("my_int").gte(0),
+    )
+    for item in items:
+        increment.execute(item, 10, f"seen {item.item_id}")
+
+    assert [item.my_int for item in items] == [10, 11, 12]
+    assert [BaseModel.get(item.item_id).my_str for item in items] == [f"seen {item.item_id}" for item in items]
+    assert len({update["UpdateExpression"] for update in recording_client.updates}) == 1
+
+
+def test_prepared_update_template_values(recording_client):
+    item = _create_item(BaseModel, my_int=1, my_str="remove me")
+    item.save()
+
+    prepared = PreparedUpdate([Expr(BaseModel).field("my_int").set_add(2), Expr(BaseModel).field("my_str").remove()])
+    prepared.execute(item)
+    assert (item.my_int, item.my_str) == (3, None)
+    fetched = BaseModel.get(item.item_id)
+    assert (fetched.my_int, fetched.my_str) == (3, None)
+
+
+def test_prepared_update_condition_values(recording_client):
+    item = _create_item(BaseModel, my_int=1)
+    item.save()
+
+    prepared = PreparedUpdate([Expr(BaseModel).field("my_int").set(0)], condition_expression=A("my_int").eq(1))
+    with pytest.raises(UpdateError):
+        prepared.execute(item, 5, condition_values=[2])
+    prepared.execute(item, 5, condition_values=[1])
+    assert BaseModel.get(item.item_id).my_int == 5
+
+
+def test_prepared_update_checks_bound_values(recording_client):
+    prepared = PreparedUpdate([Expr(BaseModel).field("my_int").set(0)])
+    with pytest.raises(AttributeTypeInvalidError):
+        prepared.bind("not a number")
+    with pytest.raises(ValueError):
+        prepared.bind(1, 2)
+    assert prepared.bind(7)["ExpressionAttributeValues"] == {":u0": {"N": "7"}}
+    assert recording_client.updates == []
+
+
+def test_prepared_update_checks_values_against_fields():
+    prepared = PreparedUpdate(
+        [Expr(BaseModel).field("my_int").set(0), Expr(BaseModel).field("my_date").set(datetime.date(2024, 1, 1))]
+    )
+    with pytest.raises(AttributeTypeInvalidError):
+        # the DynamoDB type matches, the field is an int
+        prepared.bind(1.5)
+    with pytest.raises(AttributeTypeInvalidError):
+        prepared.bind(1, "not a date")
+    assert prepared.bind(1, "2024-02-01")["ExpressionAttributeValues"][":u1"] == {"S": "2024-02-01"}
+
+
+def test_prepared_update_checks_condition_values():
+    prepared = PreparedUpdate(
+        [Expr(BaseModel).field("my_int").set(0)],
+        condition_expression=A("my_int").between(0, 10) & A("my_str").begins_with("a") & A("my_float").is_in([1.5]),
+    )
+    with pytest.raises(AttributeTypeInvalidError):
+        prepared.bind(1, condition_values=["low", 10, "b", 2.5])
+    with pytest.raises(AttributeTypeInvalidError):
+        prepared.bind(1, condition_values=[0, 10, "b", "not a float"])
+    values = prepared.bind(1, condition_values=[0, 20, "b", 2.5])["ExpressionAttributeValues"]
+    assert list(values.values())[1:] == [{"N": "0"}, {"N": "20"}, {"S": "b"}, {"N": "2.5"}]
+
+
+@pytest.mark.parametrize(
+    "condition, condition_values",
+    [
+        # an attribute the model doesn't declare, such as an optimistic lock counter
+        (A("version").eq(3), ["any value"]),
+        # compared to another attribute, there is no value to check
+        (A("my_int").eq(A("my_int")), []),
+        # an int is a valid number
+        (A("my_float").gt(1), [2]),
+    ],
+)
+def test_prepared_update_accepts_conditions_update_accepts(condition, condition_values):
+    prepared = PreparedUpdate([Expr(BaseModel).field("my_int").set(0)], condition_expression=condition)
+    params = prepared.bind(1, condition_values=condition_values)
+    assert params["ConditionExpression"] == BaseModel._build_expression(condition)[0]
@@ -122,3 +122,81 @@ def test_query_lsindex_single(dynamodb):
         range_key_condition=K("relation_id").begins_with("relation_id:"),
     )
     assert len(results) == 1
+
+
+def test_iter_query_pages(dynamodb):
+    _save_items(RangeKeyModel, add_count=5)
+    results = RangeKeyModel.iter_query("hello:world", page_size=2)
+    items = list(results)
+    assert len(items) == 7
+    assert results.page_count == 4
+    assert results.last_evaluated_key is None
+
+
+def test_iter_query_limit(dynamodb):
+    _save_items(RangeKeyModel, add_count=5)
+    items = list(RangeKeyModel.iter_query("hello:world", limit=3, page_size=2))
+    assert len(items) == 3
+
+
+def test_iter_query_first(dynamodb):
+    _save_items(RangeKeyModel)
+    assert RangeKeyModel.iter_query("foo:bar").first().my_str == "item2"
+    assert RangeKeyModel.iter_query("dne").first() is None
+
+
+def test_iter_query_take_and_resume(dynamodb):
+    _save_items(RangeKeyModel, add_count=5)
+    results = RangeKeyModel.iter_query("hello:world", page_size=2)
+    first_items = results.take(3)
+    assert len(first_items) == 3
+    assert results.last_evaluated_key is not None
+
+    remaining = list(RangeKeyModel.iter_query("hello:world", last_evaluated_key=results.last_evaluated_key))
+    assert len(remaining) == 4
+    seen = {item.relation_id for item in first_items}
+    assert all(item.relation_id not in seen for item in remaining)
+
+
+def test_iter_query_pages_of_models(dynamodb):
+    _save_items(RangeKeyModel, add_count=5)
+    pages = list(RangeKeyModel.iter_query("hello:world", page_size=3).pages())
+    assert [len(page) for page in pages] == [3, 3, 1]
+    assert isinstance(pages[0][0], RangeKeyModel)
+
+
+def test_iter_query_gsi_resume(dynamodb):
+    _save_items(GSIModel, add_count=5)
+    results = GSIModel.iter_query("item2", index=GSI, page_size=1)
+    first_item = results.first()
+    remaining = list(GSIModel.iter_query("item2", index=GSI, last_evaluated_key=results.last_evaluated_key))
+    assert len(remaining) == 1
+    assert remaining[0].item_id != first_item.item_id
+
+
+def test_query_raw(dynamodb):
+    _save_items(RangeKeyModel, add_count=15)
+    models = RangeKeyModel.query("hello:world", filter_condition=A("my_int").gte(10))
+    items = RangeKeyModel.query("hello:world", filter_condition=A("my_int").gte(10), raw=True)
+    assert all(isinstance(item, dict) for item in items)
+    assert [RangeKeyModel.from_raw(item) for item in items] == models
+
+    wire_items = RangeKeyModel.query(
+        "hello:world",
+        range_key_condition=K("relation_id").begins_with("relation_id:"),
+        filter_condition=A("my_int").gte(10),
+        raw="wire",
+    )
+    assert {"S": "hello:world"} == wire_items[0]["item_id"]
+    assert [RangeKeyModel.from_raw(item, wire=True) for item in wire_items] == models
+
+
+def test_iter_query_raw_wire_resume(dynamodb):
+    _save_items(RangeKeyModel, add_count=5)
+    results = RangeKeyModel.iter_query("hello:world", page_size=2, raw="wire")
+    first_items = results.take(3)
+    remaining = list(
+        RangeKeyModel.iter_query("hello:world", last_evaluated_key=results.last_evaluated_key, raw="wire")
+    )
+    assert len(first_items + remaining) == 7
+    assert all("S" in item["relation_id"] for item in first_items + remaining)
@@ -1,7 +1,8 @@
 import pytest
 
-from dynamantic.exceptions import InvalidStateError
+from dynamantic.exceptions import InvalidStateError, ScanError
 from dynamantic import A
+from dynamantic.pagination import ParallelScan, ResultIterator
 from tests.conftest import _save_items, BaseModel, RangeKeyModel, GSI, GSIModel
 
 
@@ -35,3 +36,105 @@ def test_scan_gsi_with_filter_raises_invalid_state(dynamodb):
     _save_items(RangeKeyModel, add_count=50)
     with pytest.raises(InvalidStateError, match="Index provided but index does not exist for model."):
         RangeKeyModel.scan(index=GSI, filter_condition=A("my_int").gte(47))
+
+
+def test_iter_scan_pages(dynamodb):
+    _save_items(RangeKeyModel, add_count=10)
+    results = RangeKeyModel.iter_scan(page_size=4)
+    assert len(list(results)) == 13
+    assert results.page_count == 4
+
+
+def test_iter_scan_take_and_resume(dynamodb):
+    _save_items(RangeKeyModel, add_count=10)
+    results = RangeKeyModel.iter_scan(page_size=4)
+    assert len(results.take(5)) == 5
+    remaining = RangeKeyModel.iter_scan(last_evaluated_key=results.last_evaluated_key)
+    assert len(list(remaining)) == 8
+
+
+
+def _segmented_scan(total_items: int):
+    """A scan operation honouring Segment/TotalSegments, which moto does not implement."""
+
+    def scan(Segment, TotalSegments, Limit=None, ExclusiveStartKey=None):
+        items = [{"i": i} for i in range(total_items) if i % TotalSegments == Segment]
+        if ExclusiveStartKey:
+            items = [item for item in items if item["i"] > ExclusiveStartKey["i"]]
+        page = items[:Limit] if Limit else items
+        result = {"Items": page, "ScannedCount": len(page)}
+        if Limit and len(items) > Limit:
+            result["LastEvaluatedKey"] = {"i": page[-1]["i"]}
+        return result
+
+    def factory(segment, start_key):
+        return ResultIterator(
+            scan,
+            {"Segment": segment, "TotalSegments": 4},
+            lambda item: item["i"],
+            ["i"],
+            page_size=3,
+            last_evaluated_key=start_key,
+        )
+
+    return factory
+
+
+def test_parallel_scan(dynamodb):
+    _save_items(RangeKeyModel, add_count=10)
+    results = RangeKeyModel.parallel_scan(total_segments=1, page_size=4)
+    items = list(results)
+    assert len(items) == 13
+    assert results.resume_tokens == {}
+
+
+def test_parallel_scan_merges_segments():
+    results = ParallelScan(_segmented_scan(50), total_segments=4)
+    assert sorted(results) == list(range(50))
+    assert results.resume_tokens == {}
+
+
+def test_parallel_scan_segment_callback():
+    seen = {}
+
+    def callback(segment, page):
+        seen[segment] = seen.get(segment, 0) + len(page)
+
+    items = list(ParallelScan(_segmented_scan(50), total_segments=4, max_workers=2, segment_callback=callback))
+    assert seen == {0: 13, 1: 13, 2: 12, 3: 12}
+    assert len(items) == 50
+
+
+def test_parallel_scan_stop_early():
+    results = ParallelScan(_segmented_scan(1000), total_segments=4, max_buffered_pages=1)
+    assert len([item for _, item in zip(range(10), results)]) == 10
+
+
+def test_parallel_scan_resume_failed_segment():
+    calls = []
+
+    def fail_segment_one(segment, _):
+        calls.append(segment)
+        if segment == 1 and calls.count(1) == 2:
+            raise RuntimeError("throttled")
+
+    results = ParallelScan(_segmented_scan(50), total_segments=4, segment_callback=fail_segment_one)
+    items = []
+    with pytest.raises(ScanError, match="Failed to scan 1 segment.*"):
+        for item in results:
+            items.append(item)
+
+    assert results.resume_tokens == {1: {"i": 9}}
+    items.extend(ParallelScan(_segmented_scan(50), total_segments=4, resume_tokens=results.resume_tokens))
+    assert sorted(items) == list(range(50))
+
+
+def test_scan_raw(dynamodb):
+    _save_items(RangeKeyModel, add_count=5)
+    models = sorted(RangeKeyModel.scan(filter_condition=A("my_int").lt(3)), key=lambda item: item.relation_id)
+    items = RangeKeyModel.scan(filter_condition=A("my_int").lt(3), raw=True)
+    assert sorted((RangeKeyModel.from_raw(item) for item in items), key=lambda item: item.relation_id) == models
+
+    wire_items = list(RangeKeyModel.parallel_scan(total_segments=1, filter_condition=A("my_int").lt(3), raw="wire"))
+    assert all(item["my_int"]["N"] in ("0", "1", "2") for item in wire_items)
+    assert len(wire_items) == len(models)
@@ -0,0 +1,128 @@
+import asyncio
+
+import pytest
+
+from dynamantic import BatchWrite, Expr, Session, TransactGet, TransactWrite
+from dynamantic.exceptions import GetError
+from tests.conftest import _create_item, _save_items, BaseModel, RangeKeyModel
+
+
+class CountingTable:
+    def __init__(self, table) -> None:
+        self._table = table
+        self.get_items = 0
+
+    def __getattr__(self, name):
+        return getattr(self._table, name)
+
+    def get_item(self, **kwargs):
+        self.get_items += 1
+        return self._table.get_item(**kwargs)
+
+
+@pytest.fixture
+def counting_table(dynamodb, monkeypatch):
+    _save_items(RangeKeyModel)
+    table = CountingTable(RangeKeyModel._dynamodb_table())
+    monkeypatch.setattr(RangeKeyModel, "_dynamodb_table", classmethod(lambda cls: table))
+    return table
+
+
+def test_get_returns_loaded_instance(counting_table):
+    with Session() as session:
+        item1 = RangeKeyModel.get("hello:world", "relation_id:hello:world")
+        item2 = RangeKeyModel.get("hello:world", "relation_id:hello:world")
+        assert item1.refresh() is item1
+
+    assert item1 is item2
+    assert counting_table.get_items == 1
+    assert (session.hits, session.misses) == (2, 1)
+    assert RangeKeyModel.get("hello:world", "relation_id:hello:world") is not item1
+
+
+def test_consistent_read_updates_loaded_instance(counting_table):
+    with Session():
+        item = RangeKeyModel.get("hello:world", "relation_id:hello:world")
+        item.my_str = "local change"
+        assert RangeKeyModel.get("hello:world", "relation_id:hello:world", consistent_read=True) is item
+
+    assert item.my_str == "item1"
+    assert counting_table.get_items == 2
+
+
+def test_read_after_write(counting_table):
+    with Session():
+        item = _create_item(RangeKeyModel, item_id="new", relation_id="range_key")
+        item.save()
+        assert RangeKeyModel.get("new", "range_key") is item
+
+        item.update([Expr(RangeKeyModel).field("my_str").set("updated")])
+        assert RangeKeyModel.get("new", "range_key").my_str == "updated"
+
+        item.delete()
+        with pytest.raises(GetError, match="Item doesn't exist"):
+            RangeKeyModel.get("new", "range_key")
+
+    assert counting_table.get_items == 0
+
+
+def test_batch_write_is_tracked(counting_table):
+    with Session() as session:
+        item = _create_item(RangeKeyModel, item_id="batch", relation_id="range_key")
+        existing = RangeKeyModel.get("foo:bar", "relation_id:foo:bar")
+        with BatchWrite() as batch:
+            batch.save(item)
+            batch.delete(existing)
+
+        assert item in session
+        assert RangeKeyModel.get("batch", "range_key") is item
+        with pytest.raises(GetError):
+            RangeKeyModel.get("foo:bar", "relation_id:foo:bar")
+
+    assert counting_table.get_items == 1
+
+
+def test_transact_write_is_tracked(counting_table):
+    with Session():
+        item = _create_item(RangeKeyModel, item_id="transact", relation_id="range_key")
+        existing = RangeKeyModel.get("hello:world", "relation_id:hello:world")
+        with TransactWrite() as transaction:
+            transaction.save(item)
+            transaction.update(existing, [Expr(RangeKeyModel).field("my_str").set("updated")])
+
+        assert RangeKeyModel.get("transact", "range_key") is item
+        # updates are read again since the new values are not returned
+        assert RangeKeyModel.get("hello:world", "relation_id:hello:world").my_str == "updated"
+
+    assert counting_table.get_items == 2
+
+
+def test_transact_get_results_are_tracked(counting_table):
+    with Session():
+        with TransactGet() as transaction:
+            future = transaction.get(RangeKeyModel, "foo:bar", "relation_id:foo:bar")
+        assert RangeKeyModel.get("foo:bar", "relation_id:foo:bar") is future.refresh()
+
+    assert counting_table.get_items == 0
+
+
+def test_async_session(counting_table):
+    async def run():
+        async with Session():
+            item1 = await RangeKeyModel.aget("hello:world", "relation_id:hello:world")
+            item2 = await RangeKeyModel.aget("hello:world", "relation_id:hello:world")
+        return item1, item2
+
+    item1, item2 = asyncio.run(run())
+    assert item1 is item2
+    assert counting_table.get_items == 1
+
+
+def test_session_hash_key_only(dynamodb):
+    _save_items(BaseModel)
+    with Session() as session:
+        item = BaseModel.get("foo:bar")
+        assert BaseModel.get("foo:bar") is item
+        assert len(session) == 1
+        session.discard(item)
+        assert BaseModel.get("foo:bar") is not item
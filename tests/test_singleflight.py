@@ -0,0 +1,165 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from dynamantic import main
+from dynamantic.exceptions import GetError
+from dynamantic.singleflight import SingleFlight
+from tests.conftest import _save_items, RangeKeyModel
+
+
+class FlightModel(RangeKeyModel):
+    __single_flight__ = True
+
+
+class NoFlightModel(RangeKeyModel):
+    pass
+
+
+class BlockingTable:
+    def __init__(self, table) -> None:
+        self._table = table
+        self.release = threading.Event()
+        self.get_items = 0
+        self.queries = 0
+
+    def __getattr__(self, name):
+        return getattr(self._table, name)
+
+    def get_item(self, **kwargs):
+        self.get_items += 1
+        self.release.wait(5)
+        return self._table.get_item(**kwargs)
+
+    def query(self, **kwargs):
+        self.queries += 1
+        self.release.wait(5)
+        return self._table.query(**kwargs)
+
+
+def _blocking_table(model, monkeypatch):
+    _save_items(model)
+    table = BlockingTable(model._dynamodb_table())
+    monkeypatch.setattr(model, "_dynamodb_table", classmethod(lambda cls: table))
+    return table
+
+
+def _wait_for(condition):
+    deadline = time.monotonic() + 5
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.001)
+    assert condition()
+
+
+def test_concurrent_gets_share_one_request(dynamodb, monkeypatch):
+    table = _blocking_table(FlightModel, monkeypatch)
+    stats = FlightModel.single_flight_stats()
+    calls, coalesced = stats.calls, stats.coalesced
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = [executor.submit(FlightModel.get, "hello:world", "relation_id:hello:world") for _ in range(8)]
+        _wait_for(lambda: stats.coalesced == coalesced + 7)
+        table.release.set()
+        items = [future.result() for future in futures]
+
+    assert table.get_items == 1
+    assert stats.calls == calls + 1
+    assert [item.my_str for item in items] == ["item1"] * 8
+    # every caller gets its own instance
+    assert len({id(item) for item in items}) == 8
+    items[0].my_str_list.append("changed")
+    assert "changed" not in items[1].my_str_list
+
+
+def test_concurrent_queries_share_one_request(dynamodb, monkeypatch):
+    table = _blocking_table(FlightModel, monkeypatch)
+    stats = FlightModel.single_flight_stats()
+    calls, coalesced = stats.calls, stats.coalesced
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(FlightModel.query, "hello:world") for _ in range(4)]
+        _wait_for(lambda: stats.coalesced == coalesced + 3)
+        table.release.set()
+        results = [future.result() for future in futures]
+
+    assert table.queries == 1
+    assert stats.calls == calls + 1
+    assert len(results[0]) > 0
+    assert all(items == results[0] for items in results)
+    assert results[0][0] is not results[1][0]
+
+
+def test_consistent_reads_are_not_shared(dynamodb, monkeypatch):
+    table = _blocking_table(FlightModel, monkeypatch)
+    table.release.set()
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [
+            executor.submit(FlightModel.get, "hello:world", "relation_id:hello:world", consistent_read=True)
+            for _ in range(4)
+        ]
+        assert all(future.result().my_str == "item1" for future in futures)
+    assert table.get_items == 4
+
+
+def test_errors_are_shared(dynamodb, monkeypatch):
+    table = _blocking_table(FlightModel, monkeypatch)
+    stats = FlightModel.single_flight_stats()
+    coalesced = stats.coalesced
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        futures = [executor.submit(FlightModel.get, "doesnt_exist", "doesnt_exist") for _ in range(3)]
+        _wait_for(lambda: stats.coalesced == coalesced + 2)
+        table.release.set()
+        for future in futures:
+            with pytest.raises(GetError):
+                future.result()
+    assert table.get_items == 1
+
+
+def test_single_flight_is_opt_in(dynamodb, monkeypatch):
+    table = _blocking_table(NoFlightModel, monkeypatch)
+    table.release.set()
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(NoFlightModel.get, "hello:world", "relation_id:hello:world") for _ in range(4)]
+        assert all(future.result().my_str == "item1" for future in futures)
+    assert table.get_items == 4
+    assert NoFlightModel.single_flight_stats().calls == 0
+
+
+def test_single_flight_created_once(monkeypatch):
+    class SlowSingleFlight(SingleFlight):
+        def __init__(self) -> None:
+            time.sleep(0.01)
+            super().__init__()
+
+    class FirstUseModel(RangeKeyModel):
+        __single_flight__ = True
+
+    monkeypatch.setattr(main, "SingleFlight", SlowSingleFlight)
+    barrier = threading.Barrier(8)
+
+    def stats():
+        barrier.wait()
+        return FirstUseModel.single_flight_stats()
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda _: stats(), range(8)))
+    assert len({id(result) for result in results}) == 1
+
+
+def test_single_flight_runs_again_after_completion():
+    flight = SingleFlight()
+    assert flight.do("key", lambda: 1) == (1, False)
+    assert flight.do("key", lambda: 2) == (2, False)
+    assert len(flight) == 0
+
+    def fail():
+        raise ValueError("failed")
+
+    with pytest.raises(ValueError):
+        flight.do("key", fail)
+    assert (flight.stats.calls, flight.stats.errors, flight.stats.coalesced_ratio) == (3, 1, 0.0)
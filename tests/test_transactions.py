@@ -500,16 +500,43 @@ def test_transact_update_append_optional_str_list_succeeds(dynamodb):
     assert item.my_str_list[0] == "hello"
 
 
-def test_transact_update_no_different_actions(dynamodb):
+def test_transact_update_mixed_actions(dynamodb):
+    item = _create_item(RangeKeyModel, relation_id="range_key", my_str="remove me")
+    item.save()
+
+    with TransactWrite() as transaction:
+        transaction.update(
+            item,
+            actions=[
+                Expr(RangeKeyModel).field("my_int").set(9),
+                Expr(RangeKeyModel).field("my_int_set").set_append({9}),
+                Expr(RangeKeyModel).field("my_str_set").set_delete({"a"}),
+                Expr(RangeKeyModel).field("my_str").remove(),
+            ],
+        )
+
+    item.refresh()
+    assert item.my_int == 9
+    assert item.my_int_set == {1, 2, 9}
+    assert item.my_str_set == {"b", "c"}
+    assert item.my_str is None
+
+
+def test_transact_update_reserved_attribute_names(dynamodb):
     item = _create_item(RangeKeyModel, relation_id="range_key")
     item.save()
 
-    with pytest.raises(UpdateError, match="All actions must be the same. ADD != SET"):
+    with TransactWrite() as transaction:
+        transaction.update(item, actions=[Expr(RangeKeyModel).field("my_required_dict").field("name").set("reserved")])
+
+    item.refresh()
+    assert item.my_required_dict["name"] == "reserved"
+
+
+def test_transact_update_without_actions_fails(dynamodb):
+    item = _create_item(RangeKeyModel, relation_id="range_key")
+    item.save()
+
+    with pytest.raises(UpdateError, match="At least one action is required"):
         with TransactWrite() as transaction:
-            transaction.update(
-                item,
-                actions=[
-                    Expr(RangeKeyModel).field("my_int").set(9),
-                    Expr(RangeKeyModel).field("my_int_set").set_append({9}),
-                ],
-            )
+            transaction.update(item, actions=[])